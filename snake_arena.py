@@ -0,0 +1,196 @@
+"""
+Много змеек и яблок на одном поле.
+
+Все змейки делят одну сетку занятости `snake_world.ChunkGrid` -
+пространственный хеш клеток поля. Столкновения головы с любым телом
+и голов между собой находятся поиском клетки в сетке и в словаре
+новых голов, поэтому тик стоит O(сдвинутых сегментов), а не
+O(змеек²). Яблоко ставится на клетку, свободную в той же сетке,
+без общего списка клеток всех змеек.
+Координаты - номера клеток (x, y), как в `snake_world`.
+Модуль не импортирует pygame.
+"""
+from random import Random
+from typing import Dict, List, Sequence, Set, Tuple, Union
+
+from snake_engine import (
+    DOWN,
+    EVENT_BITE,
+    EVENT_EAT,
+    EVENT_MOVE,
+    EVENT_WIN,
+    LEFT,
+    RIGHT,
+    UP,
+)
+from snake_world import ChunkGrid, WorldSnake
+
+# Размеры поля арены в клетках по умолчанию.
+ARENA_WIDTH, ARENA_HEIGHT = 256, 256
+
+# Сколько случайных клеток пробует `Arena.random_free_cell`, прежде
+# чем перебрать всё поле.
+FREE_CELL_ATTEMPTS = 32
+
+
+class Arena:
+    """
+    Партия 'snakes' змеек и 'apples' яблок на поле
+    'world_width' x 'world_height' клеток.
+
+    Змейка, укусившая себя, врезавшаяся в чужое тело или столкнувшаяся
+    головой с другой головой, возрождается на случайной свободной
+    клетке; то же при достижении `Snake.MAX_LENGTH`. Остальные
+    змейки продолжают игру.
+    'seed' - зерно генератора случайных чисел, как у `Game`.
+    """
+
+    def __init__(
+            self,
+            snakes: int,
+            apples: int = 1,
+            world_width: int = ARENA_WIDTH,
+            world_height: int = ARENA_HEIGHT,
+            seed: Union[int, None] = None,
+    ) -> None:
+        if seed is None:
+            seed = Random().getrandbits(32)
+        self.seed = seed
+        self.rng = Random(seed)
+        self.world_width = world_width
+        self.world_height = world_height
+        self.occupied = ChunkGrid(world_width, world_height)
+        self.apples: Set[Tuple[int, int]] = set()
+        self.snakes: List[WorldSnake] = []
+        for _ in range(snakes):
+            self.add_snake()
+        for _ in range(apples):
+            self.place_apple()
+        self.ticks = 0
+
+    def add_snake(self) -> WorldSnake:
+        """
+        Добавляет змейку на случайную свободную клетку.
+        Если свободных клеток нет, поднимается `ValueError`.
+        """
+        position = self.random_free_cell()
+        if position is None:
+            raise ValueError('На поле арены нет свободной клетки.')
+        snake = WorldSnake(self.world_width, self.world_height,
+                           occupied=self.occupied, position=position)
+        snake.rng = self.rng
+        snake.direction = self.rng.choice([RIGHT, LEFT, UP, DOWN])
+        self.snakes.append(snake)
+        return snake
+
+    def remove_snake(self, snake: WorldSnake) -> None:
+        """Убирает змейку 'snake' с поля."""
+        for cell in snake.positions:
+            self.occupied.discard(cell)
+        self.snakes.remove(snake)
+
+    def is_free(self, cell: Tuple[int, int]) -> bool:
+        """Проверяет, что в клетке 'cell' нет змеек и яблок."""
+        return cell not in self.occupied and cell not in self.apples
+
+    def random_free_cell(self) -> Union[Tuple[int, int], None]:
+        """
+        Возвращает случайную клетку без змеек и яблок или None,
+        если поле заполнено. Клетка выбирается повторными попытками:
+        на поле арены змейки обычно занимают малую долю клеток;
+        после `FREE_CELL_ATTEMPTS` неудач выбирается среди всех
+        свободных клеток поля.
+        """
+        if (len(self.occupied) + len(self.apples)
+                >= self.world_width * self.world_height):
+            return None
+        for _ in range(FREE_CELL_ATTEMPTS):
+            cell = (self.rng.randrange(self.world_width),
+                    self.rng.randrange(self.world_height))
+            if self.is_free(cell):
+                return cell
+        return self.rng.choice([
+            (x, y)
+            for x in range(self.world_width)
+            for y in range(self.world_height)
+            if self.is_free((x, y))
+        ])
+
+    def place_apple(self) -> None:
+        """Ставит новое яблоко, если на поле есть свободная клетка."""
+        cell = self.random_free_cell()
+        if cell is not None:
+            self.apples.add(cell)
+
+    def respawn(self, snake: WorldSnake) -> None:
+        """
+        Возрождает змейку на случайной свободной клетке. Тело
+        освобождается до выбора клетки, поэтому клетка есть всегда.
+        """
+        for cell in snake.positions:
+            self.occupied.discard(cell)
+        snake.positions.clear()
+        snake.position = self.random_free_cell()
+        snake.reset()
+
+    def move_snakes(
+            self,
+            actions: Union[Sequence[Union[Tuple[int, int], None]], None],
+            events: List[str],
+    ) -> Dict[Tuple[int, int], List[int]]:
+        """
+        Поворачивает змеек и освобождает их хвосты. Возвращает
+        новые клетки голов с номерами змеек, которые в них идут.
+        Победившие змейки отмечаются в 'events' и не ходят.
+        """
+        heads: Dict[Tuple[int, int], List[int]] = {}
+        for index, snake in enumerate(self.snakes):
+            if snake.length >= snake.MAX_LENGTH:
+                events[index] = EVENT_WIN
+                continue
+            if actions is not None and actions[index] is not None:
+                snake.turn(actions[index])
+            head = snake.get_next_head()
+            snake.pop_tail()
+            heads.setdefault(head, []).append(index)
+        return heads
+
+    def step(
+            self,
+            actions: Union[Sequence[Union[Tuple[int, int], None]],
+                           None] = None,
+    ) -> Tuple['Arena', List[str]]:
+        """
+        Выполняет тик для всех змеек и возвращает пару
+        (состояние, события змеек по порядку `snakes`).
+
+        'actions' - направления змеек по порядку `snakes` (None -
+        сохранить направление) или None для всех сразу.
+        Сначала освобождаются все хвосты, затем ставятся головы,
+        поэтому исход тика не зависит от порядка змеек. Как и в
+        `Snake.move`, ход в клетку своего хвоста считается укусом.
+        """
+        self.ticks += 1
+        events = [EVENT_MOVE] * len(self.snakes)
+        eaten = 0
+        for head, movers in self.move_snakes(actions, events).items():
+            snake = self.snakes[movers[0]]
+            if (len(movers) > 1 or head in self.occupied
+                    or head == snake.last):
+                for index in movers:
+                    events[index] = EVENT_BITE
+                continue
+            snake.positions.appendleft(head)
+            self.occupied.add(head)
+            if head in self.apples:
+                self.apples.discard(head)
+                snake.length += 1
+                events[movers[0]] = EVENT_EAT
+                eaten += 1
+
+        for snake, event in zip(self.snakes, events):
+            if event in (EVENT_BITE, EVENT_WIN):
+                self.respawn(snake)
+        for _ in range(eaten):
+            self.place_apple()
+        return self, events
@@ -0,0 +1,249 @@
+"""
+Автопилот Змейки.
+
+`Autopilot.decide` выбирает направление на очередной тик: змейка
+идёт по гамильтонову циклу поля и срезает его кратчайшим путём
+к яблоку, найденным поиском в ширину, только если путь идёт
+по циклу вперёд и не обгоняет хвост (`Autopilot.find_safe_path`).
+Тогда тело всегда лежит на цикле по порядку, и змейка не кусает
+себя ни на поле с переходом через края, ни на поле со стенами.
+Если такого пути нет или время решения вышло, змейка идёт
+по циклу. Путь хранится и пересчитывается, только когда яблоко
+переставлено или путь перекрыт.
+Клетки пронумерованы как y * width + x (`snake_engine.Board`); соседи
+клеток берутся из таблиц поля, поэтому путь не уходит за стену.
+Модуль не импортирует pygame.
+"""
+import time
+from collections import deque
+from typing import Deque, List, Tuple, Union
+
+from snake_engine import (
+    DEFAULT_BOARD,
+    DIRECTION_CODES,
+    DOWN,
+    LEFT,
+    RIGHT,
+    UP,
+    Board,
+    Game,
+    Snake,
+)
+
+# Время на решение одного тика по умолчанию, в секундах: малая
+# доля кадра на `SPEED_MAX` (25 кадров в секунду - 40 мс).
+DECISION_BUDGET = 0.004
+
+# Сколько длин змейки свободных клеток цикла должно остаться
+# после яблока, чтобы автопилот срезал путь к нему.
+SHORTCUT_MARGIN = 1
+
+Neighbors = Tuple[Tuple[Tuple[int, int], int], ...]
+
+
+def build_neighbors(board: Board) -> List[Neighbors]:
+    """
+    Возвращает для каждой клетки поля 'board' пары (направление,
+    соседняя клетка) по таблицам `Board.next_cells`; соседей за
+    стеной нет.
+    """
+    return [
+        tuple((direction, board.next_cells[direction][cell])
+              for direction in DIRECTION_CODES
+              if board.next_cells[direction][cell] >= 0)
+        for cell in range(board.size)
+    ]
+
+
+def build_cycle(width: int, height: int) -> List[Tuple[int, int]]:
+    """
+    Возвращает направление гамильтонова цикла в каждой клетке поля,
+    у которого чётна высота или ширина: змейка, идущая по нему,
+    обходит все клетки, не переходя через края поля, и не кусает
+    себя при любой длине меньше площади поля. При нечётной высоте
+    цикл идёт по столбцам.
+    """
+    if height % 2:
+        columns = build_cycle(height, width)
+        return [columns[x * height + y][::-1]
+                for y in range(height) for x in range(width)]
+    cycle = []
+    for y in range(height):
+        for x in range(width):
+            if x == 0:
+                cycle.append(RIGHT if y == 0 else UP)
+            elif y % 2 == 0:
+                cycle.append(RIGHT if x < width - 1 else DOWN)
+            elif x > 1 or y == height - 1:
+                cycle.append(LEFT)
+            else:
+                cycle.append(DOWN)
+    return cycle
+
+
+class SearchTimeout(Exception):
+    """Поиск пути не уложился во время решения."""
+
+
+class Autopilot:
+    """
+    Управляет змейкой партии `snake_engine.Game`.
+
+    'time_budget' - время на решение одного тика в секундах;
+    'board' - поле партий, по умолчанию `DEFAULT_BOARD`; у поля
+    с нечётными шириной и высотой нет гамильтонова цикла, на нём
+    поднимается `ValueError`.
+    Поиск, не уложившийся во время решения, прерывается, и змейка
+    на этом тике идёт по гамильтонову циклу. Время решений копится
+    в `last_time`, `max_time` и счётчике `timeouts`.
+    """
+
+    def __init__(self, time_budget: float = DECISION_BUDGET,
+                 board: Union[Board, None] = None) -> None:
+        board = board or DEFAULT_BOARD
+        if (board.width % 2 and board.height % 2
+                or min(board.width, board.height) < 2):
+            raise ValueError(
+                f'На поле {board.width}x{board.height} нет гамильтонова '
+                'цикла: стороны поля должны быть не меньше 2 клеток, '
+                'а хотя бы одна из них - чётной.'
+            )
+        self.time_budget = time_budget
+        self.neighbors = build_neighbors(board)
+        self.cycle = build_cycle(board.width, board.height)
+        # Номер клетки в порядке обхода гамильтонова цикла.
+        self.order = [0] * board.size
+        cell = 0
+        for index in range(board.size):
+            self.order[cell] = index
+            cell = board.next_cells[self.cycle[cell]][cell]
+        self.path: Deque[int] = deque()
+        self.target = None
+        self.deadline = 0.0
+        self.searches = 0
+        self.timeouts = 0
+        self.last_time = self.max_time = 0.0
+
+    def decide(self, game: Game) -> Union[Tuple[int, int], None]:
+        """
+        Возвращает направление змейки 'game' на следующий тик
+        или None, если безопасного хода нет.
+        """
+        started = time.perf_counter()
+        self.deadline = started + self.time_budget
+        try:
+            direction = self.plan(game)
+        except SearchTimeout:
+            self.timeouts += 1
+            self.path.clear()
+            direction = self.fallback(game.snake,
+                                      bytearray(game.snake.occupied))
+        self.last_time = time.perf_counter() - started
+        self.max_time = max(self.max_time, self.last_time)
+        return direction
+
+    def get_direction(self, head: int,
+                      cell: int) -> Union[Tuple[int, int], None]:
+        """Возвращает направление из клетки 'head' в соседнюю 'cell'."""
+        for direction, neighbor in self.neighbors[head]:
+            if neighbor == cell:
+                return direction
+        return None
+
+    def plan(self, game: Game) -> Union[Tuple[int, int], None]:
+        """
+        Идёт по сохранённому пути к яблоку, пересчитывая его, если
+        яблоко переставлено или следующая клетка пути занята.
+        """
+        snake = game.snake
+        head = snake.body[0]
+        blocked = bytearray(snake.occupied)
+        apple = snake.board.to_cell(game.apple.position)
+        if (apple != self.target or not self.path
+                or blocked[self.path[0]]
+                or self.get_direction(head, self.path[0]) is None):
+            self.target = apple
+            self.path = deque(self.find_safe_path(snake, head, apple,
+                                                  blocked))
+        if self.path:
+            return self.get_direction(head, self.path.popleft())
+        return self.fallback(snake, blocked)
+
+    def find_path(
+            self,
+            start: int,
+            goal: int,
+            blocked: bytearray,
+            behind: Union[int, None] = None,
+            ranks: Union[List[int], None] = None,
+    ) -> Union[List[int], None]:
+        """
+        Ищет кратчайший путь из 'start' в 'goal' по свободным клеткам
+        поиском в ширину. Клетка 'goal' может быть занята.
+        'behind' - клетка позади головы: разворот движок не примет.
+        'ranks' - места клеток на цикле: путь идёт только вперёд
+        по циклу и не дальше 'goal'.
+        Возвращает клетки пути без 'start' или None.
+        """
+        self.searches += 1
+        parents = {start: start}
+        if behind is not None:
+            parents[behind] = behind
+        queue = deque((start,))
+        while queue:
+            if time.perf_counter() > self.deadline:
+                raise SearchTimeout
+            cell = queue.popleft()
+            for _, neighbor in self.neighbors[cell]:
+                if neighbor in parents or ranks is not None and not (
+                        ranks[cell] < ranks[neighbor] <= ranks[goal]):
+                    continue
+                parents[neighbor] = cell
+                if neighbor == goal:
+                    path = [goal]
+                    while parents[path[-1]] != start:
+                        path.append(parents[path[-1]])
+                    return path[::-1]
+                if not blocked[neighbor]:
+                    queue.append(neighbor)
+        return None
+
+    def find_safe_path(self, snake: Snake, head: int, apple: int,
+                       blocked: bytearray) -> List[int]:
+        """
+        Возвращает путь к яблоку по порядку гамильтонова цикла
+        или пустой список.
+
+        Тело змейки лежит на цикле по порядку от хвоста к голове,
+        возможно с пропусками, поэтому ход по циклу из головы всегда
+        свободен. Путь срезает цикл, только не обгоняя хвост:
+        клетки пути идут по циклу вперёд от головы до яблока, и после
+        яблока до хвоста остаётся не меньше `SHORTCUT_MARGIN` длин
+        змейки свободных клеток - запас на пропуски в теле, которые
+        хвост ещё не прошёл.
+        """
+        size = len(self.order)
+        base = self.order[snake.body[-1]]
+        ranks = [(index - base) % size for index in self.order]
+        free = size - 1 - ranks[apple]
+        if (ranks[apple] <= ranks[head]
+                or free < SHORTCUT_MARGIN * (snake.length + 1)):
+            return []
+        reverse = (-snake.direction[0], -snake.direction[1])
+        behind = dict(self.neighbors[head]).get(reverse)
+        return self.find_path(head, apple, blocked, behind, ranks) or []
+
+    def fallback(self, snake: Snake,
+                 blocked: bytearray) -> Union[Tuple[int, int], None]:
+        """
+        Ход без пути к яблоку: по гамильтонову циклу, если клетка
+        свободна, иначе в любую свободную соседнюю клетку.
+        """
+        head = snake.body[0]
+        reverse = (-snake.direction[0], -snake.direction[1])
+        cycle = self.cycle[head]
+        for direction, cell in sorted(self.neighbors[head],
+                                      key=lambda item: item[0] != cycle):
+            if direction != reverse and not blocked[cell]:
+                return direction
+        return None
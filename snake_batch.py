@@ -0,0 +1,200 @@
+"""
+Пакетная симуляция: тысячи партий Змейки одним вызовом NumPy.
+
+Правила те же, что в `snake_engine.Game`: проход сквозь стены,
+рост на яблоке, сброс при укусе и победа на `Snake.MAX_LENGTH`.
+Состояние всех партий хранится в массивах, клетки пронумерованы
+как y * GRID_WIDTH + x.
+"""
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from snake_engine import (
+    DOWN,
+    EVENT_BITE,
+    EVENT_EAT,
+    EVENT_MOVE,
+    EVENT_WIN,
+    GRID_HEIGHT,
+    GRID_WIDTH,
+    LEFT,
+    RIGHT,
+    UP,
+    Snake,
+)
+
+# Направления по индексам, которые принимает `BatchGame.step`.
+# Индекс -1 означает "не менять направление".
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+DIRECTION_X = np.array([x for x, _ in DIRECTIONS], dtype=np.int64)
+DIRECTION_Y = np.array([y for _, y in DIRECTIONS], dtype=np.int64)
+NO_ACTION = -1
+
+# Коды событий в массиве, который возвращает `BatchGame.step`.
+MOVE, EAT, BITE, WIN = range(4)
+EVENTS = (EVENT_MOVE, EVENT_EAT, EVENT_BITE, EVENT_WIN)
+
+NO_CELL = -1
+
+
+class BatchGame:
+    """
+    N независимых партий, которые делают ход одновременно.
+
+    'size' - количество партий;
+    'seed' - зерно генератора случайных чисел;
+    'grid_width', 'grid_height' - размеры поля в клетках.
+
+    Тело каждой змейки - кольцевой буфер клеток `body` с головой
+    в `heads_index`, занятость клеток - булева сетка `occupied`.
+    """
+
+    def __init__(
+            self,
+            size: int,
+            seed: Union[int, None] = None,
+            grid_width: int = GRID_WIDTH,
+            grid_height: int = GRID_HEIGHT,
+    ) -> None:
+        self.size = size
+        self.grid_width = grid_width
+        self.cells = grid_width * grid_height
+        self.start_cell = (grid_height // 2) * grid_width + grid_width // 2
+        self.rng = np.random.default_rng(seed)
+
+        self.body = np.zeros((size, self.cells), dtype=np.int32)
+        self.occupied = np.zeros((size, self.cells), dtype=bool)
+        self.heads_index = np.zeros(size, dtype=np.int64)
+        self.counts = np.zeros(size, dtype=np.int64)
+        self.lengths = np.zeros(size, dtype=np.int64)
+        self.directions = np.zeros(size, dtype=np.int64)
+        self.apples = np.zeros(size, dtype=np.int64)
+        self.last = np.full(size, NO_CELL, dtype=np.int64)
+        self.ticks = 0
+
+        self.reset(np.arange(size))
+        self.directions[:] = DIRECTIONS.index(RIGHT)
+
+    @property
+    def heads(self) -> np.ndarray:
+        """Клетки голов всех змеек."""
+        return self.body[np.arange(self.size), self.heads_index]
+
+    def reset(self, games: np.ndarray) -> None:
+        """Сбрасывает партии с индексами 'games' в начальное состояние."""
+        if not len(games):
+            return
+        self.occupied[games] = False
+        self.occupied[games, self.start_cell] = True
+        self.body[games, 0] = self.start_cell
+        self.heads_index[games] = 0
+        self.counts[games] = 1
+        self.lengths[games] = Snake.DEFAULT_LENGTH
+        self.directions[games] = self.rng.integers(
+            0, len(DIRECTIONS), len(games)
+        )
+        self.last[games] = NO_CELL
+        self.randomize_apples(games)
+
+    def randomize_apples(self, games: np.ndarray) -> None:
+        """
+        Ставит яблоки в партиях 'games' на случайные свободные клетки.
+        Выбирается k-я свободная клетка, поэтому распределение
+        равномерное при любой заполненности поля и без повторов.
+        """
+        free = ~self.occupied[games]
+        free_counts = free.sum(axis=1)
+        has_free = free_counts > 0
+        games, free, free_counts = (
+            games[has_free], free[has_free], free_counts[has_free]
+        )
+        picks = self.rng.integers(0, free_counts)
+        self.apples[games] = np.argmax(
+            np.cumsum(free, axis=1) > picks[:, None], axis=1
+        )
+
+    def step(
+            self,
+            actions: Union[Sequence[int], np.ndarray, None] = None,
+    ) -> Tuple['BatchGame', np.ndarray]:
+        """
+        Выполняет один тик во всех партиях.
+
+        'actions' - индексы направлений из `DIRECTIONS` по партиям
+        (`NO_ACTION`, чтобы не менять направление) или None.
+        Возвращает пару (состояние, коды событий из `EVENTS`).
+        """
+        self.ticks += 1
+        events = np.full(self.size, MOVE, dtype=np.int8)
+
+        # Проверка на победу в игре.
+        won = np.flatnonzero(self.lengths >= Snake.MAX_LENGTH)
+        events[won] = WIN
+        self.reset(won)
+        playing = events != WIN
+
+        if actions is not None:
+            self.turn(np.asarray(actions, dtype=np.int64), playing)
+
+        games = np.flatnonzero(playing)
+        new_heads = self.move(games)
+
+        bitten = (self.occupied[games, new_heads]
+                  | (new_heads == self.last[games]))
+        self.heads_index[games] = (self.heads_index[games] + 1) % self.cells
+        self.body[games, self.heads_index[games]] = new_heads
+        self.occupied[games, new_heads] = True
+        self.counts[games] += 1
+
+        bite_games = games[bitten]
+        events[bite_games] = BITE
+        self.reset(bite_games)
+
+        eaten = ~bitten & (new_heads == self.apples[games])
+        eat_games = games[eaten]
+        events[eat_games] = EAT
+        self.lengths[eat_games] += 1
+        self.randomize_apples(eat_games)
+        return self, events
+
+    def turn(self, actions: np.ndarray, playing: np.ndarray) -> None:
+        """
+        Поворачивает змейки в партиях 'playing' по индексам 'actions'.
+        Разворот на 180 градусов и повтор направления игнорируются.
+        """
+        chosen = actions.clip(0)
+        allowed = (
+            playing
+            & (actions != NO_ACTION)
+            & (DIRECTION_X[chosen] != DIRECTION_X[self.directions])
+            & (DIRECTION_Y[chosen] != DIRECTION_Y[self.directions])
+        )
+        self.directions[allowed] = actions[allowed]
+
+    def move(self, games: np.ndarray) -> np.ndarray:
+        """
+        Убирает хвосты у змеек, которые не растут, записывая их
+        в `last`, и возвращает новые клетки голов партий 'games'.
+        """
+        heads = self.body[games, self.heads_index[games]]
+        directions = self.directions[games]
+        grid_height = self.cells // self.grid_width
+        new_heads = (
+            ((heads // self.grid_width + DIRECTION_Y[directions])
+             % grid_height) * self.grid_width
+            + (heads % self.grid_width + DIRECTION_X[directions])
+            % self.grid_width
+        )
+
+        self.last[games] = NO_CELL
+        shrinking = games[self.counts[games] >= self.lengths[games]]
+        tails = self.body[
+            shrinking,
+            (self.heads_index[shrinking] - self.counts[shrinking] + 1)
+            % self.cells,
+        ]
+        self.occupied[shrinking, tails] = False
+        self.counts[shrinking] -= 1
+        self.last[shrinking] = tails
+        return new_heads
@@ -0,0 +1,735 @@
+"""
+Игровая логика Змейки без отрисовки.
+
+Модуль не импортирует pygame: в нём нет окна, часов и шрифтов,
+поэтому симуляцию можно запускать миллионы тиков подряд
+(боты, регрессионные проверки). Отрисовка живёт в `the_snake`.
+"""
+import struct
+from array import array
+from collections import deque
+from itertools import repeat
+from random import Random
+from typing import Collection, Iterable, Iterator, List, Tuple, Union
+
+# Константы для размеров поля и сетки:
+SCREEN_WIDTH, SCREEN_HEIGHT = 640, 480
+SCREEN_CENTER = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+GRID_SIZE = 20
+GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
+GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
+
+# Начальная ёмкость тела змейки в клетках.
+RING_CAPACITY = 32
+
+# Направления движения:
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+# Порядок направлений в снимках состояния `Game.snapshot`.
+DIRECTION_CODES = (UP, DOWN, LEFT, RIGHT)
+
+# Состояние `random.Random`: 624 слова и позиция в них.
+RNG_STATE = struct.Struct('<625I')
+
+# Заголовок снимка: тик, тик начала партии, длина, направление,
+# укус, число поворотов в очереди, клетки яблока и снятого хвоста
+# (-1 - нет), длина тела и количество свободных клеток.
+SNAPSHOT_HEADER = struct.Struct('<QQiBBBiiII')
+
+# События, которые возвращает `Game.step`:
+EVENT_MOVE = 'move'  # Змейка сдвинулась на клетку.
+EVENT_EAT = 'eat'  # Змейка съела яблоко.
+EVENT_BITE = 'bite'  # Змейка укусила себя, игра сброшена.
+EVENT_WIN = 'win'  # Змейка достигла максимальной длины, игра сброшена.
+
+
+class Board:
+    """
+    Геометрия поля: 'width' x 'height' клеток по 'cell_size' пикселей,
+    с переходом через края ('wrap') или со стенами.
+
+    Клетки пронумерованы как y * width + x. Таблицы считаются один раз
+    при создании поля, и ход змейки обходится без арифметики:
+    `next_cells[direction][cell]` - соседняя клетка в направлении
+    'direction' (-1 - за стеной), `positions[cell]` - левый верхний
+    угол клетки в пикселях для отрисовки. Поля разных размеров
+    могут жить в одном процессе: объекты игры берут геометрию
+    из своего `board`, а не из констант модуля.
+    """
+
+    __slots__ = ('width', 'height', 'cell_size', 'wrap', 'size',
+                 'typecode', 'next_cells', 'positions', 'center')
+
+    def __init__(
+            self,
+            width: Union[int, None] = None,
+            height: Union[int, None] = None,
+            cell_size: Union[int, None] = None,
+            wrap: bool = True,
+    ) -> None:
+        self.width = width or GRID_WIDTH
+        self.height = height or GRID_HEIGHT
+        self.cell_size = cell_size or GRID_SIZE
+        self.wrap = wrap
+        self.size = self.width * self.height
+        # Тип элементов `array` с номерами клеток поля.
+        self.typecode = 'H' if self.size <= 0xFFFF else 'I'
+        self.positions = [
+            (x * self.cell_size, y * self.cell_size)
+            for y in range(self.height) for x in range(self.width)
+        ]
+        self.next_cells = {
+            direction: array('i', (self.get_neighbor(cell, direction)
+                                   for cell in range(self.size)))
+            for direction in DIRECTION_CODES
+        }
+        self.center = self.positions[
+            self.height // 2 * self.width + self.width // 2
+        ]
+
+    @property
+    def pixel_size(self) -> Tuple[int, int]:
+        """Размер поля в пикселях."""
+        return self.width * self.cell_size, self.height * self.cell_size
+
+    def get_neighbor(self, cell: int, direction: Tuple[int, int]) -> int:
+        """
+        Считает соседа клетки 'cell' в направлении 'direction'
+        для таблицы `next_cells`.
+        """
+        y, x = divmod(cell, self.width)
+        x, y = x + direction[0], y + direction[1]
+        if self.wrap:
+            x, y = x % self.width, y % self.height
+        elif not (0 <= x < self.width and 0 <= y < self.height):
+            return -1
+        return y * self.width + x
+
+    def to_cell(self, position: Tuple[int, int]) -> int:
+        """Переводит координаты в пикселях в номер клетки."""
+        return (position[1] // self.cell_size * self.width
+                + position[0] // self.cell_size)
+
+    def to_position(self, cell: int) -> Tuple[int, int]:
+        """Возвращает координаты клетки 'cell' в пикселях."""
+        return self.positions[cell]
+
+
+# Поле окна игры по умолчанию.
+DEFAULT_BOARD = Board()
+
+
+class FreeCells:
+    """
+    Индекс свободных клеток поля.
+
+    Номера клеток лежат в массиве `cells`, а массив `index` хранит
+    позицию каждой клетки поля в `cells` (-1 - клетка занята).
+    Занятие клетки меняет её местами с последней и отрезает хвост
+    массива, поэтому занять, освободить и выбрать случайную
+    свободную клетку можно за O(1) при любой заполненности поля.
+    """
+
+    __slots__ = ('cells', 'index')
+
+    def __init__(self, cells: Iterable[int],
+                 board: Union[Board, None] = None) -> None:
+        board = board or DEFAULT_BOARD
+        self.cells = array(board.typecode, cells)
+        self.index = array('i', [-1]) * board.size
+        for i, cell in enumerate(self.cells):
+            self.index[cell] = i
+
+    @classmethod
+    def from_board(cls, board: Union[Board, None] = None) -> 'FreeCells':
+        """Создаёт индекс, в котором свободны все клетки поля 'board'."""
+        board = board or DEFAULT_BOARD
+        return cls(range(board.size), board)
+
+    def __len__(self) -> int:
+        """Возвращает количество свободных клеток."""
+        return len(self.cells)
+
+    def __contains__(self, cell: int) -> bool:
+        """Проверяет, свободна ли клетка 'cell'."""
+        return self.index[cell] >= 0
+
+    def take(self, cell: int) -> None:
+        """Помечает клетку 'cell' занятой."""
+        i = self.index[cell]
+        self.index[cell] = -1
+        last_cell = self.cells.pop()
+        if last_cell != cell:
+            self.cells[i] = last_cell
+            self.index[last_cell] = i
+
+    def release(self, cell: int) -> None:
+        """Помечает клетку 'cell' свободной."""
+        self.index[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def choice(self, rng: Random) -> int:
+        """Возвращает случайную свободную клетку, выбранную 'rng'."""
+        return self.cells[rng.randrange(len(self.cells))]
+
+    def copy(self) -> 'FreeCells':
+        """Возвращает независимую копию индекса."""
+        other = FreeCells.__new__(FreeCells)
+        other.cells = self.cells[:]
+        other.index = self.index[:]
+        return other
+
+
+class CellRing:
+    """
+    Тело змейки: номера клеток поля 'board' от головы к хвосту
+    в кольцевом буфере на `array`. Голову добавляет и хвост снимает
+    `Snake.move` прямо в `cells`, `start` и `size` за O(1) и без
+    создания объектов; заполненный буфер он удваивает `resize`.
+    """
+
+    __slots__ = ('cells', 'start', 'size')
+
+    def __init__(self, cells: Iterable[int] = (),
+                 board: Union[Board, None] = None) -> None:
+        board = board or DEFAULT_BOARD
+        self.cells = array(board.typecode, cells)
+        self.start = 0
+        self.size = len(self.cells)
+        self.resize(max(RING_CAPACITY, self.size))
+
+    def __len__(self) -> int:
+        """Возвращает количество клеток тела."""
+        return self.size
+
+    def __getitem__(self, i: int) -> int:
+        """Возвращает 'i'-ю клетку от головы (отрицательные - от хвоста)."""
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError('CellRing index out of range')
+        return self.cells[(self.start + i) % len(self.cells)]
+
+    def __iter__(self) -> Iterator[int]:
+        """Перебирает клетки от головы к хвосту."""
+        cells, start, capacity = self.cells, self.start, len(self.cells)
+        for i in range(self.size):
+            yield cells[(start + i) % capacity]
+
+    def to_array(self) -> array:
+        """Возвращает клетки от головы к хвосту одним массивом."""
+        cells, end = self.cells, self.start + self.size
+        if end <= len(cells):
+            return cells[self.start:end]
+        return cells[self.start:] + cells[:end - len(cells)]
+
+    def copy(self) -> 'CellRing':
+        """Возвращает независимую копию тела."""
+        other = CellRing.__new__(CellRing)
+        other.cells = self.cells[:]
+        other.start = self.start
+        other.size = self.size
+        return other
+
+    def resize(self, capacity: int) -> None:
+        """Переносит клетки в буфер на 'capacity' клеток."""
+        cells = self.to_array()
+        cells.extend(repeat(0, capacity - self.size))
+        self.cells = cells
+        self.start = 0
+
+
+class GameObject:
+    """
+    Базовый класс объектов игрового поля.
+    Вся случайность объекта идёт через генератор `rng`; `Game`
+    подставляет общий генератор, чтобы партию можно было повторить
+    по зерну. 'board' - геометрия поля, по умолчанию `DEFAULT_BOARD`.
+    """
+
+    __slots__ = ('body_color', 'position', 'rng', 'board')
+
+    def __init__(
+            self,
+            body_color: Union[Tuple[int, int, int], None] = None,
+            board: Union[Board, None] = None,
+    ) -> None:
+        self.body_color = body_color
+        self.board = board or DEFAULT_BOARD
+        self.position: Tuple[int, int] = self.board.center
+        self.rng = Random()
+
+    def clone(self) -> 'GameObject':
+        """
+        Возвращает копию объекта того же класса без вызова
+        `__init__`. Генератор `rng` общий с оригиналом, его
+        подменяет `Game.clone`.
+        """
+        other = object.__new__(type(self))
+        other.body_color = self.body_color
+        other.position = self.position
+        other.rng = self.rng
+        other.board = self.board
+        return other
+
+
+class Apple(GameObject):
+    """Объект Яблоко."""
+
+    __slots__ = ()
+
+    def __init__(
+            self,
+            body_color: Union[Tuple[int, int, int], None] = None,
+            exclude_positions: Collection[Tuple[int, int]] = None,
+            board: Union[Board, None] = None,
+    ) -> None:
+        super().__init__(body_color, board)
+        self.randomize_position(exclude_positions or ())
+
+    def randomize_position(
+            self,
+            exclude_positions: Union[Collection[Tuple[int, int]],
+                                     FreeCells] = None
+    ) -> None:
+        """
+        Устанавливает для Яблока случайную позицию на игровом поле,
+        исключая попадание Яблока на позицию Змейки.
+        'exclude_positions' - координаты Змейки или её индекс
+        свободных клеток `Snake.free_cells`. С индексом позиция
+        выбирается сразу, без повторных попыток, даже на почти
+        заполненном поле; если свободных клеток нет, Яблоко
+        остаётся на месте.
+        """
+        board = self.board
+        if isinstance(exclude_positions, FreeCells):
+            if exclude_positions:
+                self.position = board.positions[
+                    exclude_positions.choice(self.rng)
+                ]
+            return
+
+        while True:
+            self.position = (
+                self.rng.randrange(board.width) * board.cell_size,
+                self.rng.randrange(board.height) * board.cell_size,
+            )
+            if self.position not in exclude_positions:
+                break
+
+
+class BaseSnake(GameObject):
+    """
+    Общая часть змеек: длина, направление и очередь поворотов.
+    Тело и его хранение задают наследники.
+    """
+
+    __slots__ = ('direction', 'turns', 'bitten', 'length')
+
+    DEFAULT_LENGTH = 1
+    MAX_LENGTH = 20
+    # Сколько поворотов можно задать вперёд, до ближайших ходов.
+    TURN_QUEUE_SIZE = 3
+
+    def __init__(
+            self,
+            body_color: Union[Tuple[int, int, int], None] = None,
+            board: Union[Board, None] = None,
+    ) -> None:
+        super().__init__(body_color, board)
+
+        self.direction = RIGHT
+        self.turns = deque()
+        self.bitten = False
+        self.length = self.DEFAULT_LENGTH
+
+    def turn(self, direction: Tuple[int, int]) -> None:
+        """
+        Поворачивает змейку в направлении 'direction'.
+        Разворот на 180 градусов и повтор текущего направления
+        игнорируются.
+        """
+        if (direction[0] != self.direction[0]
+                and direction[1] != self.direction[1]):
+            self.direction = direction
+
+    def get_planned_direction(self) -> Tuple[int, int]:
+        """
+        Возвращает направление, в котором змейка будет двигаться
+        после всех поворотов из очереди.
+        """
+        return self.turns[-1] if self.turns else self.direction
+
+    def queue_turn(self, direction: Tuple[int, int]) -> None:
+        """
+        Ставит поворот в очередь: быстрые нажатия в пределах одного
+        тика (например, вверх и сразу влево) не теряются, а
+        применяются на следующих ходах по одному. Поворот проверяется
+        относительно последнего запланированного направления; если
+        очередь заполнена, он отбрасывается.
+        """
+        planned = self.get_planned_direction()
+        if (len(self.turns) < self.TURN_QUEUE_SIZE
+                and direction[0] != planned[0]
+                and direction[1] != planned[1]):
+            self.turns.append(direction)
+
+    def apply_turn(self) -> None:
+        """Применяет перед ходом один поворот из очереди."""
+        if self.turns:
+            self.turn(self.turns.popleft())
+
+    def is_bitten(self) -> bool:
+        """Проверяет, укусила ли змейка себя на последнем ходу."""
+        return self.bitten
+
+    def clone(self) -> 'BaseSnake':
+        """Возвращает копию змейки со своей очередью поворотов."""
+        other = super().clone()
+        other.direction = self.direction
+        other.turns = deque(self.turns)
+        other.bitten = self.bitten
+        other.length = self.length
+        return other
+
+
+class Snake(BaseSnake):
+    """
+    Объект Змейка.
+
+    Тело хранится номерами клеток поля `board` в кольцевом буфере
+    `body` (голова первая), занятость - флагами клеток поля
+    в `occupied`: ход не создаёт кортежей и множеств, а пиксели
+    берутся из таблицы `Board.positions` только для отрисовки
+    (`positions`, `last`).
+    """
+
+    __slots__ = ('body', 'occupied', 'free_cells', 'last_cell')
+
+    def __init__(
+            self,
+            body_color: Union[Tuple[int, int, int], None] = None,
+            board: Union[Board, None] = None,
+    ) -> None:
+        super().__init__(body_color, board)
+
+        board = self.board
+        start = board.to_cell(self.position)
+        self.last_cell = None
+        self.body = CellRing((start,), board)
+        self.occupied = bytearray(board.size)
+        self.occupied[start] = 1
+        self.free_cells = FreeCells.from_board(board)
+        self.free_cells.take(start)
+
+    @property
+    def positions(self) -> List[Tuple[int, int]]:
+        """Координаты сегментов в пикселях от головы к хвосту."""
+        positions = self.board.positions
+        return [positions[cell] for cell in self.body]
+
+    @property
+    def last(self) -> Union[Tuple[int, int], None]:
+        """Координаты хвоста, снятого на последнем ходу, или None."""
+        if self.last_cell is None:
+            return None
+        return self.board.positions[self.last_cell]
+
+    def move(self) -> None:
+        """
+        Обновляет позицию змейки, добавляя новую голову
+        в начало тела и удаляя последний сегмент,
+        если длинна змейки не увеличилась.
+
+        Столкновение с собой проверяется здесь же, до того как
+        новая голова попадёт в `occupied`, и сохраняется в `bitten`.
+        Хвост, в который голова может укусить, к этому моменту уже
+        удалён из тела и записан в `last_cell`, поэтому он
+        проверяется отдельно. Индекс `free_cells` обновляется
+        вместе с телом. Новая голова берётся из таблицы
+        `Board.next_cells`; удар о стену поля со стенами тоже
+        считается укусом, змейка при этом не двигается.
+        """
+        # Кольцевой буфер `CellRing` меняется здесь же, без вызовов
+        # методов: это самый частый путь игры.
+        body, occupied, free_cells = self.body, self.occupied, self.free_cells
+        cells = body.cells
+        head = self.board.next_cells[self.direction][cells[body.start]]
+        if head < 0:
+            self.last_cell = None
+            self.bitten = True
+            return
+
+        last_cell = None
+        if body.size >= self.length:
+            body.size -= 1
+            last_cell = cells[(body.start + body.size) % len(cells)]
+            occupied[last_cell] = 0
+            free_cells.release(last_cell)
+        self.last_cell = last_cell
+
+        self.bitten = occupied[head] == 1 or head == last_cell
+        if not occupied[head]:
+            free_cells.take(head)
+        if body.size == len(cells):
+            body.resize(2 * body.size)
+            cells = body.cells
+        body.start = (body.start - 1) % len(cells)
+        cells[body.start] = head
+        body.size += 1
+        occupied[head] = 1
+
+    def is_occupied(self, position: Tuple[int, int]) -> bool:
+        """Проверяет, занята ли клетка 'position' телом змейки."""
+        return self.occupied[self.board.to_cell(position)] == 1
+
+    def is_head_at(self, position: Tuple[int, int]) -> bool:
+        """Проверяет, находится ли голова в клетке 'position'."""
+        body = self.body
+        return body.cells[body.start] == self.board.to_cell(position)
+
+    def get_head_position(self) -> Tuple[int, int]:
+        """
+        Возвращает позицию головы Змейки
+        (первая клетка тела).
+        """
+        body = self.body
+        return self.board.positions[body.cells[body.start]]
+
+    def clone(self) -> 'Snake':
+        """
+        Возвращает независимую копию змейки. Тело, флаги занятости
+        и индекс свободных клеток - плоские `array` и `bytearray`,
+        поэтому копия - несколько копирований памяти без обхода
+        клеток.
+        """
+        other = super().clone()
+        other.body = self.body.copy()
+        other.occupied = self.occupied[:]
+        other.free_cells = self.free_cells.copy()
+        other.last_cell = self.last_cell
+        return other
+
+    def restore(self, cells: Iterable[int],
+                free_cells: Iterable[int]) -> None:
+        """
+        Заменяет тело клетками 'cells' (от головы) и индекс свободных
+        клеток - клетками 'free_cells' в их порядке.
+        """
+        self.body = CellRing(cells, self.board)
+        self.occupied = bytearray(self.board.size)
+        for cell in self.body:
+            self.occupied[cell] = 1
+        self.free_cells = FreeCells(free_cells, self.board)
+        self.last_cell = None
+        self.bitten = False
+
+    def reset(self) -> None:
+        """
+        Сбрасывает Змейку в начальное состояние
+        после столкновения с собой.
+        """
+        # Клетки освобождаются в порядке тела: порядок индекса
+        # свободных клеток должен зависеть только от хода партии,
+        # иначе реплей с ключевого кадра разойдётся.
+        start = self.board.to_cell(self.position)
+        for cell in self.body:
+            self.occupied[cell] = 0
+            if cell not in self.free_cells:
+                self.free_cells.release(cell)
+        self.free_cells.take(start)
+
+        self.length = self.DEFAULT_LENGTH
+        self.body = CellRing((start,), self.board)
+        self.occupied[start] = 1
+        self.direction = self.rng.choice([RIGHT, LEFT, UP, DOWN])
+        self.turns.clear()
+        self.last_cell = None
+        self.bitten = False
+
+
+class Game:
+    """
+    Симуляция одной партии: змейка, яблоко и правила игры.
+
+    'snake', 'apple' - объекты игры; по умолчанию создаются
+    логические `Snake` и `Apple` без отрисовки. Окно в `the_snake`
+    передаёт сюда свои рисуемые объекты.
+    'seed' - зерно генератора случайных чисел партии. Если оно
+    не задано, выбирается случайное и сохраняется в `seed`, так что
+    любую партию можно повторить.
+    'board' - геометрия поля для объектов, создаваемых по умолчанию;
+    переданные объекты приносят своё поле.
+    `started` - тик, с которого идёт текущая партия после сброса:
+    тики партии - `ticks - started`.
+    """
+
+    __slots__ = ('seed', 'rng', 'snake', 'apple', 'ticks', 'started')
+
+    def __init__(
+            self,
+            snake: Union[Snake, None] = None,
+            apple: Union[Apple, None] = None,
+            seed: Union[int, None] = None,
+            board: Union[Board, None] = None,
+    ) -> None:
+        if seed is None:
+            seed = Random().getrandbits(32)
+        self.seed = seed
+        self.rng = Random(seed)
+        self.snake = snake or Snake(board=board)
+        self.apple = apple or Apple(
+            exclude_positions=self.snake.free_cells,
+            board=self.snake.board,
+        )
+        self.snake.rng = self.apple.rng = self.rng
+        # Яблоко переставляется уже общим генератором партии.
+        self.place_apple()
+        self.ticks = self.started = 0
+
+    def clone(self) -> 'Game':
+        """
+        Возвращает независимую копию партии для перебора ходов:
+        ходы копии не меняют оригинал, и наоборот. Копия получает
+        свой генератор с тем же состоянием, поэтому повторяет
+        оригинал при тех же ходах.
+        """
+        other = object.__new__(type(self))
+        other.seed = self.seed
+        # Без `__init__`: новый генератор не читает энтропию ОС,
+        # его состояние всё равно заменяется состоянием оригинала.
+        other.rng = Random.__new__(Random)
+        other.rng.setstate(self.rng.getstate())
+        other.snake = self.snake.clone()
+        other.apple = self.apple.clone()
+        other.snake.rng = other.apple.rng = other.rng
+        other.ticks = self.ticks
+        other.started = self.started
+        return other
+
+    def snapshot(self) -> bytes:
+        """
+        Возвращает состояние партии плоским буфером: заголовок
+        `SNAPSHOT_HEADER`, коды поворотов из очереди, флаги
+        занятости, тело, индекс свободных клеток и состояние
+        генератора. Буфер читает `restore`.
+        """
+        snake = self.snake
+        last_cell = -1 if snake.last_cell is None else snake.last_cell
+        _, rng_state, _ = self.rng.getstate()
+        return b''.join((
+            SNAPSHOT_HEADER.pack(
+                self.ticks, self.started, snake.length,
+                DIRECTION_CODES.index(snake.direction), snake.bitten,
+                len(snake.turns), snake.board.to_cell(self.apple.position),
+                last_cell, len(snake.body), len(snake.free_cells),
+            ),
+            bytes(DIRECTION_CODES.index(turn) for turn in snake.turns),
+            snake.occupied,
+            snake.body.to_array().tobytes(),
+            snake.free_cells.cells.tobytes(),
+            snake.free_cells.index.tobytes(),
+            RNG_STATE.pack(*rng_state),
+        ))
+
+    def restore(self, buffer: Union[bytes, bytearray, memoryview]) -> None:
+        """
+        Восстанавливает партию из буфера `snapshot`. Части буфера
+        читаются срезами `memoryview` без промежуточных копий.
+        """
+        view = memoryview(buffer)
+        (self.ticks, self.started, length, direction, bitten, turns, apple,
+         last_cell, size, free) = SNAPSHOT_HEADER.unpack_from(view)
+        snake = self.snake
+        snake.length = length
+        snake.direction = DIRECTION_CODES[direction]
+        snake.bitten = bool(bitten)
+        snake.last_cell = None if last_cell < 0 else last_cell
+        board = snake.board
+        self.apple.position = board.positions[apple]
+
+        offset = SNAPSHOT_HEADER.size
+        snake.turns = deque(DIRECTION_CODES[code]
+                            for code in view[offset:offset + turns])
+        offset += turns
+        cells = board.size
+        snake.occupied[:] = view[offset:offset + cells]
+        offset += cells
+
+        body = array(board.typecode)
+        free_cells = array(board.typecode)
+        index = array('i')
+        for part, count in ((body, size), (free_cells, free),
+                            (index, cells)):
+            end = offset + count * part.itemsize
+            part.frombytes(view[offset:end])
+            offset = end
+        snake.body = CellRing(body, board)
+        snake.free_cells.cells = free_cells
+        snake.free_cells.index = index
+
+        self.rng.setstate((3, RNG_STATE.unpack_from(view, offset), None))
+
+    def place_apple(self) -> None:
+        """Ставит яблоко на случайную свободную клетку поля."""
+        self.apple.randomize_position(self.snake.free_cells)
+
+    def reset(self) -> None:
+        """Начинает новую партию: сбрасывает змейку и яблоко."""
+        self.started = self.ticks
+        self.snake.reset()
+        self.place_apple()
+
+    def step(
+            self,
+            action: Union[Tuple[int, int], None] = None,
+    ) -> Tuple['Game', str]:
+        """
+        Выполняет один тик игры и возвращает пару (состояние, событие).
+
+        'action' - новое направление движения (`UP`, `DOWN`, `LEFT`,
+        `RIGHT`) или None, чтобы сохранить текущее.
+        Состояние - сама игра: её не копируют, чтобы тик оставался
+        дешёвым.
+        """
+        return self, self.advance(action) or self.resolve()
+
+    def advance(
+            self,
+            action: Union[Tuple[int, int], None] = None,
+    ) -> Union[str, None]:
+        """
+        Первая половина тика: проверка победы, поворот и ход змейки.
+        Возвращает `EVENT_WIN`, если партия выиграна и сброшена,
+        иначе None - тогда тик завершает `resolve`.
+        """
+        self.ticks += 1
+        snake = self.snake
+
+        # Проверка на победу в игре.
+        if snake.length >= snake.MAX_LENGTH:
+            self.reset()
+            return EVENT_WIN
+
+        if action is not None:
+            snake.turn(action)
+        snake.move()
+        return None
+
+    def resolve(self) -> str:
+        """
+        Вторая половина тика: проверка укуса и съедания яблока
+        после хода змейки. Возвращает событие тика.
+        """
+        snake = self.snake
+        if snake.is_bitten():
+            self.reset()
+            return EVENT_BITE
+        if snake.is_head_at(self.apple.position):
+            snake.length += 1
+            self.place_apple()
+            return EVENT_EAT
+        return EVENT_MOVE
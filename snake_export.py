@@ -0,0 +1,151 @@
+"""
+Запись кадров игры в файлы без окна.
+
+Игра рисует кадр на поверхности `create_surface`, а
+`FrameExporter.capture` копирует её пиксели через `Surface.get_view`
+одним копированием памяти и ставит в ограниченную очередь. Кодируют
+и пишут кадры рабочие потоки, поэтому цикл игры ждёт их, только
+когда очередь заполнена.
+
+Форматы:
+    'png' - каталог с кадрами frame_000000.png, frame_000001.png...;
+    'raw' - один файл с кадрами подряд, по 4 байта R, G, B, X
+    на пиксель (для ffmpeg: -f rawvideo -pix_fmt rgb0 -s 640x480).
+"""
+import os
+import queue
+import sys
+import threading
+from typing import List, Tuple
+
+import pygame as pg
+
+EXPORT_FORMATS = ('png', 'raw')
+EXPORT_FORMAT = 'png'
+
+# Потоков кодирования PNG и кадров в очереди по умолчанию.
+EXPORT_WORKERS = 2
+EXPORT_QUEUE_SIZE = 32
+
+# Маски 32-битной поверхности, пиксели которой лежат в памяти
+# байтами R, G, B, X: такой буфер читает `pg.image.frombuffer`
+# и без преобразования принимает ffmpeg.
+RGBX_MASKS = ((0xFF, 0xFF00, 0xFF0000, 0) if sys.byteorder == 'little'
+              else (0xFF000000, 0xFF0000, 0xFF00, 0))
+
+PNG_NAME = 'frame_{:06d}.png'
+
+
+def create_surface(size: Tuple[int, int]) -> pg.Surface:
+    """Создаёт поверхность 'size' для рисования кадров без окна."""
+    return pg.Surface(size, 0, 32, RGBX_MASKS)
+
+
+class FrameExporter:
+    """
+    Пишет кадры в 'path' в формате 'export_format' (`EXPORT_FORMATS`).
+
+    PNG кодируют 'workers' потоков, каждый кадр - в свой файл.
+    Сырой поток пишет один поток: кадры в нём должны идти по
+    порядку, а кодировать их не нужно. В очереди ждут не больше
+    'queue_size' кадров; `waits` считает кадры, на которых игра
+    ждала освобождения очереди. Ошибка записи в потоке поднимается
+    из следующего `capture` и из `close`.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            export_format: str = EXPORT_FORMAT,
+            workers: int = EXPORT_WORKERS,
+            queue_size: int = EXPORT_QUEUE_SIZE,
+    ) -> None:
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f'Неизвестный формат кадров "{export_format}".')
+        self.path = path
+        self.export_format = export_format
+        self.frames = 0
+        self.waits = 0
+        self.errors: List[BaseException] = []
+        self.queue: queue.Queue = queue.Queue(queue_size)
+        if export_format == 'png':
+            os.makedirs(path, exist_ok=True)
+            self.stream = None
+            target = self.write_png
+        else:
+            self.stream = open(path, 'wb')
+            workers = 1
+            target = self.write_raw
+        self.workers = [threading.Thread(target=self.run, args=(target,),
+                                         daemon=True)
+                        for _ in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def __enter__(self) -> 'FrameExporter':
+        """Возвращает сам объект записи."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Дожидается записи всех кадров."""
+        self.close()
+
+    def capture(self, surface: pg.Surface) -> None:
+        """
+        Ставит в очередь кадр с поверхности 'surface', созданной
+        `create_surface`. Пиксели копируются из буфера поверхности
+        сразу: игра продолжит рисовать на ней следующий кадр.
+        """
+        if self.errors:
+            raise self.errors[0]
+        frame = (self.frames, surface.get_size(),
+                 bytes(memoryview(surface.get_view('0'))))
+        self.frames += 1
+        try:
+            self.queue.put_nowait(frame)
+        except queue.Full:
+            self.waits += 1
+            self.queue.put(frame)
+
+    def run(self, target) -> None:
+        """
+        Цикл рабочего потока: пишет кадры до метки конца None.
+        После ошибки поток только разбирает очередь, чтобы игра
+        не ждала её освобождения.
+        """
+        while True:
+            frame = self.queue.get()
+            if frame is None:
+                return
+            if not self.errors:
+                try:
+                    target(*frame)
+                except Exception as error:
+                    self.errors.append(error)
+
+    def write_png(self, index: int, size: Tuple[int, int],
+                  pixels: bytes) -> None:
+        """Кодирует кадр номер 'index' в отдельный PNG."""
+        pg.image.save(pg.image.frombuffer(pixels, size, 'RGBX'),
+                      os.path.join(self.path, PNG_NAME.format(index)))
+
+    def write_raw(self, index: int, size: Tuple[int, int],
+                  pixels: bytes) -> None:
+        """Дописывает кадр в сырой поток."""
+        self.stream.write(pixels)
+
+    def close(self) -> None:
+        """
+        Дожидается записи всех кадров из очереди и останавливает
+        потоки.
+        """
+        if not any(worker.is_alive() for worker in self.workers):
+            return
+        for _ in self.workers:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.join()
+        if self.stream is not None:
+            self.stream.close()
+        if self.errors:
+            raise self.errors[0]
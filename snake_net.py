@@ -0,0 +1,400 @@
+"""
+Сетевая игра: сервер asyncio и клиентское состояние.
+
+Сервер ведёт `snake_arena.Arena` с фиксированной частотой тиков,
+каждый подключённый клиент управляет своей змейкой. Клиенты
+присылают только повороты, а сервер после тика рассылает всем одно
+и то же изменение (дельту): новые головы, снятые хвосты, возрождения
+змеек и переставленные яблоки. Полное состояние (снимок) уходит
+клиенту при подключении и по запросу, если клиент разошёлся
+с сервером. Запуск сервера:
+
+    python snake_net.py --port 8765
+
+Сообщения - кадры: длина (4 байта, little-endian) и тело.
+Тело начинается с байта типа, дальше беззнаковые varint
+(`snake_replay.encode_varint`); клетка кодируется номером
+y * ширина + x.
+    Снимок: тик, номер своей змейки, ширина и высота поля,
+    количество змеек и для каждой номер и клетки от головы,
+    яблоки - количество и клетки.
+    Дельта: тик, количество записей змеек, записи
+    (номер змейки, (клетка << 2) | вид записи), снятые и новые
+    яблоки - количество и клетки, общее число сегментов змеек
+    для проверки расхождения.
+    От клиента: `MSG_TURN` и код направления или `MSG_RESYNC`.
+Модуль не импортирует pygame.
+"""
+import argparse
+import asyncio
+import struct
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Set, Tuple, Union
+
+from snake_arena import Arena
+from snake_engine import (
+    EVENT_BITE,
+    EVENT_WIN,
+    GRID_HEIGHT,
+    GRID_WIDTH,
+)
+from snake_replay import DIRECTION_CODES, decode_varint, encode_varint
+from snake_world import WorldSnake
+
+# Тиков в секунду на сервере по умолчанию.
+TICK_RATE = 10
+
+# Заголовок кадра: длина тела сообщения.
+FRAME_HEADER = struct.Struct('<I')
+
+# Типы сообщений сервера и клиента.
+MSG_SNAPSHOT = 0
+MSG_DELTA = 1
+MSG_TURN = 0
+MSG_RESYNC = 1
+
+# Виды записей змеек в дельте: ход с хвостом, рост (хвост на месте),
+# появление змейки в одной клетке и её уход с поля.
+RECORD_MOVE = 0
+RECORD_GROW = 1
+RECORD_SPAWN = 2
+RECORD_LEAVE = 3
+RECORD_BITS = 2
+
+# Клиент, который не забирает данные и накопил в буфере больше
+# этого числа байт, отключается, чтобы не задерживать остальных.
+MAX_WRITE_BUFFER = 1 << 20
+
+
+def frame(payload: bytes) -> bytes:
+    """Добавляет к телу сообщения заголовок с длиной."""
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Читает тело очередного сообщения из потока 'reader'."""
+    header = await reader.readexactly(FRAME_HEADER.size)
+    return await reader.readexactly(FRAME_HEADER.unpack(header)[0])
+
+
+def encode_cells(cells, width: int) -> bytes:
+    """Кодирует клетки: количество и номера клеток."""
+    return encode_varint(len(cells)) + b''.join(
+        encode_varint(y * width + x) for x, y in cells
+    )
+
+
+def decode_cells(buffer: bytes, offset: int,
+                 width: int) -> Tuple[List[Tuple[int, int]], int]:
+    """Читает клетки, записанные `encode_cells`."""
+    count, offset = decode_varint(buffer, offset)
+    cells = []
+    for _ in range(count):
+        cell, offset = decode_varint(buffer, offset)
+        cells.append((cell % width, cell // width))
+    return cells, offset
+
+
+class GameServer:
+    """
+    Авторитетный сервер сетевой игры.
+
+    'world_width', 'world_height' - размеры поля в клетках,
+    по умолчанию как у окна игры; 'apples' - количество яблок;
+    'tick_rate' - тиков в секунду; 'seed' - зерно арены.
+    """
+
+    def __init__(
+            self,
+            world_width: int = GRID_WIDTH,
+            world_height: int = GRID_HEIGHT,
+            apples: int = 1,
+            tick_rate: int = TICK_RATE,
+            seed: Union[int, None] = None,
+    ) -> None:
+        self.arena = Arena(0, apples, world_width, world_height, seed)
+        self.tick_rate = tick_rate
+        self.snakes: Dict[int, WorldSnake] = {}
+        self.writers: Dict[int, asyncio.StreamWriter] = {}
+        self.next_id = 0
+        # Появления и уходы змеек с прошлого тика.
+        self.records: List[Tuple[int, int, int]] = []
+
+    def encode_snapshot(self, snake_id: int) -> bytes:
+        """Кодирует снимок поля для клиента змейки 'snake_id'."""
+        arena = self.arena
+        width = arena.world_width
+        parts = [bytes((MSG_SNAPSHOT,)), encode_varint(arena.ticks),
+                 encode_varint(snake_id), encode_varint(width),
+                 encode_varint(arena.world_height),
+                 encode_varint(len(self.snakes))]
+        for other_id, snake in self.snakes.items():
+            parts.append(encode_varint(other_id))
+            parts.append(encode_cells(snake.positions, width))
+        parts.append(encode_cells(arena.apples, width))
+        return b''.join(parts)
+
+    def join(self, writer: asyncio.StreamWriter) -> int:
+        """
+        Добавляет змейку нового клиента и отправляет ему снимок.
+        Если на поле нет свободной клетки, поднимается `ValueError`.
+        """
+        snake_id, self.next_id = self.next_id, self.next_id + 1
+        snake = self.snakes[snake_id] = self.arena.add_snake()
+        self.writers[snake_id] = writer
+        self.records.append((snake_id, snake.get_head_position(),
+                             RECORD_SPAWN))
+        writer.write(frame(self.encode_snapshot(snake_id)))
+        return snake_id
+
+    def leave(self, snake_id: int) -> None:
+        """Убирает змейку отключившегося клиента."""
+        self.writers.pop(snake_id, None)
+        snake = self.snakes.pop(snake_id, None)
+        if snake is not None:
+            self.arena.remove_snake(snake)
+            self.records.append((snake_id, (0, 0), RECORD_LEAVE))
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """
+        Обслуживает подключение клиента до его отключения.
+        Если на поле нет места для змейки, соединение закрывается.
+        """
+        try:
+            snake_id = self.join(writer)
+        except ValueError:
+            writer.close()
+            return
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message[0] == MSG_TURN:
+                    self.snakes[snake_id].queue_turn(
+                        DIRECTION_CODES[message[1]]
+                    )
+                elif message[0] == MSG_RESYNC:
+                    writer.write(frame(self.encode_snapshot(snake_id)))
+        except (asyncio.IncompleteReadError, ConnectionError,
+                IndexError, KeyError):
+            pass
+        finally:
+            self.leave(snake_id)
+            writer.close()
+
+    def tick(self) -> bytes:
+        """Выполняет тик арены и возвращает дельту тика."""
+        arena = self.arena
+        apples = set(arena.apples)
+        for snake in self.snakes.values():
+            snake.apply_turn()
+        _, events = arena.step()
+
+        records = self.records
+        self.records = []
+        # Змейки добавляются и убираются вместе с `arena.snakes`,
+        # поэтому порядок словаря совпадает с порядком событий.
+        for (snake_id, snake), event in zip(self.snakes.items(), events):
+            if event in (EVENT_BITE, EVENT_WIN):
+                kind = RECORD_SPAWN
+            else:
+                kind = RECORD_MOVE if snake.last is not None else RECORD_GROW
+            records.append((snake_id, snake.get_head_position(), kind))
+
+        width = arena.world_width
+        parts = [bytes((MSG_DELTA,)), encode_varint(arena.ticks),
+                 encode_varint(len(records))]
+        for snake_id, (x, y), kind in records:
+            parts.append(encode_varint(snake_id))
+            parts.append(encode_varint((y * width + x) << RECORD_BITS | kind))
+        parts.append(encode_cells(apples - arena.apples, width))
+        parts.append(encode_cells(arena.apples - apples, width))
+        parts.append(encode_varint(len(arena.occupied)))
+        return b''.join(parts)
+
+    def broadcast(self, payload: bytes) -> None:
+        """
+        Отправляет сообщение всем клиентам без ожидания сети:
+        одно и то же тело кодируется один раз на тик.
+        """
+        message = frame(payload)
+        for snake_id, writer in list(self.writers.items()):
+            if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                writer.close()
+                self.leave(snake_id)
+            else:
+                writer.write(message)
+
+    async def run(self, host: str = '127.0.0.1', port: int = 0,
+                  started: Union[asyncio.Future, None] = None) -> None:
+        """
+        Принимает клиентов на 'host':'port' и ведёт тики, пока
+        задачу не отменят. В 'started' передаётся сокет сервера,
+        например чтобы узнать выбранный порт.
+        """
+        loop = asyncio.get_running_loop()
+        server = await asyncio.start_server(self.handle_client, host, port)
+        if started is not None:
+            started.set_result(server.sockets[0].getsockname())
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        async with server:
+            while True:
+                next_tick += interval
+                self.broadcast(self.tick())
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+
+class Changes(NamedTuple):
+    """Клетки, изменившиеся на поле клиента за одну дельту."""
+
+    erased: List[Tuple[int, int]]
+    snakes: List[Tuple[int, Tuple[int, int]]]
+    apples: List[Tuple[int, int]]
+
+
+class ClientState:
+    """Копия поля на клиенте, которую обновляют снимки и дельты."""
+
+    def __init__(self) -> None:
+        self.tick = -1
+        self.snake_id = -1
+        self.width = self.height = 0
+        self.snakes: Dict[int, Deque[Tuple[int, int]]] = {}
+        self.apples: Set[Tuple[int, int]] = set()
+
+    def apply_snapshot(self, message: bytes) -> None:
+        """Заменяет поле снимком сервера."""
+        values = []
+        offset = 1
+        for _ in range(5):
+            value, offset = decode_varint(message, offset)
+            values.append(value)
+        self.tick, self.snake_id, self.width, self.height, count = values
+        self.snakes = {}
+        for _ in range(count):
+            snake_id, offset = decode_varint(message, offset)
+            cells, offset = decode_cells(message, offset, self.width)
+            self.snakes[snake_id] = deque(cells)
+        apples, _ = decode_cells(message, offset, self.width)
+        self.apples = set(apples)
+
+    def apply_record(self, snake_id: int, cell: Tuple[int, int],
+                     kind: int, changes: Changes) -> None:
+        """Применяет к полю запись змейки из дельты."""
+        body = self.snakes.setdefault(snake_id, deque())
+        if kind in (RECORD_SPAWN, RECORD_LEAVE):
+            changes.erased.extend(body)
+            body.clear()
+        elif kind == RECORD_MOVE and body:
+            changes.erased.append(body.pop())
+        if kind == RECORD_LEAVE:
+            del self.snakes[snake_id]
+            return
+        body.appendleft(cell)
+        changes.snakes.append((snake_id, cell))
+
+    def apply_delta(self, message: bytes) -> Union[Changes, None]:
+        """
+        Применяет дельту и возвращает изменившиеся клетки или None,
+        если поле разошлось с сервером и нужен новый снимок.
+        Дельты старше снимка пропускаются.
+        """
+        tick, offset = decode_varint(message, 1)
+        if tick <= self.tick:
+            return Changes([], [], [])
+        if tick != self.tick + 1:
+            return None
+        self.tick = tick
+        changes = Changes([], [], [])
+        count, offset = decode_varint(message, offset)
+        for _ in range(count):
+            snake_id, offset = decode_varint(message, offset)
+            value, offset = decode_varint(message, offset)
+            cell = value >> RECORD_BITS
+            self.apply_record(snake_id,
+                              (cell % self.width, cell // self.width),
+                              value & ((1 << RECORD_BITS) - 1), changes)
+        eaten, offset = decode_cells(message, offset, self.width)
+        placed, offset = decode_cells(message, offset, self.width)
+        self.apples.difference_update(eaten)
+        self.apples.update(placed)
+        changes.apples.extend(placed)
+        segments, _ = decode_varint(message, offset)
+        if segments != sum(map(len, self.snakes.values())):
+            return None
+        return changes
+
+
+class NetClient:
+    """Подключение клиента к серверу и его копия поля `state`."""
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.state = ClientState()
+        self.resyncing = False
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> 'NetClient':
+        """Подключается к серверу 'host':'port'."""
+        return cls(*await asyncio.open_connection(host, port))
+
+    def send_turn(self, direction: Tuple[int, int]) -> None:
+        """Отправляет серверу поворот своей змейки."""
+        self.writer.write(frame(bytes(
+            (MSG_TURN, DIRECTION_CODES.index(direction))
+        )))
+
+    async def receive(self) -> Union[Changes, None]:
+        """
+        Ждёт сообщение сервера и применяет его к `state`.
+        Возвращает изменившиеся клетки или None после снимка - тогда
+        поле надо перерисовать целиком. При расхождении с сервером
+        запрашивает снимок и ждёт его.
+        """
+        while True:
+            message = await read_frame(self.reader)
+            if message[0] == MSG_SNAPSHOT:
+                self.state.apply_snapshot(message)
+                self.resyncing = False
+                return None
+            if self.resyncing:
+                continue
+            changes = self.state.apply_delta(message)
+            if changes is not None:
+                return changes
+            self.resyncing = True
+            self.writer.write(frame(bytes((MSG_RESYNC,))))
+
+    def close(self) -> None:
+        """Закрывает подключение."""
+        self.writer.close()
+
+
+def main() -> None:
+    """Запускает сервер из командной строки."""
+    parser = argparse.ArgumentParser(description='Сервер Змейки.')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='адрес для подключений')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='порт для подключений')
+    parser.add_argument('--width', type=int, default=GRID_WIDTH,
+                        help='ширина поля в клетках')
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT,
+                        help='высота поля в клетках')
+    parser.add_argument('--apples', type=int, default=1,
+                        help='количество яблок')
+    parser.add_argument('--tick-rate', type=int, default=TICK_RATE,
+                        help='тиков в секунду')
+    args = parser.parse_args()
+    server = GameServer(args.width, args.height, args.apples, args.tick_rate)
+    try:
+        asyncio.run(server.run(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,436 @@
+"""
+Запись и воспроизведение партий Змейки.
+
+Реплей хранит только зерно генератора партии, начальную скорость,
+размер поля с режимом краёв и изменения направления и скорости
+по тикам, поэтому партия любой длины занимает десятки байт.
+Воспроизведение заново считает партию на `snake_engine.Game`
+без окна.
+
+Для быстрой перемотки реплей может содержать ключевые кадры -
+полное состояние партии через каждые `keyframe_interval` тиков.
+Перемотка к тику N загружает ближайший ключевой кадр не позже N
+и досчитывает не больше `keyframe_interval` тиков.
+
+Формат файла:
+    MAGIC, версия (1 байт), varint зерна, varint скорости,
+    varint ширины и высоты поля в клетках, varint 1 - края поля
+    проходимы, 0 - стены (в версии 1 этих полей нет: поле окна);
+    записи varint((тиков с прошлой записи << CODE_BITS) | код),
+    после записи `CODE_SPEED` идёт varint новой скорости,
+    после `CODE_KEYFRAME` - varint длины и сам ключевой кадр,
+    `CODE_END` закрывает реплей;
+    индекс ключевых кадров: varint количества и пары varint
+    (прирост тика, прирост смещения кадра);
+    подвал: смещение индекса (8 байт, little-endian) и INDEX_MAGIC.
+Все числа - беззнаковые varint (LEB128). Без подвала (например,
+если запись оборвалась) ключевые кадры находятся обходом записей.
+"""
+import argparse
+import mmap
+import struct
+from bisect import bisect_right
+from typing import BinaryIO, Iterator, List, Sequence, Tuple, Union
+
+from snake_engine import (
+    DEFAULT_BOARD,
+    DIRECTION_CODES,
+    RNG_STATE,
+    Board,
+    Game,
+)
+
+MAGIC = b'SNKR'
+INDEX_MAGIC = b'SNKI'
+VERSION = 2
+
+# Коды записей. Коды 0-3 - новое направление змейки
+# (`snake_engine.DIRECTION_CODES`).
+CODE_SPEED = 4
+CODE_KEYFRAME = 5
+CODE_END = 7
+CODE_BITS = 3
+
+# Интервал ключевых кадров по умолчанию, в тиках.
+KEYFRAME_INTERVAL = 1000
+
+# Подвал: смещение индекса ключевых кадров и INDEX_MAGIC.
+FOOTER = struct.Struct('<Q4s')
+
+
+def encode_varint(value: int) -> bytes:
+    """Кодирует неотрицательное число 'value' в varint."""
+    result = bytearray()
+    while value > 0x7F:
+        result.append((value & 0x7F) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
+def decode_varint(buffer: Union[bytes, mmap.mmap],
+                  offset: int) -> Tuple[int, int]:
+    """
+    Читает varint из 'buffer' начиная с 'offset'.
+    Возвращает пару (число, смещение следующего байта).
+    """
+    value = shift = 0
+    while True:
+        byte = buffer[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def encode_cells(cells: Sequence[int]) -> bytes:
+    """Кодирует номера клеток: количество и номера."""
+    return encode_varint(len(cells)) + b''.join(
+        encode_varint(cell) for cell in cells
+    )
+
+
+def decode_cells(buffer: Union[bytes, mmap.mmap],
+                 offset: int) -> Tuple[List[int], int]:
+    """Читает номера клеток, записанные `encode_cells`."""
+    count, offset = decode_varint(buffer, offset)
+    cells = []
+    for _ in range(count):
+        cell, offset = decode_varint(buffer, offset)
+        cells.append(cell)
+    return cells, offset
+
+
+def encode_keyframe(game: Game) -> bytes:
+    """
+    Кодирует полное состояние партии 'game': тик, длину, направление,
+    яблоко, тело змейки, порядок индекса свободных клеток
+    и состояние генератора случайных чисел.
+    """
+    snake = game.snake
+    _, rng_state, _ = game.rng.getstate()
+    return b''.join((
+        encode_varint(game.ticks),
+        encode_varint(snake.length),
+        encode_varint(DIRECTION_CODES.index(snake.direction)),
+        encode_varint(snake.board.to_cell(game.apple.position)),
+        encode_cells(snake.body),
+        encode_cells(snake.free_cells.cells),
+        RNG_STATE.pack(*rng_state),
+    ))
+
+
+def restore_keyframe(game: Game, buffer: Union[bytes, mmap.mmap],
+                     offset: int) -> None:
+    """Восстанавливает в 'game' состояние из ключевого кадра."""
+    snake = game.snake
+    game.ticks, offset = decode_varint(buffer, offset)
+    snake.length, offset = decode_varint(buffer, offset)
+    direction, offset = decode_varint(buffer, offset)
+    snake.direction = DIRECTION_CODES[direction]
+    apple, offset = decode_varint(buffer, offset)
+    game.apple.position = snake.board.positions[apple]
+    body, offset = decode_cells(buffer, offset)
+    free_cells, offset = decode_cells(buffer, offset)
+    snake.restore(body, free_cells)
+    rng_state = RNG_STATE.unpack_from(buffer, offset)
+    game.rng.setstate((3, rng_state, None))
+
+
+class ReplayWriter:
+    """
+    Пишет реплей партии в файл 'path'.
+
+    'seed' - зерно партии (`Game.seed`), 'speed' - начальная
+    скорость, 'keyframe_interval' - через сколько тиков писать
+    ключевые кадры (None - не писать), 'board' - поле партии,
+    по умолчанию `DEFAULT_BOARD`. Чем реже кадры, тем меньше
+    файл и тем дольше перемотка. Записи только дописываются в конец
+    файла, поэтому оборванная запись остаётся читаемой до последней
+    целой записи.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            seed: int,
+            speed: int,
+            keyframe_interval: Union[int, None] = None,
+            board: Union[Board, None] = None,
+    ) -> None:
+        board = board or DEFAULT_BOARD
+        self.file: BinaryIO = open(path, 'wb')
+        self.file.write(MAGIC + bytes((VERSION,))
+                        + encode_varint(seed) + encode_varint(speed)
+                        + encode_varint(board.width)
+                        + encode_varint(board.height)
+                        + encode_varint(board.wrap))
+        self.tick = 0
+        self.keyframe_interval = keyframe_interval
+        self.keyframes: List[Tuple[int, int]] = []
+
+    def __enter__(self) -> 'ReplayWriter':
+        """Возвращает сам объект записи."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Закрывает реплей на последнем записанном тике."""
+        self.close(self.tick)
+
+    def write_record(self, tick: int, code: int) -> None:
+        """Записывает код 'code' на тике 'tick'."""
+        self.file.write(
+            encode_varint(((tick - self.tick) << CODE_BITS) | code)
+        )
+        self.tick = tick
+
+    def record_direction(self, tick: int,
+                         direction: Tuple[int, int]) -> None:
+        """Записывает новое направление перед ходом номер 'tick' + 1."""
+        self.write_record(tick, DIRECTION_CODES.index(direction))
+
+    def record_speed(self, tick: int, speed: int) -> None:
+        """Записывает новую скорость на тике 'tick'."""
+        self.write_record(tick, CODE_SPEED)
+        self.file.write(encode_varint(speed))
+
+    def record_keyframe(self, game: Game) -> None:
+        """Записывает ключевой кадр с текущим состоянием 'game'."""
+        self.write_record(game.ticks, CODE_KEYFRAME)
+        self.keyframes.append((game.ticks, self.file.tell()))
+        keyframe = encode_keyframe(game)
+        self.file.write(encode_varint(len(keyframe)) + keyframe)
+
+    def record_step(self, game: Game) -> None:
+        """
+        Записывает ключевой кадр, если с прошлого кадра прошло
+        `keyframe_interval` тиков. Вызывается после ввода на тике,
+        перед следующим ходом.
+        """
+        if self.keyframe_interval is None:
+            return
+        last_tick = self.keyframes[-1][0] if self.keyframes else 0
+        if game.ticks - last_tick >= self.keyframe_interval:
+            self.record_keyframe(game)
+
+    def close(self, tick: int) -> None:
+        """
+        Закрывает реплей, отмечая последний тик партии 'tick',
+        и дописывает индекс ключевых кадров с подвалом.
+        """
+        if self.file.closed:
+            return
+        self.write_record(tick, CODE_END)
+
+        index_offset = self.file.tell()
+        index = [encode_varint(len(self.keyframes))]
+        last_tick = last_offset = 0
+        for keyframe_tick, offset in self.keyframes:
+            index.append(encode_varint(keyframe_tick - last_tick)
+                         + encode_varint(offset - last_offset))
+            last_tick, last_offset = keyframe_tick, offset
+        self.file.write(b''.join(index))
+        self.file.write(FOOTER.pack(index_offset, INDEX_MAGIC))
+        self.file.close()
+
+
+class Replay:
+    """
+    Реплей, прочитанный из файла 'path'.
+
+    Файл отображается в память через `mmap`, записи читаются
+    по мере воспроизведения без загрузки файла целиком.
+    Партии считаются на поле `board` из заголовка реплея.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            self.buffer = mmap.mmap(file.fileno(), 0,
+                                    access=mmap.ACCESS_READ)
+        if self.buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'Файл "{path}" не является реплеем Змейки.')
+        version = self.buffer[len(MAGIC)]
+        if version not in (1, VERSION):
+            raise ValueError(f'Неподдерживаемая версия реплея "{path}".')
+        self.seed, offset = decode_varint(self.buffer, len(MAGIC) + 1)
+        self.speed, offset = decode_varint(self.buffer, offset)
+        self.board = DEFAULT_BOARD
+        if version > 1:
+            width, offset = decode_varint(self.buffer, offset)
+            height, offset = decode_varint(self.buffer, offset)
+            wrap, offset = decode_varint(self.buffer, offset)
+            self.board = Board(width, height, wrap=bool(wrap))
+        self.records_offset = offset
+        self.keyframe_ticks, self.keyframe_offsets = self.read_index()
+
+    def __enter__(self) -> 'Replay':
+        """Возвращает сам реплей."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Освобождает отображение файла."""
+        self.close()
+
+    def close(self) -> None:
+        """Освобождает отображение файла."""
+        self.buffer.close()
+
+    def create_game(self) -> Game:
+        """Создаёт новую логическую партию с зерном и полем реплея."""
+        return Game(seed=self.seed, board=self.board)
+
+    def read_index(self) -> Tuple[List[int], List[int]]:
+        """
+        Читает индекс ключевых кадров из подвала файла.
+        Возвращает списки тиков и смещений кадров.
+        """
+        buffer = self.buffer
+        if (len(buffer) < self.records_offset + FOOTER.size
+                or buffer[-len(INDEX_MAGIC):] != INDEX_MAGIC):
+            return self.scan_keyframes()
+        offset, _ = FOOTER.unpack_from(buffer, len(buffer) - FOOTER.size)
+        count, offset = decode_varint(buffer, offset)
+        ticks, offsets = [], []
+        tick = keyframe_offset = 0
+        for _ in range(count):
+            tick_delta, offset = decode_varint(buffer, offset)
+            offset_delta, offset = decode_varint(buffer, offset)
+            tick += tick_delta
+            keyframe_offset += offset_delta
+            ticks.append(tick)
+            offsets.append(keyframe_offset)
+        return ticks, offsets
+
+    def scan_keyframes(self) -> Tuple[List[int], List[int]]:
+        """Находит ключевые кадры обходом записей реплея без индекса."""
+        ticks, offsets = [], []
+        for tick, code, value in self.records():
+            if code == CODE_KEYFRAME:
+                ticks.append(tick)
+                offsets.append(value)
+        return ticks, offsets
+
+    def records(
+            self,
+            offset: Union[int, None] = None,
+            tick: int = 0,
+    ) -> Iterator[Tuple[int, int, int]]:
+        """
+        Перебирает записи реплея как тройки (тик, код, значение),
+        начиная со смещения 'offset', где текущий тик равен 'tick'.
+        Значение - новая скорость для `CODE_SPEED`, смещение кадра
+        для `CODE_KEYFRAME`, иначе 0. Оборванная последняя запись
+        пропускается.
+        """
+        buffer = self.buffer
+        if offset is None:
+            offset = self.records_offset
+        try:
+            while True:
+                record, offset = decode_varint(buffer, offset)
+                tick += record >> CODE_BITS
+                code = record & ((1 << CODE_BITS) - 1)
+                value = 0
+                if code == CODE_SPEED:
+                    value, offset = decode_varint(buffer, offset)
+                elif code == CODE_KEYFRAME:
+                    value = offset
+                    size, offset = decode_varint(buffer, offset)
+                    offset += size
+                    if offset > len(buffer):
+                        return
+                yield tick, code, value
+                if code == CODE_END:
+                    return
+        except IndexError:
+            return
+
+    def seek(self, tick: int) -> Game:
+        """
+        Возвращает состояние партии после тика 'tick' (но не дальше
+        конца реплея). Считается от ближайшего ключевого кадра,
+        поэтому время не зависит от длины партии.
+        """
+        game = self.create_game()
+        position = bisect_right(self.keyframe_ticks, tick)
+        if not position:
+            return self.simulate(game, self.records(), tick)
+
+        offset = self.keyframe_offsets[position - 1]
+        size, payload_offset = decode_varint(self.buffer, offset)
+        restore_keyframe(game, self.buffer, payload_offset)
+        return self.simulate(
+            game, self.records(payload_offset + size, game.ticks), tick
+        )
+
+    @staticmethod
+    def simulate(
+            game: Game,
+            records: Iterator[Tuple[int, int, int]],
+            until_tick: Union[int, None] = None,
+    ) -> Game:
+        """
+        Досчитывает 'game' по записям 'records' до тика 'until_tick'
+        (по умолчанию - до конца реплея).
+        """
+        for tick, code, _ in records:
+            if until_tick is not None and tick > until_tick:
+                break
+            while game.ticks < tick:
+                game.step()
+            if code < len(DIRECTION_CODES):
+                # Направление уже проверено при записи, поэтому
+                # оно ставится напрямую, без `Snake.turn`.
+                game.snake.direction = DIRECTION_CODES[code]
+            elif code == CODE_END:
+                return game
+        while until_tick is not None and game.ticks < until_tick:
+            game.step()
+        return game
+
+    def steps(self, game: Union[Game, None] = None) -> Iterator[str]:
+        """
+        Считает партию с начала по тику и после каждого тика
+        возвращает его событие, например чтобы нарисовать кадр.
+        'game' - новая партия с зерном и полем реплея, например
+        с рисуемыми объектами; по умолчанию `create_game`.
+        """
+        if game is None:
+            game = self.create_game()
+        for tick, code, _ in self.records():
+            while game.ticks < tick:
+                yield game.step()[1]
+            if code < len(DIRECTION_CODES):
+                game.snake.direction = DIRECTION_CODES[code]
+            elif code == CODE_END:
+                return
+
+    def play(self, until_tick: Union[int, None] = None) -> Game:
+        """
+        Заново считает партию без окна и возвращает её состояние
+        после тика 'until_tick' (по умолчанию - в конце реплея).
+        """
+        if until_tick is not None:
+            return self.seek(until_tick)
+        return self.simulate(self.create_game(), self.records())
+
+
+def main() -> None:
+    """Воспроизводит реплей из командной строки и выводит итог."""
+    parser = argparse.ArgumentParser(description='Реплей Змейки.')
+    parser.add_argument('path', help='файл реплея')
+    parser.add_argument('--tick', type=int, default=None,
+                        help='остановиться на этом тике')
+    args = parser.parse_args()
+
+    with Replay(args.path) as replay:
+        game = replay.play(args.tick)
+    print(f'Зерно {replay.seed}, тик {game.ticks}, '
+          f'длина {game.snake.length}, '
+          f'голова {game.snake.get_head_position()}, '
+          f'яблоко {game.apple.position}')
+
+
+if __name__ == '__main__':
+    main()
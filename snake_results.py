@@ -0,0 +1,204 @@
+"""
+Итоги партий Змейки в локальной базе SQLite.
+
+`ResultStore.add` копит итоги в памяти и отдаёт их пачками по
+`BATCH_SIZE` потоку записи, который вставляет пачку одной
+транзакцией в своём соединении. Цикл игры или турнира ждёт запись,
+только когда очередь пачек заполнена. Индексы таблицы покрывают
+таблицу рекордов (`top`), рекорды игрока и итоги по зерну партии
+(`by_seed`). Модуль не импортирует pygame.
+"""
+import queue
+import sqlite3
+import threading
+from typing import Iterable, List, NamedTuple, Union
+
+# Итогов в одной транзакции и пачек в очереди потока записи.
+BATCH_SIZE = 1000
+QUEUE_SIZE = 8
+
+# Причины конца партии, кроме `EVENT_BITE` и `EVENT_WIN` движка:
+# лимит тиков турнира и выход из игры.
+CAUSE_TIMEOUT = 'timeout'
+CAUSE_QUIT = 'quit'
+
+SCHEMA = (
+    'PRAGMA journal_mode = WAL',
+    '''CREATE TABLE IF NOT EXISTS results (
+        id INTEGER PRIMARY KEY,
+        player TEXT NOT NULL,
+        seed INTEGER,
+        length INTEGER NOT NULL,
+        ticks INTEGER NOT NULL,
+        cause TEXT NOT NULL,
+        speed INTEGER
+    )''',
+    'CREATE INDEX IF NOT EXISTS results_top '
+    'ON results (length DESC, ticks)',
+    'CREATE INDEX IF NOT EXISTS results_player_top '
+    'ON results (player, length DESC, ticks)',
+    'CREATE INDEX IF NOT EXISTS results_seed '
+    'ON results (seed, length DESC, ticks)',
+)
+
+COLUMNS = 'player, seed, length, ticks, cause, speed'
+INSERT = f'INSERT INTO results ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)'
+
+
+class ResultRow(NamedTuple):
+    """
+    Итог одной партии: игрок или агент, зерно (None - партию
+    не повторить по зерну), достигнутая длина, тики партии, причина
+    конца и скорость игры (None - без окна или в режиме, несравнимом
+    с обычной игрой: турбо, стены).
+    """
+
+    player: str
+    seed: Union[int, None]
+    length: int
+    ticks: int
+    cause: str
+    speed: Union[int, None] = None
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Открывает базу 'path' и создаёт таблицу с индексами."""
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA synchronous = NORMAL')
+    for statement in SCHEMA:
+        connection.execute(statement)
+    connection.commit()
+    return connection
+
+
+class ResultStore:
+    """
+    Хранилище итогов в базе 'path'.
+
+    'batch_size' - итогов в пачке; 'queue_size' - пачек, которые
+    ждут записи. Запросы (`top`, `by_seed`) сначала дожидаются
+    записи накопленных итогов. Ошибка потока записи поднимается
+    из `flush` и `close`.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            batch_size: int = BATCH_SIZE,
+            queue_size: int = QUEUE_SIZE,
+    ) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.pending: List[ResultRow] = []
+        self.errors: List[Exception] = []
+        # Соединение SQLite привязано к потоку: это - для запросов,
+        # у потока записи своё.
+        self.connection = connect(path)
+        self.queue: queue.Queue = queue.Queue(queue_size)
+        self.writer = threading.Thread(target=self.run, daemon=True)
+        self.writer.start()
+
+    def __enter__(self) -> 'ResultStore':
+        """Возвращает само хранилище."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Записывает оставшиеся итоги и закрывает базу."""
+        self.close()
+
+    def add(self, row: ResultRow) -> None:
+        """Добавляет итог партии 'row'."""
+        self.pending.append(row)
+        if len(self.pending) >= self.batch_size:
+            self.submit()
+
+    def extend(self, rows: Iterable[ResultRow]) -> None:
+        """Добавляет итоги партий 'rows'."""
+        self.pending.extend(rows)
+        if len(self.pending) >= self.batch_size:
+            self.submit()
+
+    def submit(self) -> None:
+        """Отдаёт накопленные итоги потоку записи."""
+        if self.pending:
+            self.queue.put(self.pending)
+            self.pending = []
+
+    def run(self) -> None:
+        """
+        Цикл потока записи: вставляет пачки до метки конца None.
+        Соединение открывается с первой пачкой. Любая ошибка пачки
+        запоминается, и поток продолжает разбирать очередь, чтобы
+        `flush` не ждал её вечно.
+        """
+        connection = None
+        while True:
+            batch = self.queue.get()
+            try:
+                if batch is None:
+                    if connection is not None:
+                        connection.close()
+                    return
+                if connection is None:
+                    connection = sqlite3.connect(self.path)
+                    connection.execute('PRAGMA synchronous = NORMAL')
+                with connection:
+                    connection.executemany(INSERT, batch)
+            except Exception as error:
+                self.errors.append(error)
+            finally:
+                self.queue.task_done()
+
+    def flush(self) -> None:
+        """Дожидается записи всех добавленных итогов."""
+        self.submit()
+        self.queue.join()
+        if self.errors:
+            raise self.errors.pop(0)
+
+    def close(self) -> None:
+        """
+        Записывает оставшиеся итоги, останавливает поток записи
+        и закрывает соединение запросов.
+        """
+        if not self.writer.is_alive():
+            self.connection.close()
+            return
+        try:
+            self.flush()
+        finally:
+            self.queue.put(None)
+            self.writer.join()
+            self.connection.close()
+
+    def query(self, sql: str, *params) -> List[ResultRow]:
+        """Выполняет запрос итогов 'sql' после записи накопленных."""
+        self.flush()
+        return [ResultRow._make(row)
+                for row in self.connection.execute(sql, params)]
+
+    def top(self, count: int = 10,
+            player: Union[str, None] = None) -> List[ResultRow]:
+        """
+        Возвращает 'count' лучших итогов: длиннее, а при равной
+        длине - быстрее. С 'player' - только итоги этого игрока.
+        """
+        if player is None:
+            return self.query(
+                f'SELECT {COLUMNS} FROM results '
+                'ORDER BY length DESC, ticks LIMIT ?', count,
+            )
+        return self.query(
+            f'SELECT {COLUMNS} FROM results WHERE player = ? '
+            'ORDER BY length DESC, ticks LIMIT ?', player, count,
+        )
+
+    def by_seed(self, seed: int) -> List[ResultRow]:
+        """
+        Возвращает итоги партий с зерном 'seed', лучшие первыми.
+        Итоги без зерна сюда не попадают.
+        """
+        return self.query(
+            f'SELECT {COLUMNS} FROM results WHERE seed = ? '
+            'ORDER BY length DESC, ticks', seed,
+        )
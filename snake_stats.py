@@ -0,0 +1,135 @@
+"""
+Покадровый профиль игрового цикла.
+
+`FrameProfiler` раскладывает время каждого кадра по фазам (ввод,
+ход змейки, проверки, отрисовка, вывод на дисплей, ожидание часов)
+и хранит последние кадры в кольцевом буфере фиксированного размера.
+Модуль не импортирует pygame.
+"""
+import csv
+import json
+import time
+from array import array
+from typing import Dict, List, Tuple
+
+# Фазы кадра в порядке их выполнения в `the_snake.main`.
+PHASE_SLEEP = 'sleep'  # Ожидание в `clock.tick`.
+PHASE_INPUT = 'input'  # `handle_keys` и запись реплея.
+PHASE_MOVE = 'move'  # Победа, поворот и ход змейки.
+PHASE_COLLISION = 'collision'  # Укус и съедание яблока.
+PHASE_DRAW = 'draw'  # Отрисовка объектов.
+PHASE_UPDATE = 'update'  # `pg.display.update`.
+PHASES = (PHASE_SLEEP, PHASE_INPUT, PHASE_MOVE, PHASE_COLLISION,
+          PHASE_DRAW, PHASE_UPDATE)
+
+# Сколько последних кадров хранит профиль по умолчанию.
+PROFILE_CAPACITY = 1024
+
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    """
+    Профиль последних 'capacity' кадров.
+
+    В начале кадра вызывается `start_frame`, после каждой фазы -
+    `mark(фаза)`: фазе достаётся время с предыдущей отметки.
+    Кадр попадает в буфер при следующем `start_frame`.
+    """
+
+    def __init__(self, capacity: int = PROFILE_CAPACITY) -> None:
+        self.capacity = capacity
+        self.timings: Dict[str, array] = {
+            phase: array('d', bytes(8 * capacity)) for phase in PHASES
+        }
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frames = 0
+        self.started = None
+        self.last_mark = 0.0
+
+    def __len__(self) -> int:
+        """Возвращает количество кадров в буфере."""
+        return min(self.frames, self.capacity)
+
+    def start_frame(self) -> None:
+        """Сохраняет предыдущий кадр и начинает новый."""
+        now = time.perf_counter()
+        if self.started is not None:
+            index = self.frames % self.capacity
+            for phase, duration in self.current.items():
+                self.timings[phase][index] = duration
+                self.current[phase] = 0.0
+            self.frames += 1
+        self.started = self.last_mark = now
+
+    def mark(self, phase: str) -> None:
+        """Относит время с предыдущей отметки к фазе 'phase'."""
+        now = time.perf_counter()
+        self.current[phase] += now - self.last_mark
+        self.last_mark = now
+
+    def samples(self, phase: str) -> List[float]:
+        """Возвращает длительности фазы 'phase' по кадрам буфера."""
+        return self.timings[phase][:len(self)].tolist()
+
+    def frame_times(self) -> List[float]:
+        """Возвращает полные длительности кадров буфера."""
+        return [sum(frame) for frame in zip(*(self.samples(phase)
+                                              for phase in PHASES))]
+
+    @staticmethod
+    def percentiles(samples: List[float]) -> Tuple[float, ...]:
+        """Возвращает перцентили `PERCENTILES` выборки 'samples'."""
+        if not samples:
+            return (0.0,) * len(PERCENTILES)
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return tuple(ordered[round(last * percent / 100)]
+                     for percent in PERCENTILES)
+
+    def fps(self) -> float:
+        """Возвращает среднюю частоту кадров по буферу."""
+        total = sum(self.frame_times())
+        return len(self) / total if total else 0.0
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Возвращает перцентили длительности в миллисекундах
+        по каждой фазе и по кадру целиком.
+        """
+        result = {}
+        for name, samples in [*((phase, self.samples(phase))
+                                for phase in PHASES),
+                              ('frame', self.frame_times())]:
+            result[name] = {
+                f'p{percent}': round(value * 1000, 3)
+                for percent, value in zip(PERCENTILES,
+                                          self.percentiles(samples))
+            }
+        return result
+
+    def export(self, path: str) -> None:
+        """
+        Сохраняет профиль в файл 'path': CSV с кадрами, если имя
+        оканчивается на '.csv', иначе JSON со сводкой и кадрами.
+        """
+        frames = zip(*(self.samples(phase) for phase in PHASES))
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(PHASES)
+                writer.writerows(frames)
+            return
+        with open(path, 'w') as file:
+            json.dump({'fps': self.fps(), 'summary': self.summary(),
+                       'phases': PHASES, 'frames': list(frames)}, file)
+
+
+class NullProfiler:
+    """Профиль-заглушка: игровой цикл без замеров."""
+
+    def start_frame(self) -> None:
+        """Ничего не делает."""
+
+    def mark(self, phase: str) -> None:
+        """Ничего не делает."""
@@ -0,0 +1,251 @@
+"""
+Турнир агентов Змейки на нескольких ядрах.
+
+Агент - функция, которая получает `snake_engine.Game` и возвращает
+направление (`UP`, `DOWN`, `LEFT`, `RIGHT`) или None. Партии идут
+в `ProcessPoolExecutor` на движке без pygame, поэтому рабочие
+процессы не открывают окно. Пример запуска:
+
+    python snake_tournament.py snake_tournament:greedy_policy \
+        snake_tournament:random_policy --games 10000
+
+С '--results PATH' итоги всех партий сохраняются в базу SQLite
+(`snake_results.ResultStore`).
+"""
+import argparse
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import import_module
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple, Union
+
+from snake_engine import (
+    DOWN,
+    EVENT_BITE,
+    EVENT_WIN,
+    GRID_SIZE,
+    LEFT,
+    RIGHT,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    UP,
+    Game,
+)
+from snake_results import CAUSE_TIMEOUT, ResultRow, ResultStore
+
+Policy = Callable[[Game], Union[Tuple[int, int], None]]
+
+# Ограничение длины партии в тиках по умолчанию.
+MAX_TICKS = 10_000
+
+# Сколько партий отдаётся рабочему процессу за раз.
+CHUNK_SIZE = 100
+
+
+class GameResult(NamedTuple):
+    """
+    Итог одной партии; 'cause' - причина конца: `EVENT_BITE`,
+    `EVENT_WIN` или `CAUSE_TIMEOUT`.
+    """
+
+    seed: int
+    length: int
+    ticks: int
+    won: bool
+    cause: str
+
+
+class AgentStats:
+    """Накопленная статистика агента по завершённым партиям."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.games = 0
+        self.wins = 0
+        self.total_length = 0
+        self.total_ticks = 0
+
+    def add(self, results: Iterable[GameResult]) -> None:
+        """Добавляет итоги партий 'results'."""
+        for result in results:
+            self.games += 1
+            self.wins += result.won
+            self.total_length += result.length
+            self.total_ticks += result.ticks
+
+    @property
+    def mean_length(self) -> float:
+        """Средняя достигнутая длина змейки."""
+        return self.total_length / self.games if self.games else 0.0
+
+    @property
+    def mean_ticks(self) -> float:
+        """Среднее количество тиков до конца партии."""
+        return self.total_ticks / self.games if self.games else 0.0
+
+    def __str__(self) -> str:
+        """Возвращает строку для вывода в консоль."""
+        return (f'{self.name}: партий {self.games}, '
+                f'средняя длина {self.mean_length:.2f}, '
+                f'побед {self.wins}, '
+                f'тиков до конца {self.mean_ticks:.1f}')
+
+
+def random_policy(game: Game) -> Tuple[int, int]:
+    """Агент-пример: случайное направление на каждом тике."""
+    return random.choice((UP, DOWN, LEFT, RIGHT))
+
+
+def greedy_policy(game: Game) -> Union[Tuple[int, int], None]:
+    """
+    Агент-пример: поворачивает к яблоку по кратчайшему пути
+    с учётом прохода сквозь стены, избегая занятых клеток.
+    """
+    snake = game.snake
+    head_x, head_y = snake.get_head_position()
+    apple_x, apple_y = game.apple.position
+    delta_x = (apple_x - head_x) % SCREEN_WIDTH
+    delta_y = (apple_y - head_y) % SCREEN_HEIGHT
+
+    wanted = []
+    if delta_x:
+        wanted.append(RIGHT if delta_x <= SCREEN_WIDTH // 2 else LEFT)
+    if delta_y:
+        wanted.append(DOWN if delta_y <= SCREEN_HEIGHT // 2 else UP)
+    wanted.extend((snake.direction, UP, DOWN, LEFT, RIGHT))
+
+    for direction_x, direction_y in wanted:
+        if (direction_x, direction_y) == (-snake.direction[0],
+                                          -snake.direction[1]):
+            continue
+        cell = ((head_x + direction_x * GRID_SIZE) % SCREEN_WIDTH,
+                (head_y + direction_y * GRID_SIZE) % SCREEN_HEIGHT)
+        if not snake.is_occupied(cell):
+            return direction_x, direction_y
+    return None
+
+
+def load_policy(name: str) -> Policy:
+    """Загружает агента по имени вида 'модуль:функция'."""
+    module_name, _, attr_name = name.partition(':')
+    return getattr(import_module(module_name), attr_name)
+
+
+def play_game(policy: Policy, seed: int, max_ticks: int) -> GameResult:
+    """
+    Играет одну партию до укуса, победы или 'max_ticks' тиков.
+    Случайность партии полностью задаётся зерном 'seed': им же
+    засевается модуль `random` для агентов вроде `random_policy`.
+    """
+    random.seed(seed)
+    game = Game(seed=seed)
+    snake = game.snake
+    for tick in range(1, max_ticks + 1):
+        length = snake.length
+        _, event = game.step(policy(game))
+        if event == EVENT_BITE:
+            return GameResult(seed, length, tick, False, EVENT_BITE)
+        if event == EVENT_WIN:
+            return GameResult(seed, length, tick, True, EVENT_WIN)
+    return GameResult(seed, snake.length, max_ticks, False, CAUSE_TIMEOUT)
+
+
+def play_games(
+        policy_name: str,
+        seeds: List[int],
+        max_ticks: int,
+) -> Tuple[str, List[GameResult]]:
+    """Играет партии с зёрнами 'seeds' в рабочем процессе."""
+    policy = load_policy(policy_name)
+    return policy_name, [play_game(policy, seed, max_ticks)
+                         for seed in seeds]
+
+
+def run_tournament(
+        policy_names: List[str],
+        games: int,
+        first_seed: int = 0,
+        max_ticks: int = MAX_TICKS,
+        workers: Union[int, None] = None,
+        chunk_size: int = CHUNK_SIZE,
+        store: Union[ResultStore, None] = None,
+) -> Iterable[AgentStats]:
+    """
+    Раздаёт партии агентов 'policy_names' по процессам.
+
+    Каждый агент играет одни и те же 'games' партий с зёрнами
+    начиная с 'first_seed'. Генератор отдаёт обновлённую
+    статистику агента после каждой завершённой пачки партий.
+    'store' - хранилище, в которое добавляются итоги партий.
+    """
+    stats: Dict[str, AgentStats] = {
+        name: AgentStats(name) for name in policy_names
+    }
+    seeds = range(first_seed, first_seed + games)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(play_games, name,
+                            list(seeds[start:start + chunk_size]), max_ticks)
+            for name in policy_names
+            for start in range(0, games, chunk_size)
+        ]
+        for future in as_completed(futures):
+            name, results = future.result()
+            stats[name].add(results)
+            if store is not None:
+                store.extend(
+                    ResultRow(name, result.seed, result.length,
+                              result.ticks, result.cause)
+                    for result in results
+                )
+            yield stats[name]
+
+
+def parse_positive(value: str) -> int:
+    """Разбирает целое число больше нуля для аргументов турнира."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f'нужно целое число больше нуля: {value}'
+        )
+    return number
+
+
+def main() -> None:
+    """Запускает турнир из командной строки."""
+    parser = argparse.ArgumentParser(description='Турнир агентов Змейки.')
+    parser.add_argument('policies', nargs='+',
+                        help='агенты в виде модуль:функция')
+    parser.add_argument('--games', type=parse_positive, default=1000,
+                        help='партий на агента')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='зерно первой партии')
+    parser.add_argument('--max-ticks', type=parse_positive, default=MAX_TICKS,
+                        help='ограничение длины партии')
+    parser.add_argument('--workers', type=parse_positive, default=None,
+                        help='количество процессов')
+    parser.add_argument('--chunk-size', type=parse_positive,
+                        default=CHUNK_SIZE,
+                        help='партий в одном задании процесса')
+    parser.add_argument('--results', metavar='PATH', default=None,
+                        help='сохранить итоги партий в базу SQLite')
+    args = parser.parse_args()
+
+    store = ResultStore(args.results) if args.results else None
+    final_stats = {}
+    try:
+        for stats in run_tournament(args.policies, args.games, args.seed,
+                                    args.max_ticks, args.workers,
+                                    args.chunk_size, store):
+            final_stats[stats.name] = stats
+            print(stats, flush=True)
+    finally:
+        if store is not None:
+            store.close()
+
+    print('Итоги:')
+    for name in args.policies:
+        print(final_stats[name])
+
+
+if __name__ == '__main__':
+    main()
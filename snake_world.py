@@ -0,0 +1,326 @@
+"""
+Змейка на большом поле: логическая сетка, не связанная с окном.
+
+Поле задаётся в клетках (например, 10 000 x 10 000) и замыкается
+само на себя, как обычное поле по краям окна. Занятость клеток
+хранится по чанкам `CHUNK_CELLS` x `CHUNK_CELLS`, которые создаются
+при первом касании и удаляются, когда в них не остаётся занятых
+клеток, поэтому память зависит от длины змейки, а не от площади
+поля. `Camera` выбирает видимую часть поля вокруг головы.
+Координаты в модуле - номера клеток (x, y), а не пиксели.
+Модуль не импортирует pygame.
+"""
+from collections import deque
+from typing import Dict, Iterator, Tuple, Union
+
+from snake_engine import (
+    DOWN,
+    GRID_HEIGHT,
+    GRID_WIDTH,
+    LEFT,
+    RIGHT,
+    UP,
+    Apple,
+    BaseSnake,
+    Game,
+)
+
+# Сторона чанка занятости в клетках.
+CHUNK_CELLS = 64
+
+# Яблоко появляется не дальше этого числа клеток от головы
+# по каждой оси, иначе на большом поле его не найти.
+APPLE_SPAWN_RADIUS = 12
+
+# Сколько случайных клеток пробует яблоко, прежде чем перебрать
+# всё окно появления.
+APPLE_SPAWN_ATTEMPTS = 32
+
+
+class ChunkGrid:
+    """
+    Разреженная сетка занятых клеток поля 'width' x 'height'.
+
+    Чанк - `bytearray` с флагом на каждую клетку; словарь `counts`
+    хранит количество занятых клеток чанка, и пустой чанк удаляется.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.chunks: Dict[Tuple[int, int], bytearray] = {}
+        self.counts: Dict[Tuple[int, int], int] = {}
+
+    @staticmethod
+    def locate(cell: Tuple[int, int]) -> Tuple[Tuple[int, int], int]:
+        """Возвращает ключ чанка клетки 'cell' и её номер в чанке."""
+        x, y = cell
+        return ((x // CHUNK_CELLS, y // CHUNK_CELLS),
+                y % CHUNK_CELLS * CHUNK_CELLS + x % CHUNK_CELLS)
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        """Проверяет, занята ли клетка 'cell'."""
+        key, index = self.locate(cell)
+        chunk = self.chunks.get(key)
+        return chunk is not None and chunk[index] == 1
+
+    def __len__(self) -> int:
+        """Возвращает количество занятых клеток."""
+        return sum(self.counts.values())
+
+    def add(self, cell: Tuple[int, int]) -> None:
+        """Помечает клетку 'cell' занятой, создавая чанк при надобности."""
+        key, index = self.locate(cell)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = bytearray(CHUNK_CELLS * CHUNK_CELLS)
+            self.counts[key] = 0
+        if not chunk[index]:
+            chunk[index] = 1
+            self.counts[key] += 1
+
+    def copy(self) -> 'ChunkGrid':
+        """Возвращает независимую копию сетки."""
+        other = ChunkGrid(self.width, self.height)
+        other.chunks = {key: chunk[:] for key, chunk in self.chunks.items()}
+        other.counts = dict(self.counts)
+        return other
+
+    def discard(self, cell: Tuple[int, int]) -> None:
+        """Помечает клетку 'cell' свободной и удаляет пустой чанк."""
+        key, index = self.locate(cell)
+        chunk = self.chunks.get(key)
+        if chunk is None or not chunk[index]:
+            return
+        chunk[index] = 0
+        self.counts[key] -= 1
+        if not self.counts[key]:
+            del self.chunks[key], self.counts[key]
+
+
+class Camera:
+    """
+    Окно 'view_width' x 'view_height' клеток на поле
+    'world_width' x 'world_height'. Левый верхний угол `origin`
+    ставится так, чтобы отслеживаемая клетка была в центре окна;
+    камера, как и поле, переходит через края.
+    """
+
+    def __init__(
+            self,
+            world_width: int,
+            world_height: int,
+            view_width: int = GRID_WIDTH,
+            view_height: int = GRID_HEIGHT,
+    ) -> None:
+        self.world_width = world_width
+        self.world_height = world_height
+        self.view_width = min(view_width, world_width)
+        self.view_height = min(view_height, world_height)
+        self.origin = (0, 0)
+
+    def follow(self, cell: Tuple[int, int]) -> None:
+        """Сдвигает камеру так, чтобы клетка 'cell' была в центре."""
+        self.origin = ((cell[0] - self.view_width // 2) % self.world_width,
+                       (cell[1] - self.view_height // 2) % self.world_height)
+
+    def to_view(
+            self,
+            cell: Tuple[int, int],
+    ) -> Union[Tuple[int, int], None]:
+        """
+        Возвращает клетку окна камеры для клетки поля 'cell'
+        или None, если клетка не видна.
+        """
+        x = (cell[0] - self.origin[0]) % self.world_width
+        y = (cell[1] - self.origin[1]) % self.world_height
+        if x < self.view_width and y < self.view_height:
+            return x, y
+        return None
+
+    def visible_cells(self) -> Iterator[Tuple[Tuple[int, int],
+                                              Tuple[int, int]]]:
+        """Перебирает пары (клетка поля, клетка окна) видимой области."""
+        origin_x, origin_y = self.origin
+        for y in range(self.view_height):
+            world_y = (origin_y + y) % self.world_height
+            for x in range(self.view_width):
+                yield ((origin_x + x) % self.world_width, world_y), (x, y)
+
+
+class WorldSnake(BaseSnake):
+    """
+    Змейка на поле 'world_width' x 'world_height' клеток.
+    Занятые клетки хранит `ChunkGrid` в атрибуте `occupied`,
+    индекса свободных клеток нет: на большом поле он занял бы
+    память под всё поле.
+    'occupied' - общая сетка нескольких змеек, тогда укусом
+    считается и удар в чужое тело; по умолчанию своя сетка.
+    'position' - начальная клетка, по умолчанию центр поля.
+    """
+
+    __slots__ = ('world_width', 'world_height', 'last', 'positions',
+                 'occupied')
+
+    def __init__(
+            self,
+            world_width: int,
+            world_height: int,
+            body_color: Union[Tuple[int, int, int], None] = None,
+            occupied: Union[ChunkGrid, None] = None,
+            position: Union[Tuple[int, int], None] = None,
+    ) -> None:
+        super().__init__(body_color)
+        self.world_width = world_width
+        self.world_height = world_height
+        self.position = position or (world_width // 2, world_height // 2)
+        self.last = None
+        self.positions = deque((self.position,))
+        if occupied is None:
+            occupied = ChunkGrid(world_width, world_height)
+        self.occupied = occupied
+        self.occupied.add(self.position)
+
+    def get_next_head(self) -> Tuple[int, int]:
+        """Возвращает клетку, в которую голова попадёт на этом ходу."""
+        position_x, position_y = self.positions[0]
+        direction_x, direction_y = self.direction
+        return ((position_x + direction_x) % self.world_width,
+                (position_y + direction_y) % self.world_height)
+
+    def pop_tail(self) -> None:
+        """
+        Освобождает клетку хвоста, если змейка не растёт,
+        и запоминает её в `last`.
+        """
+        self.last = None
+        if len(self.positions) >= self.length:
+            self.last = self.positions.pop()
+            self.occupied.discard(self.last)
+
+    def move(self) -> None:
+        """
+        Сдвигает змейку на клетку с переходом через края поля.
+        Укус проверяется так же, как в `Snake.move`.
+        """
+        head_position = self.get_next_head()
+        self.pop_tail()
+
+        self.bitten = (head_position in self.occupied
+                       or head_position == self.last)
+        self.positions.appendleft(head_position)
+        self.occupied.add(head_position)
+
+    def is_occupied(self, position: Tuple[int, int]) -> bool:
+        """Проверяет, занята ли клетка 'position'."""
+        return position in self.occupied
+
+    def is_head_at(self, position: Tuple[int, int]) -> bool:
+        """Проверяет, находится ли голова в клетке 'position'."""
+        return self.positions[0] == position
+
+    def get_head_position(self) -> Tuple[int, int]:
+        """Возвращает клетку головы."""
+        return self.positions[0]
+
+    def clone(self) -> 'WorldSnake':
+        """
+        Возвращает копию змейки со своей копией сетки `occupied`:
+        копия одиночной змейки не должна менять занятость оригинала.
+        """
+        other = super().clone()
+        other.world_width = self.world_width
+        other.world_height = self.world_height
+        other.last = self.last
+        other.positions = self.positions.copy()
+        other.occupied = self.occupied.copy()
+        return other
+
+    def reset(self) -> None:
+        """Сбрасывает змейку в центр поля после столкновения с собой."""
+        for cell in self.positions:
+            self.occupied.discard(cell)
+        self.occupied.add(self.position)
+
+        self.length = self.DEFAULT_LENGTH
+        self.positions = deque((self.position,))
+        self.direction = self.rng.choice([RIGHT, LEFT, UP, DOWN])
+        self.turns.clear()
+        self.last = None
+        self.bitten = False
+
+
+class WorldApple(Apple):
+    """Яблоко, которое появляется рядом с головой змейки."""
+
+    __slots__ = ('snake',)
+
+    def __init__(
+            self,
+            snake: WorldSnake,
+            body_color: Union[Tuple[int, int, int], None] = None,
+    ) -> None:
+        self.snake = snake
+        super().__init__(body_color, snake.occupied)
+
+    def randomize_position(self, exclude_positions: ChunkGrid = None) -> None:
+        """
+        Ставит Яблоко на случайную свободную клетку не дальше
+        `APPLE_SPAWN_RADIUS` клеток от головы змейки по каждой оси.
+        'exclude_positions' - занятые клетки, по умолчанию тело змейки.
+        После `APPLE_SPAWN_ATTEMPTS` неудачных попыток выбирает среди
+        свободных клеток окна; если их нет, Яблоко остаётся на месте.
+        """
+        if exclude_positions is None:
+            exclude_positions = self.snake.occupied
+        head_x, head_y = self.snake.get_head_position()
+        width, height = self.snake.world_width, self.snake.world_height
+        for _ in range(APPLE_SPAWN_ATTEMPTS):
+            position = (
+                (head_x + self.rng.randint(-APPLE_SPAWN_RADIUS,
+                                           APPLE_SPAWN_RADIUS)) % width,
+                (head_y + self.rng.randint(-APPLE_SPAWN_RADIUS,
+                                           APPLE_SPAWN_RADIUS)) % height,
+            )
+            if position not in exclude_positions:
+                self.position = position
+                return
+        # На малом поле окно заворачивается, поэтому клетки - множество.
+        offsets = range(-APPLE_SPAWN_RADIUS, APPLE_SPAWN_RADIUS + 1)
+        window = {((head_x + dx) % width, (head_y + dy) % height)
+                  for dx in offsets for dy in offsets}
+        free = sorted(cell for cell in window
+                      if cell not in exclude_positions)
+        if free:
+            self.position = self.rng.choice(free)
+
+
+class WorldGame(Game):
+    """
+    Партия на поле 'world_width' x 'world_height' клеток.
+    Правила тика те же, что у `Game`; 'snake' и 'apple' по умолчанию
+    создаются логическими `WorldSnake` и `WorldApple`.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+            self,
+            world_width: int,
+            world_height: int,
+            snake: Union[WorldSnake, None] = None,
+            apple: Union[WorldApple, None] = None,
+            seed: Union[int, None] = None,
+    ) -> None:
+        snake = snake or WorldSnake(world_width, world_height)
+        super().__init__(snake, apple or WorldApple(snake), seed)
+
+    def clone(self) -> 'WorldGame':
+        """Возвращает копию партии; яблоко копии следит за её змейкой."""
+        other = super().clone()
+        other.apple.snake = other.snake
+        return other
+
+    def place_apple(self) -> None:
+        """Ставит яблоко на свободную клетку рядом с головой змейки."""
+        self.apple.randomize_position(self.snake.occupied)
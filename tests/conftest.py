@@ -25,6 +25,33 @@ TIMEOUT_ASSERT_MSG = (
 )
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmark', 'бенчмарки горячих путей змейки')
+    group.addoption('--benchmark', action='store_true',
+                    help='запустить бенчмарки из tests/test_benchmarks.py')
+    group.addoption('--benchmark-json',
+                    default=str(BASE_DIR / 'benchmark_results.json'),
+                    help='файл для результатов бенчмарков')
+    group.addoption('--benchmark-baseline',
+                    default=str(BASE_DIR / 'tests' / 'benchmark_baseline.json'),
+                    help='файл с эталонными результатами')
+    group.addoption('--benchmark-tolerance', type=float, default=0.5,
+                    help='допустимое замедление относительно эталона')
+    group.addoption('--benchmark-update', action='store_true',
+                    help='записать результаты как новый эталон')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmark'):
+        return
+    skip_benchmark = pytest.mark.skip(
+        reason='бенчмарки запускаются с опцией --benchmark'
+    )
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 def import_the_snake():
     import the_snake  # noqa
 
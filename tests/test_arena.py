@@ -0,0 +1,90 @@
+import pytest
+
+import snake_arena as arena
+
+
+def place(arena_game, snake, cells, direction):
+    for cell in snake.positions:
+        arena_game.occupied.discard(cell)
+    snake.positions.clear()
+    snake.positions.extend(cells)
+    for cell in cells:
+        arena_game.occupied.add(cell)
+    snake.length = len(cells)
+    snake.direction = direction
+
+
+def test_head_to_head_kills_both():
+    game = arena.Arena(3, apples=0, world_width=20, world_height=20, seed=0)
+    first, second, third = game.snakes
+    place(game, first, [(4, 5)], arena.RIGHT)
+    place(game, second, [(6, 5)], arena.LEFT)
+    place(game, third, [(10, 10), (10, 11)], arena.UP)
+
+    _, events = game.step()
+
+    assert events == [arena.EVENT_BITE, arena.EVENT_BITE, arena.EVENT_MOVE], (
+        'Столкновение голов должно возрождать обе змейки.'
+    )
+    assert third.get_head_position() == (10, 9)
+
+
+def test_head_to_body_and_tail_follow():
+    game = arena.Arena(2, apples=0, world_width=20, world_height=20, seed=0)
+    first, second = game.snakes
+    place(game, first, [(5, 4), (5, 5), (5, 6)], arena.UP)
+    place(game, second, [(4, 6), (3, 6)], arena.RIGHT)
+
+    _, events = game.step()
+
+    assert events == [arena.EVENT_MOVE, arena.EVENT_MOVE], (
+        'Голова может занять клетку чужого хвоста, освобождённую '
+        'на этом же тике.'
+    )
+    first.length += 1
+    _, events = game.step([None, arena.UP])
+    assert events == [arena.EVENT_MOVE, arena.EVENT_BITE], (
+        'Удар головой в чужое тело должен возрождать змейку.'
+    )
+
+
+def test_arena_invariants_hold():
+    import random
+
+    game = arena.Arena(200, apples=50, seed=1)
+    rng = random.Random(2)
+    directions = [arena.UP, arena.DOWN, arena.LEFT, arena.RIGHT, None]
+    for _ in range(100):
+        game.step([rng.choice(directions) for _ in game.snakes])
+        cells = [cell for snake in game.snakes for cell in snake.positions]
+        assert len(cells) == len(set(cells)) == len(game.occupied), (
+            'Общая сетка должна совпадать с телами всех змеек.'
+        )
+        assert len(game.apples) == 50
+        assert not any(apple in game.occupied for apple in game.apples)
+
+
+@pytest.mark.timeout(2, method='thread')
+def test_full_arena_does_not_hang():
+    game = arena.Arena(1, apples=0, world_width=3, world_height=3, seed=0)
+    snake, = game.snakes
+    cells = [(0, 0), (1, 0), (2, 0), (2, 1), (1, 1), (0, 1), (0, 2),
+             (1, 2), (2, 2)]
+    place(game, snake, cells, arena.DOWN)
+
+    assert game.random_free_cell() is None, (
+        'На заполненном поле свободной клетки нет.'
+    )
+    with pytest.raises(ValueError):
+        game.add_snake()
+
+    _, events = game.step()
+    assert events == [arena.EVENT_BITE]
+    assert len(game.occupied) == 1, (
+        'Тело погибшей змейки должно освобождаться до возрождения.'
+    )
+
+    place(game, snake, cells, arena.DOWN)
+    game.respawn(snake)
+    assert len(snake.positions) == 1
+    assert len(game.occupied) == 1
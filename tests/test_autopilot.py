@@ -0,0 +1,94 @@
+import pytest
+
+import snake_autopilot as autopilot
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_autopilot_wins(seed):
+    from snake_engine import EVENT_BITE, EVENT_WIN, Game
+
+    game = Game(seed=seed)
+    pilot = autopilot.Autopilot()
+    for _ in range(5000):
+        _, event = game.step(pilot.decide(game))
+        assert event != EVENT_BITE, 'Автопилот не должен кусать себя.'
+        if event == EVENT_WIN:
+            break
+    assert event == EVENT_WIN, (
+        'Автопилот должен доводить змейку до `Snake.MAX_LENGTH`.'
+    )
+
+
+@pytest.mark.parametrize('width, height', ((6, 5), (8, 7), (4, 6)))
+@pytest.mark.parametrize('wrap', (False, True), ids=('walls', 'wrap'))
+def test_autopilot_wins_on_small_board(width, height, wrap):
+    from snake_engine import EVENT_BITE, EVENT_WIN, Board, Game
+
+    board = Board(width, height, wrap=wrap)
+    for seed in range(20):
+        game = Game(seed=seed, board=board)
+        pilot = autopilot.Autopilot(time_budget=1, board=board)
+        for _ in range(5000):
+            _, event = game.step(pilot.decide(game))
+            assert event != EVENT_BITE, (
+                'Срезая путь к яблоку, автопилот не должен уводить '
+                'змейку с гамильтонова цикла и кусать себя.'
+            )
+            if event == EVENT_WIN:
+                break
+        assert event == EVENT_WIN
+
+
+def test_autopilot_reuses_path():
+    from snake_engine import Game
+
+    game = Game(seed=0)
+    pilot = autopilot.Autopilot()
+    game.step(pilot.decide(game))
+    searches = pilot.searches
+    assert len(pilot.path) > 2
+    for _ in range(2):
+        game.step(pilot.decide(game))
+    assert pilot.searches == searches, (
+        'Путь к яблоку должен пересчитываться только после '
+        'перестановки яблока или если он перекрыт.'
+    )
+
+
+def test_autopilot_timeout_falls_back():
+    from snake_engine import EVENT_BITE, Game
+
+    game = Game(seed=0)
+    pilot = autopilot.Autopilot(time_budget=0)
+    for _ in range(200):
+        direction = pilot.decide(game)
+        assert direction != (-game.snake.direction[0],
+                             -game.snake.direction[1])
+        _, event = game.step(direction)
+        assert event != EVENT_BITE
+    assert pilot.timeouts == 200, (
+        'Поиск, не уложившийся во время, должен прерываться.'
+    )
+
+
+@pytest.mark.parametrize('width, height', ((32, 24), (8, 7), (7, 8), (2, 5)))
+def test_cycle_covers_board(width, height):
+    from snake_engine import Board
+
+    board = Board(width, height, wrap=False)
+    cycle = autopilot.build_cycle(width, height)
+    cell, visited = 0, set()
+    for _ in range(board.size):
+        visited.add(cell)
+        cell = board.next_cells[cycle[cell]][cell]
+        assert cell >= 0, 'Цикл не должен уходить за стену.'
+    assert cell == 0 and len(visited) == board.size, (
+        'Гамильтонов цикл должен обходить все клетки поля и замыкаться.'
+    )
+
+
+def test_odd_board_rejected():
+    from snake_engine import Board
+
+    with pytest.raises(ValueError):
+        autopilot.Autopilot(board=Board(7, 7))
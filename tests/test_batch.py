@@ -0,0 +1,43 @@
+import numpy as np
+
+import snake_batch as batch
+
+
+def test_batch_step_moves_all_games():
+    game = batch.BatchGame(8, seed=0)
+    heads = game.heads.copy()
+    game.apples[:] = 0
+
+    _, events = game.step(np.full(8, batch.DIRECTIONS.index(batch.UP)))
+
+    assert (events == batch.MOVE).all()
+    width = game.grid_width
+    turned = game.directions == batch.DIRECTIONS.index(batch.UP)
+    assert (game.heads[turned] == heads[turned] - width).all(), (
+        'Метод `step` должен сдвигать голову каждой змейки.'
+    )
+
+
+def test_batch_eat_and_win():
+    game = batch.BatchGame(2, seed=0)
+    game.directions[:] = batch.DIRECTIONS.index(batch.RIGHT)
+    game.apples[:] = game.start_cell + 1
+    game.lengths[1] = batch.Snake.MAX_LENGTH
+
+    _, events = game.step()
+
+    assert list(events) == [batch.EAT, batch.WIN]
+    assert game.lengths[0] == batch.Snake.DEFAULT_LENGTH + 1
+    assert game.lengths[1] == batch.Snake.DEFAULT_LENGTH
+    assert not game.occupied[0, game.apples[0]]
+
+
+def test_batch_invariants_hold():
+    game = batch.BatchGame(64, seed=1)
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        game.step(rng.integers(batch.NO_ACTION, len(batch.DIRECTIONS), 64))
+        assert (game.occupied.sum(axis=1) == game.counts).all(), (
+            'Сетка `occupied` должна совпадать с телом змейки.'
+        )
+        assert not game.occupied[np.arange(64), game.apples].any()
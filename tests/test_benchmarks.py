@@ -0,0 +1,256 @@
+"""
+Бенчмарки горячих путей змейки.
+
+Запуск: pytest --benchmark [--benchmark-update]. Время одной операции
+делится на время калибровочной работы того же рода, замеренной рядом
+с ней (`calibrate` для Python, `blit_calibration` для отрисовки,
+`calibrate_process` для запуска процесса). Доли калибровки пишутся
+в JSON и сравниваются с эталоном tests/benchmark_baseline.json;
+тест падает, если операция стала медленнее эталона больше, чем
+на --benchmark-tolerance. Доли не зависят от скорости машины
+и частоты процессора в момент замера, поэтому эталон годится
+не только для машины, на которой он записан.
+"""
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import snake_engine
+from snake_autopilot import build_cycle
+from snake_engine import DIRECTION_CODES
+
+pytestmark = pytest.mark.benchmark
+
+SNAKE_LENGTHS = (4, 64, 256)
+GRID_SIZES = (20, 10)
+FILL_LEVELS = (0.1, 0.5, 0.9, 0.99)
+NUMBER = 2000
+REPEAT = 7
+# Итераций калибровочного цикла: около 100 мкс.
+CALIBRATION_SIZE = 2000
+
+
+def calibrate():
+    """
+    Возвращает время в наносекундах калибровочного цикла на чистом
+    Python: вызовы, арифметика и индексация, как в горячих путях игры.
+    """
+    cells = list(range(64))
+    total = 0
+    started = time.perf_counter_ns()
+    for i in range(CALIBRATION_SIZE):
+        total += cells[i % 64] * 3 % 7
+        len(cells)
+    return time.perf_counter_ns() - started
+
+
+def calibrate_process():
+    """Возвращает время в наносекундах запуска пустого интерпретатора."""
+    started = time.perf_counter_ns()
+    subprocess.run([sys.executable, '-c', 'pass'], check=True)
+    return time.perf_counter_ns() - started
+
+
+@pytest.fixture(scope='session')
+def benchmark_results(request):
+    config = request.config
+    baseline_path = Path(config.getoption('--benchmark-baseline'))
+    baseline = {}
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+    results = {}
+    yield baseline, results
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    Path(config.getoption('--benchmark-json')).write_text(output)
+    if config.getoption('--benchmark-update'):
+        baseline.update(results)
+        baseline_path.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + '\n'
+        )
+
+
+@pytest.fixture
+def check(request, benchmark_results):
+    baseline, results = benchmark_results
+    tolerance = request.config.getoption('--benchmark-tolerance')
+    update = request.config.getoption('--benchmark-update')
+
+    def check_result(name, func, number=NUMBER, setup=None,
+                     calibration=calibrate):
+        # С 'setup' каждый вызов получает своё состояние, которое
+        # готовится вне замера: func(setup()).
+        # Калибровка идёт до и после каждого повтора, и время повтора
+        # делится на лучшую из соседних калибровок. Помехи только
+        # добавляют время, поэтому итог - лучшая доля сессии.
+        ratios = []
+        for _ in range(REPEAT):
+            calibrated = min(calibration() for _ in range(3))
+            if setup is None:
+                started = time.perf_counter_ns()
+                for _ in range(number):
+                    func()
+            else:
+                states = [setup() for _ in range(number)]
+                started = time.perf_counter_ns()
+                for state in states:
+                    func(state)
+            timing = (time.perf_counter_ns() - started) / number
+            calibrated = min(calibrated, calibration())
+            ratios.append(timing / calibrated)
+        results[name] = round(min(ratios), 5)
+        if update or name not in baseline:
+            return
+        limit = baseline[name] * (1 + tolerance)
+        assert results[name] <= limit, (
+            f'Бенчмарк `{name}` замедлился: {results[name]} калибровки '
+            f'на операцию при эталоне {baseline[name]}.'
+        )
+    return check_result
+
+
+@pytest.fixture(params=GRID_SIZES, ids=lambda size: f'grid{size}')
+def grid_size(request, monkeypatch, _the_snake):
+    size = request.param
+    for module in (snake_engine, _the_snake):
+        monkeypatch.setattr(module, 'GRID_SIZE', size)
+        monkeypatch.setattr(module, 'GRID_WIDTH',
+                            snake_engine.SCREEN_WIDTH // size)
+        monkeypatch.setattr(module, 'GRID_HEIGHT',
+                            snake_engine.SCREEN_HEIGHT // size)
+    monkeypatch.setattr(snake_engine, 'DEFAULT_BOARD', snake_engine.Board())
+    return size
+
+
+@pytest.fixture
+def blit_calibration(_the_snake, grid_size):
+    """
+    Калибровка отрисовки: 200 копирований спрайта клетки текущей сетки
+    на экран, время в наносекундах. Отрисовку держит память и SDL,
+    а не интерпретатор, поэтому `calibrate` для неё не годится.
+    """
+    screen = _the_snake.get_screen()
+    sprite = _the_snake.get_cell_sprite(grid_size, grid_size, (0, 255, 0),
+                                        None)
+
+    def calibrate_blit():
+        started = time.perf_counter_ns()
+        for i in range(200):
+            screen.blit(sprite, (i % 32 * grid_size, 0))
+        return time.perf_counter_ns() - started
+    return calibrate_blit
+
+
+def make_moving_snake(snake, length):
+    # Змейка идёт по гамильтонову циклу автопилота и не кусает себя.
+    cycle = build_cycle(snake.board.width, snake.board.height)
+    snake.length = length
+
+    def move():
+        snake.direction = cycle[snake.body[0]]
+        snake.move()
+
+    for _ in range(length):
+        move()
+    return move
+
+
+@pytest.mark.parametrize('length', SNAKE_LENGTHS)
+def test_snake_move(check, grid_size, length):
+    move = make_moving_snake(snake_engine.Snake(), length)
+    check(f'move[grid{grid_size}-len{length}]', move)
+
+
+@pytest.mark.parametrize('length', SNAKE_LENGTHS)
+def test_self_collision(check, grid_size, length):
+    snake = snake_engine.Snake()
+    make_moving_snake(snake, length)
+    # Ход в занятую клетку тела, но не в хвост, который уйдёт на ходу.
+    head, tail = snake.body[0], snake.body[-1]
+    snake.direction = next(
+        direction for direction in DIRECTION_CODES
+        if snake.occupied[snake.board.next_cells[direction][head]]
+        and snake.board.next_cells[direction][head] != tail
+    )
+    bitten = snake.clone()
+    bitten.move()
+    assert bitten.is_bitten()
+    check(f'collision[grid{grid_size}-len{length}]',
+          snake_engine.Snake.move, setup=snake.clone)
+
+
+@pytest.mark.parametrize('fill', FILL_LEVELS)
+def test_apple_randomize_position(check, grid_size, fill):
+    free_cells = snake_engine.FreeCells.from_board()
+    for cell in list(free_cells.cells[:int(len(free_cells) * fill)]):
+        free_cells.take(cell)
+    apple = snake_engine.Apple(exclude_positions=free_cells)
+    check(f'apple[grid{grid_size}-fill{fill}]',
+          lambda: apple.randomize_position(free_cells))
+
+
+@pytest.mark.parametrize('length', SNAKE_LENGTHS)
+def test_game_step(check, grid_size, length):
+    game = snake_engine.Game(seed=0)
+    snake = game.snake
+    make_moving_snake(snake, length)
+    cycle = build_cycle(snake.board.width, snake.board.height)
+    game.apple.position = (-1, -1)
+
+    def step():
+        game.step(cycle[snake.body[0]])
+    check(f'step[grid{grid_size}-len{length}]', step)
+
+
+@pytest.mark.parametrize('length', SNAKE_LENGTHS)
+def test_snake_draw(check, grid_size, length, _the_snake,
+                    blit_calibration):
+    snake = _the_snake.Snake()
+    move = make_moving_snake(snake, length)
+    move()
+
+    def draw():
+        snake.draw()
+        _the_snake.dirty_rects.clear()
+    check(f'draw[grid{grid_size}-len{length}]', draw,
+          calibration=blit_calibration)
+
+    def draw_body():
+        snake.draw_body()
+        _the_snake.dirty_rects.clear()
+    check(f'draw_body[grid{grid_size}-len{length}]', draw_body, NUMBER // 10,
+          calibration=blit_calibration)
+
+
+@pytest.mark.parametrize('length', SNAKE_LENGTHS)
+def test_full_frame(check, grid_size, length, _the_snake,
+                    blit_calibration):
+    snake = _the_snake.Snake()
+    apple = _the_snake.Apple(exclude_positions=snake.free_cells)
+    move = make_moving_snake(snake, length)
+
+    def frame():
+        move()
+        _the_snake.draw_frame(snake, apple, False)
+    check(f'frame[grid{grid_size}-len{length}]', frame, NUMBER // 4,
+          calibration=blit_calibration)
+
+    def full_frame():
+        move()
+        _the_snake.draw_frame(snake, apple, True)
+    check(f'full_frame[grid{grid_size}-len{length}]', full_frame,
+          NUMBER // 20, calibration=blit_calibration)
+
+
+def test_import_time(check):
+    from conftest import BASE_DIR
+
+    def import_the_snake():
+        subprocess.run([sys.executable, '-c', 'import the_snake'],
+                       cwd=BASE_DIR, check=True, capture_output=True)
+    check('import[subprocess]', import_the_snake, 3,
+          calibration=calibrate_process)
@@ -0,0 +1,208 @@
+import subprocess
+import sys
+
+from conftest import BASE_DIR
+import snake_engine as engine
+
+
+def test_engine_does_not_import_pygame():
+    result = subprocess.run(
+        [sys.executable, '-c',
+         'import sys, snake_engine; '
+         'sys.exit("pygame" in sys.modules)'],
+        cwd=BASE_DIR,
+    )
+    assert result.returncode == 0, (
+        'Модуль `snake_engine` не должен импортировать `pygame`.'
+    )
+
+
+def test_step_moves_snake():
+    game = engine.Game()
+    head_x, head_y = game.snake.get_head_position()
+    game.apple.position = (0, 0)
+
+    state, event = game.step(engine.UP)
+
+    assert state is game
+    assert event == engine.EVENT_MOVE
+    assert game.snake.get_head_position() == (
+        head_x, head_y - engine.GRID_SIZE
+    ), 'Метод `step` должен сдвигать змейку в направлении `action`.'
+
+
+def test_step_eats_apple():
+    game = engine.Game()
+    head_x, head_y = game.snake.get_head_position()
+    game.apple.position = (head_x + engine.GRID_SIZE, head_y)
+
+    _, event = game.step(engine.RIGHT)
+
+    assert event == engine.EVENT_EAT
+    assert game.snake.length == engine.Snake.DEFAULT_LENGTH + 1
+    assert game.apple.position not in game.snake.positions
+
+
+def test_step_resets_on_win():
+    game = engine.Game()
+    game.snake.length = engine.Snake.MAX_LENGTH
+
+    _, event = game.step()
+
+    assert event == engine.EVENT_WIN
+    assert game.snake.length == engine.Snake.DEFAULT_LENGTH
+
+
+def test_step_resets_on_bite():
+    game = engine.Game()
+    snake = game.snake
+    game.apple.position = (0, 0)
+    snake.length = 5
+    for direction in (engine.RIGHT, engine.RIGHT, engine.DOWN, engine.LEFT):
+        game.step(direction)
+
+    _, event = game.step(engine.UP)
+
+    assert event == engine.EVENT_BITE, (
+        'Змейка должна сбрасываться при столкновении с собой.'
+    )
+    assert snake.length == engine.Snake.DEFAULT_LENGTH
+
+
+def test_occupied_follows_positions():
+    game = engine.Game()
+    snake = game.snake
+    game.apple.position = (0, 0)
+    snake.length = 4
+    for direction in (engine.RIGHT, engine.DOWN, engine.DOWN, engine.LEFT,
+                      engine.LEFT, engine.UP):
+        game.step(direction)
+        occupied = {cell for cell, flag in enumerate(snake.occupied) if flag}
+        assert occupied == set(snake.body), (
+            'Флаги `occupied` должны совпадать с клетками тела `body`.'
+        )
+        assert snake.last is None or not snake.is_occupied(snake.last)
+        assert len(snake.free_cells) + len(occupied) == (
+            engine.GRID_WIDTH * engine.GRID_HEIGHT
+        ), 'Индекс `free_cells` должен содержать все незанятые клетки.'
+        assert not any(cell in snake.free_cells for cell in occupied)
+
+
+def test_apple_on_almost_full_board():
+    snake = engine.Snake()
+    free_cell = snake.free_cells.cells[0]
+    for cell in list(snake.free_cells.cells[1:]):
+        snake.free_cells.take(cell)
+
+    apple = engine.Apple(exclude_positions=snake.free_cells)
+
+    assert apple.position == engine.DEFAULT_BOARD.positions[free_cell], (
+        'Яблоко должно занимать единственную свободную клетку.'
+    )
+
+
+def test_turn_queue_keeps_fast_presses():
+    snake = engine.Snake()
+    snake.direction = engine.RIGHT
+    for direction in (engine.UP, engine.DOWN, engine.LEFT, engine.DOWN,
+                      engine.RIGHT):
+        snake.queue_turn(direction)
+
+    assert list(snake.turns) == [engine.UP, engine.LEFT, engine.DOWN], (
+        'Очередь должна отбрасывать развороты и повороты сверх '
+        '`TURN_QUEUE_SIZE`.'
+    )
+    for expected in (engine.UP, engine.LEFT, engine.DOWN, engine.DOWN):
+        snake.apply_turn()
+        snake.move()
+        assert snake.direction == expected, (
+            'Повороты из очереди должны применяться по одному за ход.'
+        )
+
+
+def rollout(game, ticks=300):
+    directions = (engine.UP, engine.LEFT, engine.DOWN, engine.RIGHT)
+    events = []
+    for tick in range(ticks):
+        game.snake.queue_turn(directions[tick // 7 % 4])
+        game.snake.apply_turn()
+        _, event = game.step()
+        events.append(event)
+    return events, game.snapshot()
+
+
+def test_clone_is_independent():
+    game = engine.Game(seed=7)
+    rollout(game, 50)
+    before = game.snapshot()
+
+    clone = game.clone()
+    clone_events, clone_state = rollout(clone)
+
+    assert game.snapshot() == before, (
+        'Ходы копии `Game.clone` не должны менять оригинал.'
+    )
+    assert rollout(game) == (clone_events, clone_state), (
+        'Копия должна повторять оригинал при тех же ходах.'
+    )
+
+
+def test_snapshot_restores_into_other_game():
+    game = engine.Game(seed=11)
+    rollout(game, 120)
+    game.snake.queue_turn(engine.UP)
+    state = game.snapshot()
+
+    other = engine.Game(seed=99)
+    other.restore(memoryview(state))
+
+    assert other.snapshot() == state, (
+        '`restore` должен восстанавливать снимок `snapshot` полностью.'
+    )
+    assert rollout(other) == rollout(game), (
+        'Восстановленная партия должна продолжаться как исходная.'
+    )
+
+
+def test_board_tables():
+    wrapped = engine.Board(5, 4, 10)
+    walled = engine.Board(5, 4, 10, wrap=False)
+    corner = 4 * 5 - 1
+
+    assert wrapped.next_cells[engine.RIGHT][corner] == 3 * 5
+    assert wrapped.next_cells[engine.DOWN][corner] == 4
+    assert walled.next_cells[engine.RIGHT][corner] == -1, (
+        'На поле со стенами за краем поля соседа нет.'
+    )
+    assert walled.positions[corner] == (40, 30)
+    assert walled.to_cell((40, 30)) == corner
+
+
+def test_boards_of_different_sizes_side_by_side():
+    small = engine.Game(seed=1, board=engine.Board(6, 4, 10))
+    default = engine.Game(seed=1)
+    for _ in range(200):
+        small.step()
+        default.step()
+
+    assert len(small.snake.occupied) == 24
+    assert len(default.snake.occupied) == (
+        engine.GRID_WIDTH * engine.GRID_HEIGHT
+    )
+    assert all(x < 60 and y < 40 for x, y in small.snake.positions), (
+        'Змейка должна ходить по своему полю, а не по полю окна.'
+    )
+    assert small.apple.position in small.snake.board.positions
+    assert small.clone().snapshot() == small.snapshot()
+
+
+def test_walled_board_resets_on_wall():
+    game = engine.Game(seed=2, board=engine.Board(6, 4, 10, wrap=False))
+    game.snake.direction = engine.RIGHT
+    game.apple.position = (0, 0)
+    events = [game.step()[1] for _ in range(3)]
+
+    assert events == [engine.EVENT_MOVE, engine.EVENT_MOVE,
+                      engine.EVENT_BITE], (
+        'Удар о стену должен сбрасывать игру, как укус.'
+    )
@@ -0,0 +1,76 @@
+import pytest
+
+import snake_export as export
+from snake_engine import SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+def test_png_frames_keep_order_and_pixels(tmp_path):
+    surface = export.create_surface((8, 4))
+    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+    with export.FrameExporter(str(tmp_path), 'png', workers=2,
+                              queue_size=1) as exporter:
+        for color in colors:
+            surface.fill(color)
+            exporter.capture(surface)
+
+    for index, color in enumerate(colors):
+        frame = export.pg.image.load(
+            str(tmp_path / export.PNG_NAME.format(index))
+        )
+        assert tuple(frame.get_at((3, 2)))[:3] == color, (
+            'Кадр PNG должен совпадать с поверхностью в момент захвата.'
+        )
+
+
+def test_raw_stream_is_sequential(tmp_path):
+    path = tmp_path / 'frames.rgbx'
+    surface = export.create_surface((8, 4))
+    with export.FrameExporter(str(path), 'raw') as exporter:
+        for value in range(5):
+            surface.fill((value, 0, 0))
+            exporter.capture(surface)
+
+    data = path.read_bytes()
+    frame_size = 8 * 4 * 4
+    assert len(data) == 5 * frame_size
+    assert [data[i * frame_size] for i in range(5)] == list(range(5)), (
+        'Сырой поток должен содержать кадры RGBX по порядку.'
+    )
+
+
+def test_export_replay_writes_frame_per_tick(_the_snake, tmp_path):
+    from test_replay import record_game
+
+    replay_path = str(tmp_path / 'game.snkr')
+    game = record_game(replay_path, seed=5, ticks=40)
+    output = tmp_path / 'frames.rgbx'
+
+    exporter = _the_snake.export_replay(replay_path, str(output), 'raw')
+
+    frame_size = SCREEN_WIDTH * SCREEN_HEIGHT * 4
+    assert exporter.frames == game.ticks + 1, (
+        'Экспорт должен записать первый кадр и по кадру на тик реплея.'
+    )
+    assert output.stat().st_size == exporter.frames * frame_size
+    assert _the_snake.exporter is None
+    assert _the_snake.get_cell_sprite.cache_info().currsize == 0, (
+        'Спрайты для поверхности без окна не должны оставаться в кэше.'
+    )
+
+
+def test_worker_error_reaches_capture(tmp_path, monkeypatch):
+    def broken_write(self, index, size, pixels):
+        raise ValueError('сломанный кодировщик')
+
+    monkeypatch.setattr(export.FrameExporter, 'write_raw', broken_write)
+    surface = export.create_surface((8, 4))
+    exporter = export.FrameExporter(str(tmp_path / 'frames.rgbx'), 'raw',
+                                    queue_size=1)
+    with pytest.raises(ValueError, match='сломанный'):
+        for _ in range(100):
+            exporter.capture(surface)
+    with pytest.raises(ValueError, match='сломанный'):
+        exporter.close()
+    assert not any(worker.is_alive() for worker in exporter.workers), (
+        'Ошибка записи не должна оставлять игру ждать очередь.'
+    )
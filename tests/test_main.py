@@ -16,3 +16,64 @@ def test_main_run_without_exceptions(_the_snake):
             f'`{type(error).__name__}: {error}`\n\n'
             'Убедитесь, что функция работает корректно.'
         )
+
+
+@pytest.mark.timeout(2, method='thread')
+def test_idle_waits_for_events(_the_snake):
+    pg = _the_snake.pg
+    pg.init()
+    snake = _the_snake.Snake()
+    focus_lost = pg.event.Event(pg.WINDOWFOCUSLOST)
+    assert _the_snake.handle_keys(snake, [focus_lost])
+    assert _the_snake.is_idle(), 'Без фокуса окна игра должна стоять.'
+
+    pg.event.post(pg.event.Event(pg.WINDOWFOCUSGAINED))
+    assert _the_snake.wait_while_idle(snake)
+    assert not _the_snake.is_idle()
+
+    pause = pg.event.Event(pg.KEYDOWN, key=_the_snake.PAUSE_KEY)
+    assert _the_snake.handle_keys(snake, [pause])
+    assert _the_snake.is_idle(), 'Клавиша паузы должна ставить игру.'
+    pg.event.post(pause)
+    assert _the_snake.wait_while_idle(snake), (
+        'Повторное нажатие паузы должно продолжать игру.'
+    )
+    assert not _the_snake.paused
+    assert _the_snake.wait_events(timeout=1) == []
+
+
+@pytest.mark.timeout(2, method='thread')
+def test_idle_wakes_up_by_timeout(_the_snake, monkeypatch):
+    pg = _the_snake.pg
+    pg.init()
+    snake = _the_snake.Snake()
+    monkeypatch.setattr(_the_snake, 'IDLE_TIMEOUT', 1)
+    assert _the_snake.wait_events() == [], (
+        '`wait_events` должна брать `IDLE_TIMEOUT` в момент вызова.'
+    )
+
+    monkeypatch.setattr(_the_snake, 'paused', True)
+    wakeups = []
+
+    def on_wakeup():
+        wakeups.append(True)
+        if len(wakeups) == 3:
+            pg.event.post(pg.event.Event(pg.KEYDOWN,
+                                         key=_the_snake.PAUSE_KEY))
+    assert _the_snake.wait_while_idle(snake, on_wakeup)
+    assert len(wakeups) == 4, (
+        '`on_wakeup` должна вызываться после каждого пробуждения.'
+    )
+
+
+def test_pause_is_ignored_on_win_screen(_the_snake, monkeypatch):
+    pg = _the_snake.pg
+    pg.init()
+    snake = _the_snake.Snake()
+    monkeypatch.setattr(_the_snake, 'game_over', True)
+    monkeypatch.setattr(_the_snake, 'paused', False)
+    pause = pg.event.Event(pg.KEYDOWN, key=_the_snake.PAUSE_KEY)
+    assert _the_snake.handle_keys(snake, [pause])
+    assert not _the_snake.paused, (
+        'На экране победы клавиша паузы не должна ставить паузу.'
+    )
@@ -0,0 +1,68 @@
+import asyncio
+
+import snake_net as net
+
+
+def run_with_server(server, scenario):
+    async def run():
+        started = asyncio.get_running_loop().create_future()
+        serving = asyncio.ensure_future(server.run(started=started))
+        host, port = await started
+        try:
+            await asyncio.wait_for(scenario(host, port), timeout=5)
+        finally:
+            serving.cancel()
+
+    asyncio.run(run())
+
+
+def assert_in_sync(server, client):
+    state = client.state
+    assert state.tick == server.arena.ticks
+    assert state.snakes == {
+        snake_id: snake.positions
+        for snake_id, snake in server.snakes.items()
+    }, 'Поле клиента должно совпадать с полем сервера после дельт.'
+    assert state.apples == server.arena.apples
+
+
+def test_clients_follow_server_by_deltas():
+    server = net.GameServer(20, 20, apples=5, tick_rate=200, seed=0)
+
+    async def scenario(host, port):
+        clients = [await net.NetClient.connect(host, port) for _ in range(3)]
+        for client in clients:
+            assert await client.receive() is None
+        clients[0].send_turn(net.DIRECTION_CODES[0])
+        for _ in range(30):
+            for client in clients:
+                assert await client.receive() is not None
+        clients[2].close()
+        while len(server.snakes) > 2:
+            await asyncio.sleep(0.01)
+        # Между проверкой и сравнением нет ожиданий, поэтому сервер
+        # не успевает сделать следующий тик.
+        for client in clients[:2]:
+            while client.state.tick < server.arena.ticks:
+                await client.receive()
+            assert_in_sync(server, client)
+
+    run_with_server(server, scenario)
+
+
+def test_client_resyncs_after_desync():
+    server = net.GameServer(20, 20, tick_rate=200, seed=1)
+
+    async def scenario(host, port):
+        client = await net.NetClient.connect(host, port)
+        await client.receive()
+        await client.receive()
+        client.state.snakes[client.state.snake_id].append((0, 0))
+
+        while await client.receive() is not None:
+            pass
+        assert not client.resyncing, (
+            'При расхождении клиент должен запросить и получить снимок.'
+        )
+
+    run_with_server(server, scenario)
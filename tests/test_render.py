@@ -0,0 +1,130 @@
+def test_draw_records_dirty_rects(_the_snake):
+    _the_snake.dirty_rects.clear()
+    snake = _the_snake.Snake()
+    snake.length = 1
+    snake.move()
+
+    snake.draw()
+
+    rects = [tuple(rect.topleft) for rect in _the_snake.dirty_rects]
+    assert rects == [snake.get_head_position(), snake.last], (
+        'Метод `draw` змейки должен записывать в `dirty_rects` только '
+        'клетки новой головы и затёртого хвоста.'
+    )
+    _the_snake.update_display()
+    assert not _the_snake.dirty_rects
+
+
+def test_render_text_is_cached(_the_snake):
+    _the_snake.pg.font.init()
+    first = _the_snake.render_text('Победа!', 72, (255, 0, 0))
+    second = _the_snake.render_text('Победа!', 72, (255, 0, 0))
+    assert first is second, (
+        'Повторный вывод той же надписи должен брать её из кэша.'
+    )
+    assert _the_snake.get_font.cache_info().currsize >= 1
+
+
+def test_cell_sprite_is_reused(_the_snake):
+    color, border = (0, 255, 0), (93, 216, 228)
+    sprite = _the_snake.get_cell_sprite(20, 20, color, border)
+
+    assert sprite is _the_snake.get_cell_sprite(20, 20, color, border)
+    assert tuple(sprite.get_at((0, 0)))[:3] == border
+    assert tuple(sprite.get_at((10, 10)))[:3] == color, (
+        'Спрайт клетки должен быть залит цветом тела с рамкой.'
+    )
+
+
+def test_import_does_not_open_window():
+    import subprocess
+    import sys
+
+    from conftest import BASE_DIR
+
+    result = subprocess.run(
+        [sys.executable, '-c',
+         'import sys, pygame, the_snake; '
+         'sys.exit(pygame.display.get_init() or pygame.font.get_init())'],
+        cwd=BASE_DIR,
+        capture_output=True,
+    )
+    assert result.returncode == 0, (
+        'Импорт `the_snake` не должен создавать окно и шрифты: они '
+        'создаются при первой отрисовке.'
+    )
+
+
+def test_import_skips_optional_modules():
+    import subprocess
+    import sys
+
+    from conftest import BASE_DIR
+
+    modules = ('asyncio', 'sqlite3', 'snake_net',
+               'snake_export', 'snake_replay', 'snake_results')
+    result = subprocess.run(
+        [sys.executable, '-c',
+         'import sys, the_snake; '
+         f'sys.exit(any(name in sys.modules for name in {modules!r}))'],
+        cwd=BASE_DIR,
+        capture_output=True,
+    )
+    assert result.returncode == 0, (
+        'Сеть, запись кадров, реплеи и итоги должны импортироваться '
+        'только при использовании.'
+    )
+
+
+class FixedPacer:
+    def next_ticks(self, elapsed):
+        return 7
+
+    def record(self, ticks, seconds):
+        pass
+
+
+def test_turbo_frames_erase_every_tail(_the_snake):
+    from snake_autopilot import Autopilot
+
+    pg = _the_snake.pg
+    screen = _the_snake.get_screen()
+    screen.fill(_the_snake.BOARD_BACKGROUND_COLOR)
+    snake = _the_snake.Snake()
+    apple = _the_snake.Apple(exclude_positions=snake.free_cells)
+    game = _the_snake.engine.Game(snake, apple, seed=3)
+    pilot = Autopilot()
+    profiler = _the_snake.NullProfiler()
+    _the_snake.draw_frame(snake, apple, True)
+
+    for _ in range(30):
+        event, changed = _the_snake.run_ticks(game, FixedPacer(), profiler,
+                                              autopilot=pilot)
+        full_redraw = event != _the_snake.EVENT_MOVE
+        if full_redraw:
+            screen.fill(_the_snake.BOARD_BACKGROUND_COLOR)
+        _the_snake.draw_frame(snake, apple, full_redraw, profiler, changed)
+        frame = pg.image.tobytes(screen, 'RGB')
+
+        screen.fill(_the_snake.BOARD_BACKGROUND_COLOR)
+        _the_snake.draw_frame(snake, apple, True)
+        assert frame == pg.image.tobytes(screen, 'RGB'), (
+            'Кадр после нескольких тиков должен совпадать с полной '
+            'перерисовкой: все снятые хвосты должны быть стёрты.'
+        )
+
+
+def test_turbo_pacer_keeps_rate_and_frame_budget(_the_snake):
+    pacer = _the_snake.TurboPacer(3000, fps=30)
+    assert pacer.next_ticks(1 / 30) == 100
+
+    pacer.record(100, 1 / 30)
+    assert pacer.next_ticks(1 / 30) == int(_the_snake.TURBO_FRAME_SHARE
+                                           * 100), (
+        'Тиков на кадр должно быть не больше, чем помещается в кадр.'
+    )
+    slow = pacer.max_ticks()
+    pacer.record(10, 0.001)
+    assert pacer.max_ticks() > slow, (
+        'Быстрые тики должны увеличивать число тиков на кадр.'
+    )
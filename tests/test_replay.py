@@ -0,0 +1,100 @@
+import pytest
+
+import snake_replay as replay
+from snake_engine import RIGHT, Board, Game
+
+
+def record_game(path, seed, ticks, keyframe_interval=None):
+    from snake_tournament import greedy_policy
+
+    game = Game(seed=seed)
+    with replay.ReplayWriter(path, game.seed, 15,
+                             keyframe_interval) as writer:
+        for _ in range(ticks):
+            direction = game.snake.direction
+            game.snake.turn(greedy_policy(game) or direction)
+            if game.snake.direction != direction:
+                writer.record_direction(game.ticks, game.snake.direction)
+            if game.ticks == ticks // 2:
+                writer.record_speed(game.ticks, 19)
+            writer.record_step(game)
+            game.step()
+        writer.close(game.ticks)
+    return game
+
+
+@pytest.mark.parametrize('value', (0, 1, 127, 128, 300, 2 ** 32 - 1))
+def test_varint_roundtrip(value):
+    encoded = replay.encode_varint(value)
+    assert replay.decode_varint(encoded, 0) == (value, len(encoded))
+
+
+def test_replay_reproduces_game(tmp_path):
+    path = tmp_path / 'game.snkr'
+    game = record_game(str(path), seed=42, ticks=600)
+
+    with replay.Replay(str(path)) as saved:
+        played = saved.play()
+        speeds = [value for _, code, value in saved.records()
+                  if code == replay.CODE_SPEED]
+
+    assert played.ticks == game.ticks
+    assert list(played.snake.positions) == list(game.snake.positions), (
+        'Воспроизведение реплея должно повторять партию.'
+    )
+    assert played.apple.position == game.apple.position
+    assert speeds == [19]
+    assert path.stat().st_size < 600, 'Реплей должен быть компактным.'
+
+
+def snake_state(game):
+    return (game.ticks, list(game.snake.positions), game.snake.direction,
+            game.apple.position, game.rng.getstate())
+
+
+def test_seek_matches_full_simulation(tmp_path):
+    path = tmp_path / 'game.snkr'
+    record_game(str(path), seed=3, ticks=2000, keyframe_interval=100)
+
+    with replay.Replay(str(path)) as saved:
+        assert len(saved.keyframe_ticks) == 19
+        for tick in (0, 99, 100, 777, 1999, 2000):
+            full = saved.simulate(Game(seed=saved.seed), saved.records(),
+                                  tick)
+            assert snake_state(saved.seek(tick)) == snake_state(full), (
+                'Перемотка по ключевым кадрам должна давать то же '
+                'состояние, что и расчёт с начала партии.'
+            )
+
+
+def test_seek_without_footer(tmp_path):
+    path = tmp_path / 'game.snkr'
+    record_game(str(path), seed=5, ticks=500, keyframe_interval=100)
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) - replay.FOOTER.size - 1])
+
+    with replay.Replay(str(path)) as saved:
+        assert saved.keyframe_ticks == [100, 200, 300, 400]
+        full = saved.simulate(Game(seed=saved.seed), saved.records(), 450)
+        assert snake_state(saved.seek(450)) == snake_state(full)
+
+
+def test_walled_replay_roundtrip(tmp_path):
+    path = tmp_path / 'walls.snkr'
+    board = Board(wrap=False)
+    game = Game(seed=8, board=board)
+    game.snake.direction = RIGHT
+    with replay.ReplayWriter(str(path), game.seed, 15, 50, board) as writer:
+        events = [game.step()[1] for _ in range(120)]
+        writer.record_keyframe(game)
+        events += [game.step()[1] for _ in range(80)]
+        writer.close(game.ticks)
+    assert 'bite' in events, 'Змейка должна удариться о стену.'
+
+    with replay.Replay(str(path)) as saved:
+        assert (saved.board.width, saved.board.height,
+                saved.board.wrap) == (board.width, board.height, False)
+        assert snake_state(saved.play()) == snake_state(game), (
+            'Реплей партии со стенами должен играться на поле со стенами.'
+        )
+        assert snake_state(saved.seek(game.ticks)) == snake_state(game)
@@ -0,0 +1,130 @@
+import sqlite3
+
+import pytest
+
+import snake_results as results
+from snake_engine import EVENT_BITE, EVENT_WIN, Game
+
+
+def make_rows(count):
+    return [results.ResultRow('greedy', seed % 10, seed % 17, 100 - seed,
+                              EVENT_BITE)
+            for seed in range(count)]
+
+
+def test_rows_are_written_in_batches(tmp_path):
+    path = str(tmp_path / 'results.db')
+    with results.ResultStore(path, batch_size=50) as store:
+        store.extend(make_rows(120))
+        assert len(store.pending) == 0, (
+            'Полные пачки итогов должны уходить потоку записи.'
+        )
+        store.add(make_rows(1)[0])
+        assert len(store.pending) == 1, (
+            'Итог должен ждать в памяти, пока не наберётся пачка.'
+        )
+
+    with sqlite3.connect(path) as connection:
+        count, = connection.execute('SELECT COUNT(*) FROM results').fetchone()
+    assert count == 121, 'При закрытии должны записываться все итоги.'
+
+
+def test_top_and_seed_queries(tmp_path):
+    rows = make_rows(200)
+    with results.ResultStore(str(tmp_path / 'results.db')) as store:
+        store.extend(rows)
+        store.add(results.ResultRow('human', 3, 16, 5, EVENT_WIN, 15))
+
+        expected = sorted(rows + [store.pending[-1]],
+                          key=lambda row: (-row.length, row.ticks))
+        assert store.top(5) == expected[:5], (
+            'Таблица рекордов: длиннее, а при равной длине - быстрее.'
+        )
+        assert store.top(3, player='human') == [
+            results.ResultRow('human', 3, 16, 5, EVENT_WIN, 15)
+        ]
+        assert [row.seed for row in store.by_seed(3)] == [3] * 21
+        plan = store.connection.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM results WHERE seed = 3 '
+            'ORDER BY length DESC, ticks'
+        ).fetchall()
+        assert 'results_seed' in str(plan), (
+            'Запрос по зерну должен использовать индекс.'
+        )
+
+
+@pytest.mark.timeout(30)
+def test_tournament_stores_results(tmp_path):
+    import snake_tournament
+
+    path = str(tmp_path / 'results.db')
+    with results.ResultStore(path, batch_size=4) as store:
+        for _ in snake_tournament.run_tournament(
+                ['snake_tournament:greedy_policy'], games=6, max_ticks=200,
+                workers=1, chunk_size=3, store=store):
+            pass
+        stored = store.top(10)
+
+    assert sorted(row.seed for row in stored) == list(range(6))
+    assert {row.cause for row in stored} <= {
+        EVENT_BITE, EVENT_WIN, results.CAUSE_TIMEOUT
+    }
+
+
+def test_step_game_records_finished_game(_the_snake, tmp_path):
+    game = Game(seed=1)
+    game.snake.length = game.snake.MAX_LENGTH
+    profiler = _the_snake.NullProfiler()
+    path = str(tmp_path / 'results.db')
+    store = results.ResultStore(path)
+    for _ in range(3):
+        _the_snake.step_game(game, profiler, results=store)
+    _the_snake.finish_game(game, None, profiler, None, store)
+    with results.ResultStore(path) as reopened:
+        stored = reopened.by_seed(1)
+        last = reopened.top(player=_the_snake.HUMAN_PLAYER)[-1]
+
+    assert stored == [results.ResultRow(
+        _the_snake.HUMAN_PLAYER, 1, game.snake.MAX_LENGTH, 1, EVENT_WIN,
+        _the_snake.speed,
+    )], 'Итог партии должен сохраняться до сброса змейки.'
+    assert last.cause == results.CAUSE_QUIT
+    assert last.ticks == 2
+    assert last.seed is None, (
+        'Партию после сброса нельзя повторить по зерну сессии, '
+        'поэтому её итог записывается без зерна.'
+    )
+
+
+def test_writer_survives_unexpected_error(tmp_path):
+    class BrokenBatch(list):
+        def __iter__(self):
+            raise RuntimeError('битая пачка')
+
+    store = results.ResultStore(str(tmp_path / 'results.db'))
+    store.pending = BrokenBatch(make_rows(1))
+    with pytest.raises(RuntimeError, match='битая пачка'):
+        store.flush()
+    store.add(make_rows(1)[0])
+    assert len(store.top()) == 1, (
+        'После ошибки пачки поток записи должен писать следующие итоги.'
+    )
+    store.close()
+    store.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        store.connection.execute('SELECT 1')
+
+
+def test_speed_only_for_regular_games(_the_snake):
+    from snake_engine import Board
+
+    regular = _the_snake.get_result(Game(seed=1), 5, 10, EVENT_BITE, None)
+    turbo = _the_snake.get_result(Game(seed=1), 5, 10, EVENT_BITE, None,
+                                  _the_snake.TurboPacer(500))
+    walls = _the_snake.get_result(Game(seed=1, board=Board(wrap=False)),
+                                  5, 10, EVENT_BITE, None)
+    assert regular.speed == _the_snake.speed
+    assert turbo.speed is None and walls.speed is None, (
+        'Скорость окна несравнима для турбо-режима и поля со стенами.'
+    )
+
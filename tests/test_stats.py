@@ -0,0 +1,47 @@
+import csv
+import json
+
+import pytest
+
+import snake_stats as stats
+
+
+def test_profiler_ring_buffer():
+    profiler = stats.FrameProfiler(capacity=4)
+    for _ in range(10):
+        profiler.start_frame()
+        for phase in stats.PHASES:
+            profiler.mark(phase)
+    profiler.start_frame()
+
+    assert len(profiler) == 4, (
+        'Профиль должен хранить не больше `capacity` последних кадров.'
+    )
+    assert profiler.frames == 10
+    assert len(profiler.frame_times()) == 4
+
+
+def test_profiler_percentiles():
+    samples = [i / 1000 for i in range(1, 101)]
+    assert stats.FrameProfiler.percentiles(samples) == (0.051, 0.095, 0.099)
+
+
+@pytest.mark.parametrize('name', ('profile.csv', 'profile.json'))
+def test_profiler_export(tmp_path, name):
+    profiler = stats.FrameProfiler()
+    for _ in range(3):
+        profiler.start_frame()
+        profiler.mark(stats.PHASE_DRAW)
+    profiler.start_frame()
+    path = tmp_path / name
+
+    profiler.export(str(path))
+
+    if name.endswith('.csv'):
+        rows = list(csv.reader(path.open()))
+        assert rows[0] == list(stats.PHASES)
+        assert len(rows) == 4
+    else:
+        data = json.loads(path.read_text())
+        assert len(data['frames']) == 3
+        assert set(data['summary']) == {*stats.PHASES, 'frame'}
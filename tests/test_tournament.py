@@ -0,0 +1,38 @@
+import pytest
+
+import snake_tournament as tournament
+
+
+def test_play_game_is_reproducible():
+    first = tournament.play_game(tournament.greedy_policy, 7, 500)
+    second = tournament.play_game(tournament.greedy_policy, 7, 500)
+    assert first == second, (
+        'Партии с одинаковым зерном должны заканчиваться одинаково.'
+    )
+
+
+@pytest.mark.timeout(30)
+def test_run_tournament_aggregates_results():
+    names = ['snake_tournament:greedy_policy',
+             'snake_tournament:random_policy']
+    final = {}
+    for stats in tournament.run_tournament(names, games=6, max_ticks=200,
+                                           workers=2, chunk_size=4):
+        final[stats.name] = stats
+
+    assert sorted(final) == sorted(names)
+    assert all(stats.games == 6 for stats in final.values()), (
+        'Каждый агент должен сыграть все партии.'
+    )
+
+
+@pytest.mark.parametrize('games', ('0', '-3'))
+def test_main_rejects_non_positive_games(games, monkeypatch):
+    monkeypatch.setattr('sys.argv', ['snake_tournament.py', '--games', games,
+                                     'snake_tournament:greedy_policy'])
+    with pytest.raises(SystemExit) as error:
+        tournament.main()
+    assert error.value.code == 2, (
+        'Неположительное число партий должно отклоняться при разборе '
+        'аргументов, а не падать при выводе итогов.'
+    )
@@ -0,0 +1,84 @@
+import pytest
+
+import snake_world as world
+
+
+def test_chunks_follow_snake():
+    game = world.WorldGame(10_000, 10_000, seed=0)
+    snake = game.snake
+    snake.length = 5
+    game.apple.position = (0, 0)
+    for _ in range(world.CHUNK_CELLS * 3):
+        game.step(world.RIGHT)
+
+    assert len(snake.occupied) == snake.length
+    assert len(snake.occupied.chunks) <= 2, (
+        'Чанки без занятых клеток должны удаляться, чтобы память '
+        'не росла вместе с полем.'
+    )
+    assert all(cell in snake.occupied for cell in snake.positions)
+
+
+def test_world_wraps_on_logical_grid():
+    game = world.WorldGame(100, 50, seed=0)
+    snake = game.snake
+    snake.positions[0] = (99, 49)
+    snake.occupied.add((99, 49))
+
+    game.step(world.DOWN)
+
+    assert snake.get_head_position() == (99, 0), (
+        'Змейка должна переходить через край логического поля.'
+    )
+
+
+def test_camera_keeps_head_in_view():
+    camera = world.Camera(1000, 1000, view_width=32, view_height=24)
+    camera.follow((5, 990))
+
+    assert camera.to_view((5, 990)) == (16, 12)
+    assert camera.to_view((500, 500)) is None
+    cells = dict(camera.visible_cells())
+    assert len(cells) == 32 * 24
+    assert cells[(5, 990)] == (16, 12)
+
+
+def test_draw_world(_the_snake):
+    snake = _the_snake.WorldSnake(5000, 5000, _the_snake.SNAKE_COLOR)
+    apple = world.WorldApple(snake, _the_snake.APPLE_COLOR)
+    game = world.WorldGame(5000, 5000, snake, apple, seed=0)
+    camera = world.Camera(5000, 5000)
+
+    _the_snake.draw_world(game, camera)
+
+    screen = _the_snake.get_screen()
+    x, y = camera.to_view(snake.get_head_position())
+    center = (x * _the_snake.GRID_SIZE + 10, y * _the_snake.GRID_SIZE + 10)
+    assert tuple(screen.get_at(center))[:3] == _the_snake.SNAKE_COLOR, (
+        'Голова змейки должна быть видна в центре окна камеры.'
+    )
+
+
+@pytest.mark.timeout(2, method='thread')
+def test_apple_spawn_is_bounded():
+    game = world.WorldGame(1000, 1000, seed=0)
+    head_x, head_y = game.snake.get_head_position()
+    radius = world.APPLE_SPAWN_RADIUS
+    window = world.ChunkGrid(1000, 1000)
+    for dx in range(-radius, radius + 1):
+        for dy in range(-radius, radius + 1):
+            window.add(((head_x + dx) % 1000, (head_y + dy) % 1000))
+    free = ((head_x + radius) % 1000, head_y)
+    window.discard(free)
+
+    game.apple.randomize_position(window)
+    assert game.apple.position == free, (
+        'Яблоко должно найти последнюю свободную клетку окна.'
+    )
+
+    window.add(free)
+    game.apple.position = (0, 0)
+    game.apple.randomize_position(window)
+    assert game.apple.position == (0, 0), (
+        'Без свободных клеток в окне Яблоко должно остаться на месте.'
+    )
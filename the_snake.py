@@ -1,15 +1,50 @@
-from random import choice, randrange
-from typing import List, Tuple, Union
+import argparse
+import time
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING, Callable, Collection, Iterable, List, Set, Tuple, Union,
+)
 
 import pygame as pg
 
+import snake_engine as engine
+from snake_autopilot import Autopilot
+import snake_world
+from snake_stats import (
+    PHASE_COLLISION,
+    PHASE_DRAW,
+    PHASE_INPUT,
+    PHASE_MOVE,
+    PHASE_SLEEP,
+    PHASE_UPDATE,
+    PHASES,
+    FrameProfiler,
+    NullProfiler,
+)
+from snake_engine import (  # noqa: F401
+    DOWN,
+    EVENT_BITE,
+    EVENT_MOVE,
+    EVENT_WIN,
+    GRID_HEIGHT,
+    GRID_SIZE,
+    GRID_WIDTH,
+    LEFT,
+    RIGHT,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    UP,
+)
+
+# Сеть, запись кадров, реплеи и итоги импортируются в функциях,
+# которые ими пользуются: импорт игры не загружает asyncio, sqlite3
+# и потоки, пока они не нужны.
+if TYPE_CHECKING:
+    import snake_net
+    from snake_export import FrameExporter
+    from snake_replay import ReplayWriter
+    from snake_results import ResultRow, ResultStore
 
-# Константы для размеров поля и сетки:
-SCREEN_WIDTH, SCREEN_HEIGHT = 640, 480
-SCREEN_CENTER = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-GRID_SIZE = 20
-GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
-GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
 
 # Клавиши управления змейкой
 SNAKE_CONTROL = (
@@ -19,14 +54,14 @@ SNAKE_CONTROL = (
     pg.K_DOWN,
 )
 
-# Направления движения:
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+# События потери и получения фокуса окном.
+FOCUS_EVENTS = (pg.WINDOWFOCUSLOST, pg.WINDOWFOCUSGAINED)
+
+# События, которые обрабатывает игра; остальные не попадают в очередь.
+ALLOWED_EVENTS = (pg.QUIT, pg.KEYDOWN, *FOCUS_EVENTS)
 
 # Список возможных направлений движения,
-# в зависимости от текущего направления и нажатой клавиши.
+# в зависимости от запланированного направления и нажатой клавиши.
 DIRECTIONS = {
     (LEFT, pg.K_UP): UP,
     (RIGHT, pg.K_UP): UP,
@@ -53,6 +88,9 @@ APPLE_COLOR = (255, 0, 0)
 # Цвет змейки
 SNAKE_COLOR = (0, 255, 0)
 
+# Цвет чужих змеек в сетевой игре
+OTHER_SNAKE_COLOR = (0, 128, 255)
+
 # Клавиши изменнения скорости
 SPEED_CONTROL = {
     pg.K_KP_PLUS: 4,
@@ -61,31 +99,117 @@ SPEED_CONTROL = {
 SPEED_MAX = 25
 SPEED_MIN = 1
 
+# Сообщение экрана: текст, размер шрифта, цвет и отступ сверху.
+Message = Tuple[str, int, Tuple[int, int, int], int]
+
+# Клавиша паузы и сообщение паузы, как `WIN_MESSAGES`.
+PAUSE_KEY = pg.K_p
+PAUSE_MESSAGES = (
+    ('Пауза', 72, SNAKE_COLOR, 180),
+    ('Для продолжения нажмите клавишу <P>.',
+     32, BOARD_BACKGROUND_COLOR, 240),
+)
+
+# Сколько ждать события в простое, в мс, прежде чем вернуться
+# в цикл простоя (например, для анимации); 0 - ждать без ограничения.
+IDLE_TIMEOUT = 0
+
+# Сообщение о победе: текст, размер шрифта, цвет и отступ сверху.
+WIN_MESSAGES = (
+    ('Победа!', 72, APPLE_COLOR, 180),
+    ('Для перезапуска игры нажмите клавишу <R>.',
+     32, BOARD_BACKGROUND_COLOR, 240),
+)
+
+# Оверлей профиля кадров: клавиша, шрифт, цвета и частота
+# обновления надписей в кадрах.
+STATS_KEY = pg.K_F3
+STATS_FONT_SIZE = 20
+STATS_COLOR = (255, 255, 255)
+STATS_BG_COLOR = GAME_OVER_BG_COLOR
+STATS_REFRESH_FRAMES = 15
+
+# Повороты сетевой змейки по клавишам: развороты отбрасывает сервер.
+KEY_DIRECTIONS = {
+    pg.K_UP: UP,
+    pg.K_DOWN: DOWN,
+    pg.K_LEFT: LEFT,
+    pg.K_RIGHT: RIGHT,
+}
+
+# Турбо-режим: частота кадров окна, доля кадра на тики симуляции
+# и сглаживание оценки времени тика.
+TURBO_FPS = 30
+TURBO_FRAME_SHARE = 0.8
+TURBO_SMOOTHING = 0.1
+
+# Игрок в итогах партий `snake_results`: человек или автопилот.
+HUMAN_PLAYER = 'human'
+AUTOPILOT_PLAYER = 'autopilot'
+
+# Как часто сетевая игра проверяет клавиши, пока ждёт сервер, в с.
+NET_POLL_INTERVAL = 0.01
+
+# Шрифт сообщений и размер кэша отрисованных надписей:
+FONT_NAME = 'arial.ttf'
+TEXT_CACHE_SIZE = 64
+
 # Скорость движения змейки по умолчанию:
 speed = 15
 
 # Флаг окончания игры
 game_over = False
 
-# Настройка игрового окна:
-screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
+# Пауза клавишей `PAUSE_KEY` и фокус окна: без фокуса игра тоже стоит.
+paused = False
+focused = True
 
 # Заголовок окна игрового поля:
-pg.display.set_caption('Змейка. Выход (ESC) | Скорость (NUM +/- )')
+CAPTION = 'Змейка. Выход (ESC) | Скорость (NUM +/- ) | Пауза (P)'
 
-# Настройка времени:
-clock = pg.time.Clock()
+# Окно `screen` и часы `clock` создаются лениво, при первой отрисовке
+# или первом обращении к атрибуту модуля, поэтому импорт модуля
+# не инициализирует видео SDL.
 
+# Области экрана, изменённые с последнего обновления дисплея:
+dirty_rects: List[pg.Rect] = []
 
-class GameObject:
-    """Базовый класс объектов игрового поля."""
+# Запись кадров при отрисовке без окна (`export_replay`), иначе None:
+exporter: Union['FrameExporter', None] = None
 
-    def __init__(
-            self,
-            body_color: Union[Tuple[int, int, int], None] = None,
-    ) -> None:
-        self.body_color = body_color
-        self.position: Tuple[int, int] = SCREEN_CENTER
+
+def get_screen() -> pg.Surface:
+    """Возвращает игровое окно, создавая его при первом вызове."""
+    global screen
+
+    if 'screen' not in globals():
+        screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
+        pg.display.set_caption(CAPTION)
+    return screen
+
+
+def get_clock() -> pg.time.Clock:
+    """Возвращает часы игры, создавая их при первом вызове."""
+    global clock
+
+    if 'clock' not in globals():
+        clock = pg.time.Clock()
+    return clock
+
+
+def __getattr__(name: str):
+    """Создаёт `screen` и `clock` при первом обращении к ним."""
+    if name == 'screen':
+        return get_screen()
+    if name == 'clock':
+        return get_clock()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+class GameObject(engine.GameObject):
+    """Базовый класс рисуемых объектов игрового поля."""
+
+    __slots__ = ()
 
     def draw(self) -> None:
         """
@@ -102,7 +226,7 @@ class GameObject:
             height: int,
             body_color: Tuple[int, int, int],
             border_color: Union[Tuple[int, int, int], None] = None,
-    ):
+    ) -> pg.Rect:
         """
         Отрисовывает прямоугольник по заданным параметрам:
         'position': коодинаты;
@@ -110,116 +234,109 @@ class GameObject:
         'height': высота;
         'body_color': цвет фона;
         'border_color': цветом рамки.
+        Прямоугольник копируется из готового спрайта `get_cell_sprite`.
+        Область записывается в `dirty_rects` и возвращается.
         """
-        rect = (pg.Rect(position, (width, height)))
-        pg.draw.rect(screen, body_color, rect)
-        if border_color is not None:
-            pg.draw.rect(screen, border_color, rect, width=1)
+        rect = get_screen().blit(
+            get_cell_sprite(width, height, body_color, border_color),
+            position,
+        )
+        dirty_rects.append(rect)
+        return rect
 
 
-class Apple(GameObject):
+class Apple(GameObject, engine.Apple):
     """Объект Яблоко."""
 
+    __slots__ = ()
+
     def __init__(
             self,
             body_color: Tuple[int, int, int] = APPLE_COLOR,
-            exclude_positions: List[Tuple[int, int]] = None,
+            exclude_positions: Union[Collection[Tuple[int, int]],
+                                     engine.FreeCells] = None,
+            board: Union[engine.Board, None] = None,
     ) -> None:
-        super().__init__(body_color)
-        self.randomize_position(exclude_positions or [])
+        super().__init__(body_color, exclude_positions, board)
 
     def draw(self) -> None:
         """Отрисовывает Яблоко на игровом поле."""
-        self.draw_rectangle(self.position, GRID_SIZE, GRID_SIZE,
+        size = self.board.cell_size
+        self.draw_rectangle(self.position, size, size,
                             self.body_color, BORDER_COLOR)
 
-    def randomize_position(
-            self,
-            exclude_positions: List[Tuple[int, int]] = None
-    ) -> None:
-        """
-        Устанавливает для Яблока случайную позицию на игровом поле,
-        исключая попадание Яблока на позицию Змейки.
-        'exclude_positions' - список координат Змейки.
-        """
-        while True:
-            self.position = (
-                randrange(0, SCREEN_WIDTH - GRID_SIZE + 1, GRID_SIZE),
-                randrange(0, SCREEN_HEIGHT - GRID_SIZE + 1, GRID_SIZE),
-            )
-            if self.position not in exclude_positions:
-                break
-
 
-class Snake(GameObject):
+class Snake(GameObject, engine.Snake):
     """Объект Змейка."""
 
-    DEFAULT_LENGTH = 1
-    MAX_LENGTH = 20
+    __slots__ = ()
 
     def __init__(
             self,
             body_color: Tuple[int, int, int] = SNAKE_COLOR,
+            board: Union[engine.Board, None] = None,
     ) -> None:
-        super().__init__(body_color)
-
-        self.direction = RIGHT
-        self.last = None
-        self.length = self.DEFAULT_LENGTH
-        self.positions = [self.position]
+        super().__init__(body_color, board)
 
     def draw(self) -> None:
         """Отрисовывает змейку на экране, затирая след."""
+        size = self.board.cell_size
         # Отрисовка головы змейки если туловища нет.
-        self.draw_rectangle(self.get_head_position(), GRID_SIZE, GRID_SIZE,
+        self.draw_rectangle(self.get_head_position(), size, size,
                             self.body_color, BORDER_COLOR)
 
         # Затирание последнего сегмента.
         if self.last:
-            self.draw_rectangle(self.last, GRID_SIZE, GRID_SIZE,
+            self.draw_rectangle(self.last, size, size,
                                 BOARD_BACKGROUND_COLOR)
 
-    def update_direction(self, event_key: int) -> None:
-        """Обновляет направление движения змейки."""
-        self.direction = DIRECTIONS.get(
-            (self.direction, event_key),
-            self.direction,
-        )
-
-    def move(self) -> None:
+    def draw_body(self) -> None:
         """
-        Обновляет позицию змейки, добавляя новую голову
-        в начало списка positions и удаляя последний элемент,
-        если длинна змейки не увеличилась.
+        Отрисовывает змейку целиком, например после очистки экрана.
+        Все сегменты копируются одним вызовом `screen.blits`
+        в позиции из таблицы `Board.positions`.
         """
-        position_x, position_y = self.get_head_position()
-        direction_x, direction_y = self.direction
-
-        self.positions.insert(0, (
-            (position_x + (direction_x * GRID_SIZE)) % SCREEN_WIDTH,
-            (position_y + (direction_y * GRID_SIZE)) % SCREEN_HEIGHT,
+        size, positions = self.board.cell_size, self.board.positions
+        sprite = get_cell_sprite(size, size, self.body_color, BORDER_COLOR)
+        dirty_rects.extend(get_screen().blits(
+            [(sprite, positions[cell]) for cell in self.body]
         ))
 
-        self.last = None
-        if len(self.positions) > self.length:
-            self.last = self.positions.pop()
-
-    def get_head_position(self) -> Tuple[int, int]:
+    def draw_cells(self, cells: Iterable[int]) -> None:
         """
-        Возвращает позицию головы Змейки
-        (первый элемент в списке positions).
+        Перерисовывает клетки 'cells' по занятости: сегментом тела
+        или фоном. Так за кадр стираются все хвосты, снятые за
+        несколько тиков, кроме клеток, которые тело снова заняло.
         """
-        return self.positions[0]
+        size, positions = self.board.cell_size, self.board.positions
+        sprite = get_cell_sprite(size, size, self.body_color, BORDER_COLOR)
+        background = get_cell_sprite(size, size, BOARD_BACKGROUND_COLOR)
+        dirty_rects.extend(get_screen().blits(
+            [(sprite if self.occupied[cell] else background,
+              positions[cell]) for cell in cells]
+        ))
 
-    def reset(self) -> None:
+    def update_direction(self, event_key: int) -> None:
         """
-        Сбрасывает Змейку в начальное состояние
-        после столкновения с собой.
+        Ставит в очередь поворот змейки по нажатой клавише.
+        Поворот применяется на ближайшем ходу без других поворотов.
         """
-        self.length = self.DEFAULT_LENGTH
-        self.positions = [self.position]
-        self.direction = choice([RIGHT, LEFT, UP, DOWN])
-        self.last = None
+        direction = DIRECTIONS.get(
+            (self.get_planned_direction(), event_key)
+        )
+        if direction is not None:
+            self.queue_turn(direction)
+
+
+class WorldSnake(snake_world.WorldSnake):
+    """
+    Змейка большого поля с управлением клавишами.
+    Рисует её `draw_world` через камеру.
+    """
+
+    __slots__ = ()
+
+    update_direction = Snake.update_direction
 
 
 def update_speed(event_key: int) -> None:
@@ -231,26 +348,140 @@ def update_speed(event_key: int) -> None:
         speed = new_speed
 
 
-def handle_keys(game_object) -> bool:
-    """Обрабатывает нажатия клавиш для управления игрой."""
-    global game_over
+def handle_key(game_object, event_key: int) -> bool:
+    """
+    Обрабатывает нажатую клавишу 'event_key'.
+    Возвращает False, если игрок выходит из игры.
+    """
+    global game_over, paused
+
+    if event_key == pg.K_ESCAPE:  # Выход из игры.
+        return False
+    elif event_key in SNAKE_CONTROL:  # Изменение направления змейки.
+        game_object.update_direction(event_key)
+    elif event_key in SPEED_CONTROL:  # Изменение скорости змейки.
+        update_speed(event_key)
+    elif game_over and event_key == pg.K_r:  # Рестарт игры.
+        game_over = False
+    elif event_key == PAUSE_KEY and not game_over:  # Пауза и продолжение.
+        paused = not paused
+    elif event_key == STATS_KEY:  # Оверлей профиля кадров.
+        stats_overlay.toggle()
+    return True
 
-    for event in pg.event.get():
+
+def handle_keys(
+        game_object,
+        events: Union[List[pg.event.Event], None] = None,
+) -> bool:
+    """
+    Обрабатывает нажатия клавиш для управления игрой и фокус окна.
+    'events' - уже полученные события, по умолчанию - вся очередь.
+    """
+    global focused
+
+    for event in pg.event.get() if events is None else events:
         if event.type == pg.QUIT:  # Выход из игры.
             return False
         elif event.type == pg.KEYDOWN:
-            if event.key == pg.K_ESCAPE:  # Выход из игры.
+            if not handle_key(game_object, event.key):
                 return False
-            elif event.key in SNAKE_CONTROL:  # Изменение направления змейки.
-                game_object.update_direction(event.key)
-            elif event.key in SPEED_CONTROL:  # Изменение скорости змейки.
-                update_speed(event.key)
-            elif game_over and event.key == pg.K_r:  # Рестарт игры.
-                game_over = False
+        elif event.type in FOCUS_EVENTS:
+            focused = event.type == pg.WINDOWFOCUSGAINED
 
     return True
 
 
+def is_idle() -> bool:
+    """Проверяет, стоит ли игра: победа, пауза или окно без фокуса."""
+    return game_over or paused or not focused
+
+
+def wait_events(
+        timeout: Union[int, None] = None,
+) -> List[pg.event.Event]:
+    """
+    Ждёт событий в `pg.event.wait`, не занимая процессор, и
+    возвращает их. После 'timeout' мс без событий (если он
+    не 0) возвращает пустой список; по умолчанию - `IDLE_TIMEOUT`.
+    """
+    event = pg.event.wait(IDLE_TIMEOUT if timeout is None else timeout)
+    if event.type == pg.NOEVENT:
+        return []
+    return [event, *pg.event.get()]
+
+
+def wait_while_idle(
+        game_object,
+        on_wakeup: Union[Callable[[], None], None] = None,
+) -> bool:
+    """
+    Блокирует игру, пока она стоит (`is_idle`): события ждутся
+    в `wait_events`, а не опросом каждый кадр. На паузе и без
+    фокуса выводит `PAUSE_MESSAGES`, при продолжении очищает экран.
+    'on_wakeup' вызывается после каждого пробуждения, в том числе
+    по `IDLE_TIMEOUT`, - например, для анимации экрана простоя.
+    Возвращает False, если игрок выходит из игры.
+    """
+    show_pause = False
+    while is_idle():
+        # Пауза после победы видна, только когда игру перезапустили.
+        if not (show_pause or game_over):
+            show_pause = True
+            draw_messages(PAUSE_MESSAGES)
+        if not handle_keys(game_object, wait_events()):
+            return False
+        if on_wakeup is not None:
+            on_wakeup()
+    if show_pause:
+        get_screen().fill(BOARD_BACKGROUND_COLOR)
+    return True
+
+
+@lru_cache(maxsize=None)
+def get_cell_sprite(
+        width: int,
+        height: int,
+        body_color: Tuple[int, int, int],
+        border_color: Union[Tuple[int, int, int], None] = None,
+) -> pg.Surface:
+    """
+    Возвращает заранее отрисованную клетку в формате экрана.
+    Спрайт создаётся один раз на сочетание размеров и цветов;
+    после смены режима экрана кэш сбрасывается через
+    `get_cell_sprite.cache_clear()`.
+    """
+    sprite = pg.Surface((width, height)).convert(get_screen())
+    sprite.fill(body_color)
+    if border_color is not None:
+        pg.draw.rect(sprite, border_color, sprite.get_rect(), width=1)
+    return sprite
+
+
+@lru_cache(maxsize=None)
+def get_font(name: str, size: int) -> pg.font.Font:
+    """
+    Возвращает шрифт 'name' размера 'size'.
+    Системный шрифт ищется и загружается один раз на пару
+    (имя, размер).
+    """
+    if not pg.font.get_init():
+        pg.font.init()
+    return pg.font.SysFont(name, size)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(text: str,
+                font_size: int,
+                font_color: Tuple[int, int, int]) -> pg.Surface:
+    """
+    Возвращает поверхность с надписью 'text'.
+    Последние `TEXT_CACHE_SIZE` надписей хранятся в LRU-кэше,
+    поэтому повторный вывод не рендерит текст заново.
+    """
+    return get_font(FONT_NAME, font_size).render(text, True, font_color)
+
+
 def draw_message(text: str,
                  font_size: int,
                  font_color: tuple[int, int, int],
@@ -263,80 +494,737 @@ def draw_message(text: str,
     'font_color': цвет шрифта;
     'margin_top': отступ от верхнего края окна.
     """
-    font = pg.font.SysFont('arial.ttf', font_size)
-    text = font.render(text, True, font_color)
+    text = render_text(text, font_size, font_color)
     margin_left = (SCREEN_WIDTH - text.get_width()) // 2
-    screen.blit(text, (margin_left, margin_top))
+    get_screen().blit(text, (margin_left, margin_top))
+
+
+def update_display(full: bool = False) -> None:
+    """
+    Выводит кадр на экран.
+    Обновляются только области из `dirty_rects`, а весь экран -
+    лишь при 'full', например после `screen.fill`. При записи кадров
+    без окна кадр вместо этого уходит в `exporter`.
+    """
+    if exporter is not None:
+        exporter.capture(get_screen())
+    elif full:
+        pg.display.update()
+    else:
+        pg.display.update(dirty_rects)
+    dirty_rects.clear()
+
+
+def draw_messages(messages: Collection[Message]) -> None:
+    """
+    Выводит сообщения 'messages' (`WIN_MESSAGES`, `PAUSE_MESSAGES`)
+    поверх очищенного экрана.
+    """
+    get_screen().fill(GAME_OVER_BG_COLOR)
+    for text, font_size, font_color, margin_top in messages:
+        draw_message(text, font_size, font_color, margin_top)
+    update_display(full=True)
+
+
+def draw_win_message() -> None:
+    """Выводит сообщение о победе поверх очищенного экрана."""
+    draw_messages(WIN_MESSAGES)
 
 
-def main() -> None:
-    """Фукция запускает основной цикл игры."""
+class StatsOverlay:
+    """
+    Оверлей с частотой кадров и перцентилями времени фаз кадра.
+    Показывается клавишей `STATS_KEY`, если в `main` включён профиль.
+    """
+
+    def __init__(self) -> None:
+        self.profiler: Union[FrameProfiler, None] = None
+        self.visible = False
+        self.hidden = False
+        self.lines: List[str] = []
+        self.frames = 0
+
+    def toggle(self) -> None:
+        """Показывает или скрывает оверлей."""
+        if self.profiler is None:
+            return
+        self.visible = not self.visible
+        self.hidden = not self.visible
+        self.frames = 0
+
+    def pop_hidden(self) -> bool:
+        """Сообщает, что оверлей только что скрыт и его надо стереть."""
+        hidden, self.hidden = self.hidden, False
+        return hidden
+
+    def refresh(self) -> None:
+        """Пересчитывает надписи оверлея по профилю."""
+        summary = self.profiler.summary()
+        self.lines = [f'FPS {self.profiler.fps():.1f}   p50 / p95 / p99, мс']
+        for phase in (*PHASES, 'frame'):
+            p50, p95, p99 = summary[phase].values()
+            self.lines.append(f'{phase}: {p50:.2f} / {p95:.2f} / {p99:.2f}')
+
+    def draw(self) -> None:
+        """
+        Рисует оверлей в левом верхнем углу. Надписи обновляются
+        раз в `STATS_REFRESH_FRAMES` кадров.
+        """
+        if not self.visible:
+            return
+        if self.frames % STATS_REFRESH_FRAMES == 0:
+            self.refresh()
+        self.frames += 1
+
+        surfaces = [render_text(line, STATS_FONT_SIZE, STATS_COLOR)
+                    for line in self.lines]
+        rect = pg.Rect(0, 0, max(surface.get_width() for surface in surfaces),
+                       sum(surface.get_height() for surface in surfaces))
+        screen = get_screen()
+        screen.fill(STATS_BG_COLOR, rect)
+        top = 0
+        for surface in surfaces:
+            screen.blit(surface, (0, top))
+            top += surface.get_height()
+        dirty_rects.append(rect)
+
+
+# Оверлей профиля кадров игры:
+stats_overlay = StatsOverlay()
+
+
+def draw_frame(
+        snake: Snake,
+        apple: Apple,
+        full_redraw: bool,
+        profiler: Union[FrameProfiler, NullProfiler] = NullProfiler(),
+        changed: Union[Set[int], None] = None,
+) -> None:
+    """
+    Отрисовывает кадр: после очистки экрана ('full_redraw') змейку
+    целиком, иначе только изменившиеся клетки. 'changed' - клетки,
+    изменившиеся за несколько тиков кадра (`run_ticks`); без них
+    рисуются голова и хвост последнего хода.
+    """
+    if stats_overlay.pop_hidden():
+        get_screen().fill(BOARD_BACKGROUND_COLOR)
+        full_redraw = True
+    if full_redraw:
+        snake.draw_body()
+    elif changed is not None:
+        snake.draw_cells(changed)
+    else:
+        snake.draw()
+    apple.draw()
+    stats_overlay.draw()
+    profiler.mark(PHASE_DRAW)
+    update_display(full=full_redraw)
+    profiler.mark(PHASE_UPDATE)
+
+
+def draw_world(game: snake_world.WorldGame,
+               camera: snake_world.Camera) -> None:
+    """
+    Отрисовывает видимую камерой часть большого поля.
+    Камера следует за головой, поэтому экран перерисовывается
+    целиком, но перебираются только клетки окна камеры, а не поля.
+    """
+    screen = get_screen()
+    screen.fill(BOARD_BACKGROUND_COLOR)
+    snake = game.snake
+    camera.follow(snake.get_head_position())
+    sprite = get_cell_sprite(GRID_SIZE, GRID_SIZE,
+                             snake.body_color, BORDER_COLOR)
+    screen.blits([(sprite, (x * GRID_SIZE, y * GRID_SIZE))
+                  for cell, (x, y) in camera.visible_cells()
+                  if cell in snake.occupied], False)
+
+    apple_cell = camera.to_view(game.apple.position)
+    if apple_cell is not None:
+        screen.blit(get_cell_sprite(GRID_SIZE, GRID_SIZE,
+                                    game.apple.body_color, BORDER_COLOR),
+                    (apple_cell[0] * GRID_SIZE, apple_cell[1] * GRID_SIZE))
+    update_display(full=True)
+
+
+def play_world(
+        world_width: int,
+        world_height: int,
+        precise_timing: bool = False,
+) -> None:
+    """
+    Запускает игру на поле 'world_width' x 'world_height' клеток,
+    которое больше окна: окно показывает камера вокруг головы.
+    'precise_timing' - как в `main`.
+    """
     global game_over
 
-    # Инициализация PyGame:
     pg.init()
-    # Создание и отрисовка змейки, начальное положение центр экрана.
-    snake = Snake()
+    pg.event.set_blocked(None)
+    pg.event.set_allowed(ALLOWED_EVENTS)
+    frame_clock = get_clock()
+    tick = frame_clock.tick_busy_loop if precise_timing else frame_clock.tick
+    snake = WorldSnake(world_width, world_height, SNAKE_COLOR)
+    apple = snake_world.WorldApple(snake, APPLE_COLOR)
+    game = snake_world.WorldGame(world_width, world_height, snake, apple)
+    camera = snake_world.Camera(world_width, world_height)
+
+    while handle_keys(snake):
+        if is_idle() and not wait_while_idle(snake):
+            break
+        tick(speed)
+        if game_over:
+            continue
+        snake.apply_turn()
+        _, event = game.step()
+        if event == EVENT_WIN:
+            game_over = True
+            draw_win_message()
+            continue
+        draw_world(game, camera)
+
+
+def parse_board(value: str) -> Tuple[int, int]:
+    """Разбирает размер поля вида 'ШИРИНАxВЫСОТА' в клетках."""
+    width, _, height = value.lower().partition('x')
+    return int(width), int(height)
+
+
+class OnlineSnake:
+    """Своя змейка сетевой игры: повороты уходят на сервер."""
+
+    def __init__(self, client: 'snake_net.NetClient') -> None:
+        self.client = client
+
+    def update_direction(self, event_key: int) -> None:
+        """Отправляет серверу поворот по нажатой клавише."""
+        self.client.send_turn(KEY_DIRECTIONS[event_key])
+
+
+def draw_online(state: 'snake_net.ClientState',
+                changes: Union['snake_net.Changes', None]) -> None:
+    """
+    Отрисовывает поле сетевой игры: после снимка ('changes' - None)
+    целиком, иначе только клетки из дельты сервера.
+    """
+    import snake_net
+
+    def draw_cell(cell, color, border_color=BORDER_COLOR):
+        GameObject.draw_rectangle((cell[0] * GRID_SIZE, cell[1] * GRID_SIZE),
+                                  GRID_SIZE, GRID_SIZE, color, border_color)
+
+    def snake_color(snake_id):
+        return SNAKE_COLOR if snake_id == state.snake_id else OTHER_SNAKE_COLOR
+
+    full = changes is None
+    if full:
+        get_screen().fill(BOARD_BACKGROUND_COLOR)
+        changes = snake_net.Changes(
+            [], [(snake_id, cell) for snake_id, body in state.snakes.items()
+                 for cell in body], list(state.apples))
+    for cell in changes.erased:
+        draw_cell(cell, BOARD_BACKGROUND_COLOR, None)
+    for snake_id, cell in changes.snakes:
+        draw_cell(cell, snake_color(snake_id))
+    for cell in changes.apples:
+        draw_cell(cell, APPLE_COLOR)
+    update_display(full)
+
+
+async def run_online(host: str, port: int) -> None:
+    """
+    Играет по сети: рисует изменения с сервера и отправляет
+    повороты, проверяя клавиши каждые `NET_POLL_INTERVAL` секунд.
+    """
+    import asyncio
+
+    import snake_net
+
+    client = await snake_net.NetClient.connect(host, port)
+    player = OnlineSnake(client)
+    receiving = asyncio.ensure_future(client.receive())
+    try:
+        while handle_keys(player):
+            done, _ = await asyncio.wait({receiving},
+                                         timeout=NET_POLL_INTERVAL)
+            if done:
+                draw_online(client.state, receiving.result())
+                receiving = asyncio.ensure_future(client.receive())
+    finally:
+        receiving.cancel()
+        client.close()
+
+
+def play_online(address: str) -> None:
+    """Подключается к серверу `snake_net` по адресу 'хост:порт'."""
+    import asyncio
+
+    pg.init()
+    pg.event.set_blocked(None)
+    pg.event.set_allowed(ALLOWED_EVENTS)
+    host, _, port = address.rpartition(':')
+    try:
+        asyncio.run(run_online(host or '127.0.0.1', int(port)))
+    except (ConnectionError, asyncio.IncompleteReadError):
+        print('Соединение с сервером закрыто.')
+
+
+def get_result(
+        game: engine.Game,
+        length: int,
+        ticks: int,
+        cause: str,
+        autopilot: Union[Autopilot, None],
+        pacer: Union['TurboPacer', None] = None,
+) -> 'ResultRow':
+    """
+    Собирает итог партии 'game' для `snake_results`, 'ticks' - тики
+    партии до её конца. Зерно записывается только для первой партии
+    сессии (её тики - все тики игры): следующие партии начинаются
+    с состояния, которое зерно `Game.seed` не воспроизводит.
+    Скорость записывается только для обычной игры: в турбо-режиме
+    ('pacer') и на поле со стенами итог с ней несравним, там она None.
+    """
+    from snake_results import ResultRow
+
+    player = HUMAN_PLAYER if autopilot is None else AUTOPILOT_PLAYER
+    seed = game.seed if ticks == game.ticks else None
+    rated = pacer is None and game.snake.board.wrap
+    return ResultRow(player, seed, length, ticks, cause,
+                     speed if rated else None)
+
+
+def step_game(
+        game: engine.Game,
+        profiler: Union[FrameProfiler, NullProfiler],
+        recorder: Union['ReplayWriter', None] = None,
+        autopilot: Union[Autopilot, None] = None,
+        results: Union['ResultStore', None] = None,
+        pacer: Union['TurboPacer', None] = None,
+) -> str:
+    """
+    Выполняет тик игры: применяет поворот из очереди, записывая
+    его в реплей, и отмечает фазы хода и проверок в профиле.
+    С 'autopilot' поворот на тик выбирает автопилот вместо клавиш.
+    Итог партии, сброшенной на этом тике, добавляется в 'results'
+    (`get_result`, 'pacer' - темп турбо-режима).
+    """
+    snake = game.snake
+    length, started = snake.length, game.started
+    direction = snake.direction
+    if autopilot is not None:
+        snake.turns.clear()
+        snake.queue_turn(autopilot.decide(game) or direction)
+    snake.apply_turn()
+    if recorder is not None and snake.direction != direction:
+        recorder.record_direction(game.ticks, snake.direction)
+
+    event = game.advance()
+    profiler.mark(PHASE_MOVE)
+    if event is None:
+        event = game.resolve()
+    profiler.mark(PHASE_COLLISION)
+    if results is not None and event in (EVENT_BITE, EVENT_WIN):
+        results.add(get_result(game, length, game.ticks - started, event,
+                               autopilot, pacer))
+    return event
+
+
+def run_ticks(
+        game: engine.Game,
+        pacer: Union['TurboPacer', None],
+        profiler: Union[FrameProfiler, NullProfiler],
+        recorder: Union['ReplayWriter', None] = None,
+        autopilot: Union[Autopilot, None] = None,
+        results: Union['ResultStore', None] = None,
+) -> Tuple[str, Set[int]]:
+    """
+    Выполняет тики `step_game` одного кадра: один тик или, в
+    турбо-режиме, столько, сколько выдаст 'pacer'.
+    Возвращает событие, важное для отрисовки (`EVENT_WIN`,
+    `EVENT_BITE` или `EVENT_MOVE`), и клетки голов и снятых хвостов
+    всех тиков. На победе тики кадра заканчиваются.
+    """
+    ticks = 1
+    if pacer is not None:
+        ticks = pacer.next_ticks(get_clock().get_time() / 1000)
+    started = time.perf_counter()
+    event = EVENT_MOVE
+    changed = set()
+    snake = game.snake
+    done = 0
+    for done in range(1, ticks + 1):
+        tick_event = step_game(game, profiler, recorder, autopilot,
+                               results, pacer)
+        changed.add(snake.body[0])
+        if snake.last_cell is not None:
+            changed.add(snake.last_cell)
+        if tick_event in (EVENT_BITE, EVENT_WIN):
+            event = tick_event
+        if tick_event == EVENT_WIN:
+            break
+    if pacer is not None:
+        pacer.record(done, time.perf_counter() - started)
+    return event, changed
+
+
+class TurboPacer:
+    """
+    Число тиков на кадр в турбо-режиме: симуляция идёт с частотой
+    'rate' тиков в секунду, а окно - с частотой `fps` кадров.
+
+    Долг тиков копится по реальному времени кадров, поэтому
+    медленный кадр догоняется следующими. Тиков на кадр не больше,
+    чем помещается в `TURBO_FRAME_SHARE` кадра по сглаженной оценке
+    времени тика: если симуляция не успевает за 'rate', частота
+    кадров всё равно держится.
+    """
+
+    def __init__(self, rate: int, fps: int = TURBO_FPS) -> None:
+        self.rate = rate
+        self.fps = fps
+        self.debt = 0.0
+        self.tick_time = 0.0
+
+    def max_ticks(self) -> int:
+        """Возвращает, сколько тиков помещается в кадр."""
+        if not self.tick_time:
+            return max(1, self.rate // self.fps)
+        return max(1, int(TURBO_FRAME_SHARE / self.fps / self.tick_time))
+
+    def next_ticks(self, elapsed: float) -> int:
+        """
+        Возвращает число тиков на кадр, начатый через 'elapsed'
+        секунд после предыдущего.
+        """
+        self.debt += self.rate * elapsed
+        ticks = min(int(self.debt), self.max_ticks())
+        # Недоимка сверх одного кадра не копится: иначе после
+        # долгого кадра симуляция рванёт вперёд.
+        self.debt = min(self.debt - ticks, self.rate / self.fps)
+        return ticks
+
+    def record(self, ticks: int, seconds: float) -> None:
+        """Учитывает, что 'ticks' тиков заняли 'seconds' секунд."""
+        if not ticks:
+            return
+        tick_time = seconds / ticks
+        if self.tick_time:
+            tick_time = self.tick_time + TURBO_SMOOTHING * (
+                tick_time - self.tick_time
+            )
+        self.tick_time = tick_time
+
+
+def record_input(
+        recorder: 'ReplayWriter',
+        game: engine.Game,
+        old_speed: int,
+) -> None:
+    """
+    Записывает в реплей изменение скорости клавишами перед следующим
+    ходом и ключевой кадр, если подошёл его тик. Повороты пишет
+    `step_game`, когда они применяются.
+    'old_speed' - скорость до обработки клавиш.
+    """
+    if speed != old_speed:
+        recorder.record_speed(game.ticks, speed)
+    recorder.record_step(game)
+
+
+def create_recorder(
+        record_path: Union[str, None],
+        game: engine.Game,
+        keyframe_interval: Union[int, None],
+) -> Union['ReplayWriter', None]:
+    """
+    Создаёт запись реплея партии, если задан файл 'record_path'.
+    'keyframe_interval' - интервал ключевых кадров, по умолчанию
+    `snake_replay.KEYFRAME_INTERVAL`.
+    """
+    if record_path is None:
+        return None
+    from snake_replay import KEYFRAME_INTERVAL, ReplayWriter
+
+    if keyframe_interval is None:
+        keyframe_interval = KEYFRAME_INTERVAL
+    return ReplayWriter(record_path, game.seed, speed, keyframe_interval,
+                        game.snake.board)
+
+
+def create_results(
+        results_path: Union[str, None],
+) -> Union['ResultStore', None]:
+    """Открывает базу итогов партий, если задан файл 'results_path'."""
+    if results_path is None:
+        return None
+    from snake_results import ResultStore
+
+    return ResultStore(results_path)
+
+
+def create_profiler(profile: bool) -> Union[FrameProfiler, NullProfiler]:
+    """
+    Создаёт профиль кадров и подключает его к оверлею, если включены
+    замеры ('profile'), иначе - заглушку.
+    """
+    if not profile:
+        return NullProfiler()
+    stats_overlay.profiler = FrameProfiler()
+    return stats_overlay.profiler
+
+
+def finish_game(
+        game: engine.Game,
+        recorder: Union['ReplayWriter', None],
+        profiler: Union[FrameProfiler, NullProfiler],
+        profile_path: Union[str, None],
+        results: Union['ResultStore', None] = None,
+        autopilot: Union[Autopilot, None] = None,
+        pacer: Union['TurboPacer', None] = None,
+) -> None:
+    """
+    Закрывает реплей и сохраняет профиль кадров при выходе.
+    Начатая партия попадает в 'results' с причиной `CAUSE_QUIT`.
+    """
+    if recorder is not None:
+        recorder.close(game.ticks)
+    if profile_path is not None:
+        profiler.export(profile_path)
+    if results is not None:
+        from snake_results import CAUSE_QUIT
+
+        if game.ticks > game.started:
+            results.add(get_result(game, game.snake.length,
+                                   game.ticks - game.started, CAUSE_QUIT,
+                                   autopilot, pacer))
+        results.close()
+
+
+def start_game(
+        board: Union[engine.Board, None] = None,
+) -> Tuple[Snake, Apple, engine.Game]:
+    """
+    Создаёт партию на поле 'board' (по умолчанию - поле окна)
+    и выводит её первый кадр.
+    """
+    # Надписи победы готовятся заранее, чтобы экран победы
+    # не ждал загрузки шрифта.
+    for text, font_size, font_color, _ in WIN_MESSAGES:
+        render_text(text, font_size, font_color)
+    # Создание змейки, начальное положение центр экрана, и Яблока,
+    # исключая появление на змейке.
+    snake = Snake(board=board)
+    apple = Apple(exclude_positions=snake.free_cells, board=board)
+    game = engine.Game(snake, apple)
     snake.draw()
-    # Создание и отрисовка Яблока, исключая появление на змейке.
-    apple = Apple(exclude_positions=snake.positions)
     apple.draw()
-    pg.display.update()
+    update_display(full=True)
+    return snake, apple, game
+
+
+def export_replay(
+        replay_path: str,
+        output_path: str,
+        export_format: Union[str, None] = None,
+        workers: Union[int, None] = None,
+) -> 'FrameExporter':
+    """
+    Рисует реплей 'replay_path' без окна и пишет его кадры, по кадру
+    на тик, в 'output_path' (`snake_export.FrameExporter`). Формат
+    'export_format' и потоки 'workers' по умолчанию - `EXPORT_FORMAT`
+    и `EXPORT_WORKERS` модуля `snake_export`. Темп кадров
+    не выдерживается: тики идут так быстро, как позволяет
+    отрисовка. Возвращает закрытый объект записи со счётчиками.
+    """
+    global screen, exporter
+
+    from snake_export import (
+        EXPORT_FORMAT,
+        EXPORT_WORKERS,
+        FrameExporter,
+        create_surface,
+    )
+    from snake_replay import Replay
+
+    export_format = export_format or EXPORT_FORMAT
+    workers = workers or EXPORT_WORKERS
+    pg.init()
+    with Replay(replay_path) as replay, FrameExporter(
+            output_path, export_format, workers) as frame_exporter:
+        screen = create_surface(replay.board.pixel_size)
+        # Спрайты клеток приводятся к формату экрана: кэш окна
+        # не годится для поверхности без окна, и наоборот.
+        get_cell_sprite.cache_clear()
+        exporter = frame_exporter
+        try:
+            snake = Snake(board=replay.board)
+            apple = Apple(exclude_positions=snake.free_cells,
+                          board=replay.board)
+            game = engine.Game(snake, apple, replay.seed)
+            draw_frame(snake, apple, full_redraw=True)
+            for event in replay.steps(game):
+                full_redraw = event in (EVENT_BITE, EVENT_WIN)
+                if full_redraw:
+                    screen.fill(BOARD_BACKGROUND_COLOR)
+                draw_frame(snake, apple, full_redraw)
+        finally:
+            # Следующая отрисовка снова создаст окно.
+            exporter = None
+            del screen
+            get_cell_sprite.cache_clear()
+    return frame_exporter
+
+
+def main(
+        record_path: Union[str, None] = None,
+        keyframe_interval: Union[int, None] = None,
+        report_startup: bool = False,
+        profile: bool = False,
+        profile_path: Union[str, None] = None,
+        precise_timing: bool = False,
+        autopilot: bool = False,
+        turbo_rate: Union[int, None] = None,
+        results_path: Union[str, None] = None,
+        walls: bool = False,
+) -> None:
+    """
+    Фукция запускает основной цикл игры.
+    Правила игры считает `snake_engine.Game`, здесь только
+    обработка клавиш, отрисовка и темп кадров.
+    'record_path' - файл, в который пишется реплей партии;
+    'keyframe_interval' - интервал ключевых кадров реплея в тиках,
+    по умолчанию `snake_replay.KEYFRAME_INTERVAL`;
+    'report_startup' - вывести время до первого кадра;
+    'profile' - замерять фазы кадров (оверлей по клавише F3);
+    'profile_path' - файл CSV или JSON для профиля при выходе,
+    включает замеры;
+    'precise_timing' - держать темп кадров `clock.tick_busy_loop`:
+    точнее, но занимает ядро процессора;
+    'autopilot' - змейкой управляет `snake_autopilot.Autopilot`;
+    'turbo_rate' - турбо-режим: 'turbo_rate' тиков в секунду при
+    `TURBO_FPS` кадрах (`TurboPacer`), клавиши скорости не действуют;
+    'results_path' - база SQLite, в которую пишутся итоги партий;
+    'walls' - поле со стенами: удар о край поля сбрасывает игру.
+    """
+    global game_over
+
+    started = time.perf_counter()
+    # Инициализация PyGame, окна и часов:
+    pg.init()
+    # В очередь событий попадают только нужные игре события.
+    pg.event.set_blocked(None)
+    pg.event.set_allowed(ALLOWED_EVENTS)
+    screen, frame_clock = get_screen(), get_clock()
+    tick = frame_clock.tick_busy_loop if precise_timing else frame_clock.tick
+    snake, apple, game = start_game(engine.Board(wrap=not walls))
+    if report_startup:
+        print(f'Первый кадр через '
+              f'{(time.perf_counter() - started) * 1000:.1f} мс')
+
+    recorder = create_recorder(record_path, game, keyframe_interval)
+    profiler = create_profiler(profile or profile_path is not None)
+    pilot = Autopilot(board=snake.board) if autopilot else None
+    pacer = TurboPacer(turbo_rate) if turbo_rate else None
+    results = create_results(results_path)
+    # Полная перерисовка нужна после очистки экрана.
+    full_redraw = False
 
     while True:
-        clock.tick(speed)
+        # Скорость, изменённая в простое, тоже попадает в реплей.
+        old_speed = speed
+        # В простое цикл ждёт событий, а не крутится с темпом кадров.
+        if is_idle():
+            if not wait_while_idle(snake):
+                break
+            full_redraw = True
+
+        profiler.start_frame()
+        tick(speed if pacer is None else pacer.fps)
+        profiler.mark(PHASE_SLEEP)
 
         if not handle_keys(snake):
             break
+        if recorder is not None:
+            record_input(recorder, game, old_speed)
+        profiler.mark(PHASE_INPUT)
 
-        # Пауза игры, до ее рестарта.
-        if game_over:
+        # Пауза игры, до ее рестарта или продолжения.
+        if is_idle():
             continue
 
-        # Проверка на победу в игре.
-        if snake.length == snake.MAX_LENGTH and not game_over:
-            game_over = True
-
-            # Вывод сообщения о завершении игры.
-            screen.fill(GAME_OVER_BG_COLOR)
-            draw_message('Победа!',
-                         72, APPLE_COLOR, 180)
-            draw_message('Для перезапуска игры нажмите клавишу <R>.',
-                         32, BOARD_BACKGROUND_COLOR, 240)
-            pg.display.update()
+        event, changed = run_ticks(game, pacer, profiler, recorder, pilot,
+                                   results)
 
-            # Сброс настроек зейки и яблока по дефолту.
+        if event == EVENT_WIN:
+            game_over = True
+            # Вывод сообщения о завершении игры, змейка и яблоко
+            # уже сброшены движком.
+            draw_win_message()
             screen.fill(BOARD_BACKGROUND_COLOR)
-            snake.reset()
-            apple.randomize_position(snake.positions)
-
+            full_redraw = True
             continue
 
-        snake.move()
-
-        head_position = snake.get_head_position()
-        if (head_position in snake.positions[3:]
-                or head_position == snake.last):
-            # Проверка на столкновение с телом и хвостом. Пояснение.
-            # Столкновение произойдёт при длинне змейки >= 4.
-            # Если длинна > 4. Столкновение с телом или хвостом.
-            # Если длинна змейки будет = 4, то столкновение может произойти
-            # лишь с хвостом. Однако этого не произойдет, так как до данного
-            # условия в `snake.move()` уже расчитано новое положение головы,
-            # а хвост, с который голова может укусить уже удалён из
-            # `snake.positions` и записан в snake.last. Поэтому необходимо
-            # проверить столкновение с хвостом.
+        if event == EVENT_BITE:
             screen.fill(BOARD_BACKGROUND_COLOR)
-            snake.reset()
-            apple.randomize_position(snake.positions)
-        elif head_position == apple.position:  # Проверка на съедание яблока
-            snake.length += 1
-            apple.randomize_position(snake.positions)
+            full_redraw = True
 
-        snake.draw()
-        apple.draw()
-        pg.display.update()
+        draw_frame(snake, apple, full_redraw, profiler, changed)
+        full_redraw = False
+
+    finish_game(game, recorder, profiler, profile_path, results, pilot,
+                pacer)
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Игра Змейка.')
+    parser.add_argument('--record', metavar='PATH', default=None,
+                        help='записать реплей партии в файл')
+    parser.add_argument('--keyframe-interval', type=int, default=None,
+                        help='интервал ключевых кадров реплея в тиках')
+    parser.add_argument('--startup-time', action='store_true',
+                        help='вывести время до первого кадра')
+    parser.add_argument('--profile', action='store_true',
+                        help='замерять фазы кадров, оверлей по F3')
+    parser.add_argument('--profile-output', metavar='PATH', default=None,
+                        help='сохранить профиль кадров в CSV или JSON')
+    parser.add_argument('--precise-timing', action='store_true',
+                        help='точный темп кадров ценой загрузки ядра')
+    parser.add_argument('--autopilot', action='store_true',
+                        help='змейкой управляет автопилот')
+    parser.add_argument('--turbo', metavar='TICKS', type=int, default=None,
+                        help='турбо-режим: тиков симуляции в секунду')
+    parser.add_argument('--results', metavar='PATH', default=None,
+                        help='сохранять итоги партий в базу SQLite')
+    parser.add_argument('--walls', action='store_true',
+                        help='поле со стенами вместо прохода сквозь края')
+    parser.add_argument('--board', metavar='WxH', type=parse_board,
+                        default=None,
+                        help='играть на большом поле, например 10000x10000')
+    parser.add_argument('--connect', metavar='HOST:PORT', default=None,
+                        help='играть на сервере snake_net.py')
+    parser.add_argument('--export', nargs=2, metavar=('REPLAY', 'OUTPUT'),
+                        default=None,
+                        help='записать кадры реплея без окна')
+    parser.add_argument('--export-format', default=None,
+                        help='png - PNG по кадрам в каталог, '
+                             'raw - сырой поток RGBX')
+    parser.add_argument('--export-workers', type=int, default=None,
+                        help='потоков кодирования PNG')
+    args = parser.parse_args()
+    if args.export is not None:
+        try:
+            result = export_replay(*args.export, args.export_format,
+                                   args.export_workers)
+        except ValueError as error:
+            parser.error(str(error))
+        print(f'Записано кадров: {result.frames}, '
+              f'ожиданий очереди: {result.waits}')
+    elif args.connect is not None:
+        play_online(args.connect)
+    elif args.board is not None:
+        play_world(*args.board, args.precise_timing)
+    else:
+        main(args.record, args.keyframe_interval, args.startup_time,
+             args.profile, args.profile_output, args.precise_timing,
+             args.autopilot, args.turbo, args.results, args.walls)